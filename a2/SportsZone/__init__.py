@@ -1,36 +1,155 @@
+import sys
+import time
+
+_IMPORT_STARTED, _IMPORT_MODULES = time.perf_counter(), len(sys.modules)
+
 from flask import Flask, render_template
 from flask_bootstrap import Bootstrap5
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 
 db = SQLAlchemy()
+_IMPORT_MS = (time.perf_counter() - _IMPORT_STARTED) * 1000
+_IMPORT_MODULES = len(sys.modules) - _IMPORT_MODULES
+
+
+def create_app(config: dict | None = None):
+    # Per-phase timings (flask startup-report); only the first app in a
+    # process pays for the package imports
+    from .startup import StartupProfile
+    profile = StartupProfile()
+    global _IMPORT_MS
+    if _IMPORT_MS is not None:
+        profile.add("package imports", _IMPORT_MS, _IMPORT_MODULES)
+        _IMPORT_MS = None
+    phase = profile.phase
 
-def create_app():
     app = Flask(__name__, template_folder="templates", static_folder="static")
-    app.debug = True
-    app.secret_key = "somesecretkey"
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///sitedata.sqlite"
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-    db.init_app(app)
-    Bootstrap5(app)
+    # Settings: defaults < SPORTSZONE_CONFIG file < environment < `config`
+    with phase("config"):
+        from .config import load_config, configure_engine
+        load_config(app, config)
+
+    with phase("database"):
+        db.init_app(app)
+        configure_engine(app, db)
+    with phase("bootstrap"):
+        Bootstrap5(app)
+
+# Flask-Login
+    with phase("login"):
+        login_manager = LoginManager()
+        login_manager.login_view = "auth.login"   # redirect here if not logged in
+        login_manager.init_app(app)
+
+        # current_user is a cached snapshot; the full User row loads on demand
+        from .identity import identity_cache
+        identity_cache.init_app(app)
+
+        @login_manager.user_loader
+        def load_user(user_id: str):
+            return identity_cache.load(user_id)
+
+        # Password hashing on a bounded worker pool
+        from .hashing import password_hasher
+        password_hasher.init_app(app)
+
+    # Blueprints
+    with phase("blueprints"):
+        from . import views
+        app.register_blueprint(views.main_bp)
+
+        from . import auth
+        app.register_blueprint(auth.auth_bp)
+
+        from . import api
+        app.register_blueprint(api.api_bp)
+
+    # Startup timings and the prewarm hook (startup-report)
+    from . import startup
+    startup.init_app(app, profile)
 
-# Flask-Login 
-    login_manager = LoginManager()
-    login_manager.login_view = "auth.login"   # redirect here if not logged in
-    login_manager.init_app(app)
+    # Schema maintenance commands (create-indexes, check-query-plans)
+    with phase("schema"):
+        from . import schema
+        schema.init_app(app)
 
-    from .models import User
-    @login_manager.user_loader
-    def load_user(user_id: str):
-        return db.session.scalar(db.select(User).where(User.id == int(user_id)))
+    # Per-event aggregates (reconcile-stats)
+    with phase("stats"):
+        from . import stats
+        stats.init_app(app)
 
-    # Blueprints 
-    from . import views
-    app.register_blueprint(views.main_bp)
+    # Booking History read model (rebuild-booking-history)
+    with phase("history"):
+        from . import history
+        history.init_app(app)
 
-    from . import auth
-    app.register_blueprint(auth.auth_bp)
+    # Production servers (serve --server waitress|uvicorn)
+    with phase("server"):
+        from . import server
+        server.init_app(app)
+
+    # Bulk import / export (import-events, export-events)
+    with phase("transfer"):
+        from . import transfer
+        transfer.init_app(app)
+
+    # Opt-in request profiling (PROFILING_ENABLED)
+    with phase("profiling"):
+        from .profiling import RequestProfiler
+        RequestProfiler(app)
+
+    # Page cache for anonymous visitors
+    with phase("page cache"):
+        from .cache import page_cache
+        page_cache.init_app(app)
+
+    # Fingerprinted static URLs with immutable caching
+    with phase("assets"):
+        from .assets import asset_manifest
+        asset_manifest.init_app(app)
+
+    # Upload image variants (card / hero)
+    with phase("images"):
+        from .images import image_pipeline
+        image_pipeline.init_app(app)
+
+    # Template bytecode cache, card filters and macros (compile-templates)
+    with phase("templates"):
+        from .templating import template_cache
+        template_cache.init_app(app)
+
+    # Live ticket availability (SSE / long-poll)
+    with phase("live"):
+        from .live import availability_hub
+        availability_hub.init_app(app)
+
+    # Home page filter counts
+    with phase("facets"):
+        from .facets import facet_counts
+        facet_counts.init_app(app)
+
+    # Full-text event search
+    with phase("search"):
+        from .search import search_index
+        search_index.init_app(app)
+
+    # Background expiry sweep (keeps request handlers read-only)
+    with phase("scheduler"):
+        from .scheduler import ExpiryScheduler
+        ExpiryScheduler(app)
+
+    # Job queue: order codes, receipts and notifications run after the commit
+    with phase("jobs"):
+        from . import notifications  # registers the job handlers
+        from .jobs import job_worker
+        job_worker.init_app(app)
+
+    # Event cancellation fan-out (runs on the job queue)
+    with phase("cancellation"):
+        from . import cancellation
+        cancellation.init_app(app)
 
     # Error Handling
     @app.errorhandler(404)
@@ -44,5 +163,6 @@ def create_app():
         except Exception:
             pass
         return render_template('500.html'), 500
-    
+
+    profile.log(app)
     return app
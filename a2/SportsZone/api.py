@@ -0,0 +1,159 @@
+import json
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request, stream_with_context
+
+from . import db
+from .cancellation import progress as cancellation_progress
+from .live import availability as live_availability, availability_hub
+from .models import Event, Venue
+from .pagination import decode_cursor, keyset_page
+from .queries import comment_record, event_comments, filter_events, listing_args
+
+# Blueprint
+api_bp = Blueprint("api", __name__, url_prefix="/api")
+
+# Plain columns (not ORM objects) so streamed rows never pile up in the session
+EVENT_COLUMNS = (
+    Event.id,
+    Event.event_title,
+    Event.sports_type,
+    Event.home_team_name,
+    Event.away_team_name,
+    Venue.venue_name,
+    Event.start_datetime,
+    Event.end_datetime,
+    Event.effective_status.label("status"),
+    Event.total_tickets,
+    Event.tickets_sold,
+    Event.ticket_price,
+    Event.event_image,
+)
+FIELD_NAMES = [c.key if hasattr(c, "key") else c.name for c in EVENT_COLUMNS]
+
+
+def _event_record(row) -> dict:
+    record = dict(zip(FIELD_NAMES, row))
+    for field in ("start_datetime", "end_datetime"):
+        if record[field] is not None:
+            record[field] = record[field].isoformat()
+    return record
+
+
+# Event listing as NDJSON
+@api_bp.route("/events", endpoint="events")
+def events():
+    """
+    Stream events matching the home page filters (category, status, q) as
+    newline-delimited JSON, fetched in keyset batches. Each record carries a
+    `cursor`; pass the last one back as ?cursor= to resume. ?limit= caps the
+    number of records in this response.
+    """
+    cat, st, q = listing_args(request.args)
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
+    batch_size = current_app.config["API_STREAM_BATCH"]
+
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            abort(400)
+
+    query = db.select(*EVENT_COLUMNS).select_from(Event).join(
+        Venue, Event.venue_id == Venue.id, isouter=True
+    )
+    query, keys = filter_events(query, cat, st, q)
+
+    def generate(cursor):
+        sent = 0
+        while limit is None or sent < limit:
+            size = batch_size if limit is None else min(batch_size, limit - sent)
+            try:
+                page = keyset_page(query, keys, cursor, per_page=size)
+            except ValueError:
+                return
+            for i, row in enumerate(page.items):
+                record = _event_record(row)
+                record["cursor"] = page.cursor_after(i)
+                yield json.dumps(record) + "\n"
+            sent += len(page)
+            if not page.next_cursor:
+                return
+            cursor = page.next_cursor
+
+    return Response(stream_with_context(generate(cursor)), mimetype="application/x-ndjson")
+
+
+# Comment thread pages
+@api_bp.route("/events/<int:event_id>/comments", endpoint="comments")
+def comments(event_id: int):
+    """
+    One page of an event's comments, newest first. Pass `next_cursor` back
+    as ?cursor= for the page after; the event page renders the first one.
+    """
+    if db.session.get(Event, event_id) is None:
+        abort(404)
+    per_page = current_app.config["COMMENTS_PER_PAGE"]
+    limit = min(request.args.get("limit", per_page, type=int), 100)
+    try:
+        page = keyset_page(*event_comments(event_id), request.args.get("cursor"),
+                           per_page=max(limit, 1), descending=True)
+    except ValueError:
+        abort(400)
+    return jsonify(comments=[comment_record(c) for c in page.items], next_cursor=page.next_cursor)
+
+
+# Cancellation progress
+@api_bp.route("/events/<int:event_id>/cancellation", endpoint="cancellation")
+def cancellation(event_id: int):
+    """Progress of an event's cancellation fan-out (bookings cancelled and refunded)."""
+    report = cancellation_progress(event_id)
+    if report is None:
+        abort(404)
+    return jsonify(report)
+
+
+# Live ticket availability
+@api_bp.route("/events/<int:event_id>/availability", endpoint="availability")
+def availability(event_id: int):
+    """
+    Tickets sold / remaining and status of one event. With ?etag= (the value
+    from a previous response) the request long-polls: it returns as soon as
+    the state differs, or after LIVE_POLL_TIMEOUT with the unchanged state.
+    When every live slot is busy it answers straight away instead.
+    """
+    etag = request.args.get("etag")
+    if etag and current_app.config["LIVE_UPDATES_ENABLED"] and availability_hub.open_stream():
+        # Waiting requests share the stream slots, so they can't pile up either
+        try:
+            data = availability_hub.next_change(event_id, etag, current_app.config["LIVE_POLL_TIMEOUT"])
+        finally:
+            availability_hub.close_stream()
+    else:
+        data = live_availability(event_id)
+    if data is None:
+        abort(404)
+    response = jsonify(data)
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@api_bp.route("/events/<int:event_id>/availability/stream", endpoint="availability_stream")
+def availability_stream(event_id: int):
+    """Server-sent `availability` events for one event, one per change."""
+    if not current_app.config["LIVE_UPDATES_ENABLED"]:
+        abort(404)
+    if db.session.get(Event, event_id) is None:
+        abort(404)
+    db.session.close()  # don't hold a pooled connection for the life of the stream
+    if not availability_hub.open_stream():
+        # Clients fall back to long-polling /availability
+        response = jsonify(error="too many live streams, use long-polling")
+        response.status_code = 503
+        response.headers["Retry-After"] = "30"
+        return response
+    response = Response(stream_with_context(availability_hub.stream(event_id)), mimetype="text/event-stream")
+    response.call_on_close(availability_hub.close_stream)
+    response.headers["Cache-Control"] = "no-store"
+    response.headers["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return response
@@ -0,0 +1,269 @@
+"""
+ASGI entry point. The Flask app keeps serving every page through a WSGI
+adapter; the read-heavy JSON endpoints and the live-availability
+connections are answered natively on the event loop with an async database
+session, so a slow or long-lived client costs a coroutine, not a thread.
+
+    flask --app SportsZone serve --server uvicorn
+    uvicorn --factory SportsZone.asgi:create_asgi_app --port 8000
+
+Needs `uvicorn`, `a2wsgi` and an async driver (`aiosqlite`, or `psycopg`
+for PostgreSQL); see requirements.txt.
+"""
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from . import create_app, db
+from .api import EVENT_COLUMNS, _event_record
+from .jobs import job_worker
+from .live import RECONNECT_MS, availability_hub, availability_query, snapshot
+from .models import Event, Venue
+from .pagination import keyset_query, page_from_rows
+from .queries import comment_record, event_comments, filter_events, listing_args
+from .startup import prewarm
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+psycopg"}
+
+
+def async_url(url: str):
+    """The configured database URL with its async driver, e.g. sqlite+aiosqlite://."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"no async driver configured for {backend!r}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+class AsyncDatabase:
+    """Async engine and session factory over the app's database and pool settings."""
+
+    def __init__(self, app):
+        config = app.config
+        url = async_url(config["SQLALCHEMY_DATABASE_URI"])
+        options = {k: v for k, v in config["SQLALCHEMY_ENGINE_OPTIONS"].items() if k != "connect_args"}
+        connect_args = dict(config["SQLALCHEMY_ENGINE_OPTIONS"].get("connect_args", {}))
+        connect_args.pop("check_same_thread", None)  # aiosqlite owns its connection thread
+        self.engine = create_async_engine(url, connect_args=connect_args, **options)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        if url.get_backend_name() == "sqlite":
+            busy_ms = int(config["SQLITE_BUSY_TIMEOUT"] * 1000)
+
+            @event.listens_for(self.engine.sync_engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"PRAGMA busy_timeout = {busy_ms}")
+                cursor.close()
+
+    async def availability(self, event_id: int) -> dict | None:
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(availability_query(event_id))).first()
+        return None if row is None else snapshot(event_id, row.tickets_sold, row.total_tickets, row.status)
+
+
+# Plain ASGI plumbing
+async def _send_json(send, data, status: int = 200, headers=()) -> None:
+    body = json.dumps(data).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    (b"cache-control", b"no-store"), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _start_stream(send, content_type: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", content_type), (b"cache-control", b"no-store"),
+                    (b"x-accel-buffering", b"no")],
+    })
+
+
+async def _chunk(send, text: str) -> None:
+    await send({"type": "http.response.body", "body": text.encode(), "more_body": True})
+
+
+async def _disconnected(receive) -> None:
+    """Resolves when the client goes away."""
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+class SportsZoneASGI:
+    """
+    Routes the async endpoints below; every other request goes to the Flask
+    app on a pool of ASGI_WSGI_THREADS threads. The async routes mirror the
+    URLs and JSON of their Flask versions in api.py, which keep serving
+    plain WSGI deployments.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WSGIMiddleware(app, workers=app.config["ASGI_WSGI_THREADS"])
+        self.db = AsyncDatabase(app)
+        self.streams = 0
+        self.routes = [
+            (re.compile(r"/api/events"), self.events),
+            (re.compile(r"/api/events/(?P<event_id>\d+)/comments"), self.comments),
+            (re.compile(r"/api/events/(?P<event_id>\d+)/availability"), self.availability),
+            (re.compile(r"/api/events/(?P<event_id>\d+)/availability/stream"), self.availability_stream),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, route in self.routes:
+                match = pattern.fullmatch(scope["path"])
+                if match:
+                    args = {k: v[-1] for k, v in parse_qs(scope["query_string"].decode()).items()}
+                    with self.app.app_context():
+                        return await route(args, receive, send, **{k: int(v) for k, v in match.groupdict().items()})
+        return await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.app.config["PREWARM_ON_START"]:
+                    await asyncio.to_thread(prewarm, self.app)
+                job_worker.start_with_server(self.app)
+                self.app.extensions["expiry_scheduler"].start_with_server(self.app)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.to_thread(job_worker.stop, 5)
+                await asyncio.to_thread(self.app.extensions["expiry_scheduler"].stop, 5)
+                await self.db.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # Read-heavy JSON
+    async def events(self, args, receive, send) -> None:
+        """Async /api/events: the same NDJSON stream, fetched in keyset batches."""
+        cat, st, q = listing_args(args)
+        limit = int(args["limit"]) if args.get("limit", "").isdigit() else None
+        batch_size = self.app.config["API_STREAM_BATCH"]
+        query = db.select(*EVENT_COLUMNS).select_from(Event).join(Venue, Event.venue_id == Venue.id, isouter=True)
+        query, keys = filter_events(query, cat, st, q)
+        cursor = args.get("cursor")
+        try:
+            first = keyset_query(query, keys, cursor,
+                                 per_page=batch_size if limit is None else max(min(batch_size, limit), 1))
+        except ValueError:
+            return await _send_json(send, {"error": "bad cursor"}, 400)
+
+        # ?limit=0 sends an empty stream, like the Flask version
+        await _start_stream(send, b"application/x-ndjson")
+        sent, statement = 0, first
+        async with self.db.session() as session:
+            while limit is None or sent < limit:
+                size = batch_size if limit is None else min(batch_size, limit - sent)
+                page = page_from_rows((await session.execute(statement)).all(), len(keys), size)
+                lines = []
+                for i, row in enumerate(page.items):
+                    record = _event_record(row)
+                    record["cursor"] = page.cursor_after(i)
+                    lines.append(json.dumps(record) + "\n")
+                if lines:
+                    await _chunk(send, "".join(lines))
+                sent += len(page)
+                if not page.next_cursor or (limit is not None and sent >= limit):
+                    break
+                size = batch_size if limit is None else min(batch_size, limit - sent)
+                statement = keyset_query(query, keys, page.next_cursor, per_page=size)
+        await send({"type": "http.response.body", "body": b""})
+
+    async def comments(self, args, receive, send, event_id: int) -> None:
+        """Async /api/events/<id>/comments."""
+        limit = args.get("limit", "")
+        per_page = min(int(limit) if limit.isdigit() else self.app.config["COMMENTS_PER_PAGE"], 100)
+        async with self.db.session() as session:
+            if await session.get(Event, event_id) is None:
+                return await _send_json(send, {"error": "not found"}, 404)
+            try:
+                query, keys = event_comments(event_id)
+                statement = keyset_query(query, keys, args.get("cursor"), max(per_page, 1), descending=True)
+            except ValueError:
+                return await _send_json(send, {"error": "bad cursor"}, 400)
+            page = page_from_rows((await session.execute(statement)).all(), len(keys), max(per_page, 1))
+            data = {"comments": [comment_record(c) for c in page.items], "next_cursor": page.next_cursor}
+        await _send_json(send, data)
+
+    # Live availability: waits park on the event loop
+    async def availability(self, args, receive, send, event_id: int) -> None:
+        """Async /api/events/<id>/availability, long-polling when given ?etag=."""
+        etag, config = args.get("etag"), self.app.config
+        timeout = config["LIVE_POLL_TIMEOUT"] if etag and config["LIVE_UPDATES_ENABLED"] else 0
+        with availability_hub.subscribe(event_id) as channel:
+            seen = channel.version
+            data = await self.db.availability(event_id)
+            if data is not None and data["etag"] == etag and timeout:
+                gone = asyncio.ensure_future(_disconnected(receive))
+                wait = asyncio.ensure_future(availability_hub.wait_async(channel, seen, timeout))
+                await asyncio.wait({gone, wait}, return_when=asyncio.FIRST_COMPLETED)
+                gone.cancel()
+                if not wait.done():
+                    wait.cancel()
+                    return
+                data = wait.result()[1] or await self.db.availability(event_id)
+        if data is None:
+            return await _send_json(send, {"error": "not found"}, 404)
+        await _send_json(send, data)
+
+    async def availability_stream(self, args, receive, send, event_id: int) -> None:
+        """Async server-sent availability events, bounded by ASGI_MAX_STREAMS."""
+        config = self.app.config
+        if not config["LIVE_UPDATES_ENABLED"]:
+            return await _send_json(send, {"error": "not found"}, 404)
+        if self.streams >= config["ASGI_MAX_STREAMS"]:
+            return await _send_json(send, {"error": "too many live streams, use long-polling"}, 503,
+                                    [(b"retry-after", b"30")])
+        resync = config["LIVE_RESYNC_INTERVAL"]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config["LIVE_STREAM_TTL"]
+        self.streams += 1
+        gone = asyncio.ensure_future(_disconnected(receive))
+        try:
+            with availability_hub.subscribe(event_id) as channel:
+                seen = channel.version
+                last = await self.db.availability(event_id)
+                if last is None:
+                    return await _send_json(send, {"error": "not found"}, 404)
+                await _start_stream(send, b"text/event-stream")
+                await _chunk(send, f"retry: {RECONNECT_MS}\nevent: availability\ndata: {json.dumps(last)}\n\n")
+                while loop.time() < deadline and not gone.done():
+                    wait = asyncio.ensure_future(availability_hub.wait_async(channel, seen, resync))
+                    await asyncio.wait({gone, wait}, return_when=asyncio.FIRST_COMPLETED)
+                    if not wait.done():
+                        wait.cancel()
+                        return
+                    seen, data = wait.result()
+                    data = data or await self.db.availability(event_id)
+                    if data is None:
+                        break
+                    if data["etag"] == last["etag"]:
+                        await _chunk(send, ": keep-alive\n\n")
+                        continue
+                    last = data
+                    await _chunk(send, f"event: availability\ndata: {json.dumps(data)}\n\n")
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            gone.cancel()
+            self.streams -= 1
+
+
+def create_asgi_app(app=None) -> SportsZoneASGI:
+    app = app or create_app()
+    app.config.setdefault("ASGI_WSGI_THREADS", app.config["SERVER_THREADS"])
+    app.config.setdefault("ASGI_MAX_STREAMS", 10000)
+    return SportsZoneASGI(app)
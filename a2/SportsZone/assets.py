@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+import click
+from flask import current_app, request, send_file, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always produced
+    brotli = None
+
+ONE_YEAR = 365 * 24 * 3600
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt"}
+
+
+def fingerprint(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    """img/logo.png -> img/logo.<digest>.png"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
+
+
+class AssetManifest:
+    """
+    Fingerprints every file under static/ so url_for('static', ...) emits
+    content-hashed URLs (style.<sha>.css). Hashed URLs are served with a
+    one-year immutable Cache-Control, and text assets from precompressed
+    .br/.gz copies kept in instance/assets.
+
+    Nothing is hashed at startup: a file is fingerprinted the first time
+    this worker builds its URL or serves its hashed name, and
+    startup.prewarm registers the text assets. Startup cost no longer
+    grows with the uploads in static/img.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("ASSET_FINGERPRINTING", True)
+        app.cli.add_command(build_assets_command)
+        if not app.config["ASSET_FINGERPRINTING"]:
+            return
+
+        app.extensions["assets"] = {
+            "static_dir": app.static_folder,
+            "compressed_dir": os.path.join(app.instance_path, "assets"),
+            "forward": {},   # style.css -> style.<sha>.css
+            "reverse": {},   # style.<sha>.css -> style.css
+            "digests": {},   # path -> ((mtime_ns, size), digest)
+        }
+        app.url_defaults(self._hash_static_url)
+        app.view_functions["static"] = self.serve
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["assets"]
+
+    def build(self, compress: bool = True, text_only: bool = False) -> int:
+        """Fingerprint (and precompress) everything currently under static/, or just the text assets."""
+        state = self._state
+        count = 0
+        for root, _dirs, files in os.walk(state["static_dir"]):
+            for name in files:
+                if text_only and os.path.splitext(name)[1].lower() not in COMPRESSIBLE:
+                    continue
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, state["static_dir"]).replace(os.sep, "/")
+                self._register(filename, compress)
+                count += 1
+        return count
+
+    def _register(self, filename: str, compress: bool = True) -> str | None:
+        state = self._state
+        path = os.path.join(state["static_dir"], filename)
+        digest = self._digest(path)
+        if digest is None:
+            return None
+        hashed = hashed_name(filename, digest)
+        state["forward"][filename] = hashed
+        state["reverse"][hashed] = filename
+        if compress and os.path.splitext(filename)[1].lower() in COMPRESSIBLE:
+            self._precompress(path, digest)
+        return hashed
+
+    def _digest(self, path: str) -> str | None:
+        """fingerprint(path), recomputed only when the file's mtime or size changes."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        version = (st.st_mtime_ns, st.st_size)
+        cached = self._state["digests"].get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        digest = fingerprint(path)
+        self._state["digests"][path] = (version, digest)
+        return digest
+
+    def _precompress(self, path: str, digest: str) -> None:
+        out_dir = self._state["compressed_dir"]
+        os.makedirs(out_dir, exist_ok=True)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        encoders = {"gz": lambda d: gzip.compress(d, 9, mtime=0)}
+        if brotli is not None:
+            encoders["br"] = lambda d: brotli.compress(d, quality=11)
+        for suffix, encode in encoders.items():
+            target = os.path.join(out_dir, f"{digest}.{suffix}")
+            if not os.path.exists(target):  # named by content hash, so never stale
+                tmp = target + ".tmp"
+                with open(tmp, "wb") as fh:
+                    fh.write(encode(data))
+                os.replace(tmp, target)
+
+    def _hash_static_url(self, endpoint, values) -> None:
+        if endpoint != "static" or "filename" not in values:
+            return
+        filename = values["filename"]
+        hashed = self._state["forward"].get(filename) or self._register(filename)
+        if hashed:
+            values["filename"] = hashed
+
+    def _resolve(self, filename: str) -> str | None:
+        """
+        Original name of a hashed name this worker hasn't built yet, if the
+        digest is the file's current one. The file is hashed at most once per
+        version, however many stale or made-up digests are requested.
+        """
+        stem, ext = os.path.splitext(filename)
+        stem, _sep, digest = stem.rpartition(".")
+        if not stem or len(digest) != 12:
+            return None
+        original = stem + ext
+        path = safe_join(self._state["static_dir"], original)
+        if path is None or self._digest(path) != digest:
+            return None
+        return original if self._register(original) == filename else None
+
+    def serve(self, filename: str):
+        """Static view: immutable caching for hashed names, plain files otherwise."""
+        state = self._state
+        original = state["reverse"].get(filename) or self._resolve(filename)
+        if original is None:
+            return current_app.send_static_file(filename)
+
+        digest = os.path.splitext(filename)[0].rsplit(".", 1)[-1]
+        mimetype = mimetypes.guess_type(original)[0] or "application/octet-stream"
+        response = None
+        for encoding, suffix in (("br", "br"), ("gzip", "gz")):
+            compressed = os.path.join(state["compressed_dir"], f"{digest}.{suffix}")
+            if encoding in request.accept_encodings and os.path.exists(compressed):
+                response = send_file(compressed, mimetype=mimetype, max_age=ONE_YEAR, etag=digest)
+                response.headers["Content-Encoding"] = encoding
+                break
+        if response is None:
+            response = send_from_directory(state["static_dir"], original, max_age=ONE_YEAR)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+asset_manifest = AssetManifest()
+
+
+@click.command("build-assets")
+def build_assets_command():
+    """Fingerprint static files and write precompressed copies ahead of deploy."""
+    if "assets" not in current_app.extensions:
+        raise click.ClickException("ASSET_FINGERPRINTING is disabled")
+    count = asset_manifest.build()
+    click.echo(f"Fingerprinted {count} static files.")
@@ -1,18 +1,24 @@
 from flask import Blueprint, flash, render_template, request, url_for, redirect
 from flask_login import login_user, login_required, logout_user
-from werkzeug.security import generate_password_hash, check_password_hash
 
 from .models import User
-from .forms import LoginForm, RegisterForm
+from .hashing import HashingBusy, password_hasher
 from . import db
 
 auth_bp = Blueprint("auth", __name__)
 
 
+def _busy(form, heading):
+    """Too many passwords being hashed right now: ask the client to back off."""
+    flash("We're handling a lot of sign-ins right now. Please try again in a moment.", "warning")
+    return render_template("user.html", form=form, heading=heading), 503, {"Retry-After": "2"}
+
+
 # Register 
 @auth_bp.route("/register", methods=["GET", "POST"])
 def register():
     """Register a new user if email and mobile number are unique."""
+    from .forms import RegisterForm  # loaded on first use; see startup.prewarm
     form = RegisterForm()
 
     if form.validate_on_submit():
@@ -34,11 +40,15 @@ def register():
             return redirect(url_for("auth.register"))
 
         # Create and commit user
+        try:
+            password_hash = password_hasher.hash(password)
+        except HashingBusy:
+            return _busy(form, "Register")
         user = User(
             first_name=first_name,
             surname=surname,
             email_id=email,
-            password_hash=generate_password_hash(password),
+            password_hash=password_hash,
             mobile_number=mobile_number,
             street_address=street_address,
         )
@@ -55,6 +65,7 @@ def register():
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
     """Authenticate user and start session."""
+    from .forms import LoginForm
     form = LoginForm()
 
     if form.validate_on_submit():
@@ -63,11 +74,21 @@ def login():
 
         user = db.session.scalar(db.select(User).where(User.email_id == email))
 
+        password_ok, new_hash = False, None
+        if user:
+            try:
+                password_ok, new_hash = password_hasher.verify(user.password_hash, password)
+            except HashingBusy:
+                return _busy(form, "Login")
+
         if not user:
             flash("No account found for that email.", "danger")
-        elif not check_password_hash(user.password_hash, password):
+        elif not password_ok:
             flash("Incorrect password.", "danger")
         else:
+            if new_hash:  # hashing settings changed since this password was set
+                user.password_hash = new_hash
+                db.session.commit()
             login_user(user)
             next_page = request.args.get("next")
             # Ensure 'next' is a safe internal redirect
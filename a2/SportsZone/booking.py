@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from . import db
+from .models import Event, Booking
+from .stats import record_booking
+from .jobs import enqueue
+from .history import record_bookings
+from .live import availability_hub, snapshot
+
+
+def reserve_seats(event_id: int, user_id: int, qty: int) -> Booking | None:
+    """
+    Reserve `qty` seats and record the booking, its event stats, history
+    row and confirmation job in one short transaction. Pages watching the
+    event's availability get the new counts once it commits.
+
+    The seat check and the increment happen in a single conditional UPDATE,
+    so concurrent workers can never sell more than `total_tickets`. Returns
+    the new Booking, or None if the event is missing, closed or short of
+    seats (nothing is written in that case).
+    """
+    if not qty or qty <= 0:
+        return None
+
+    sold_after = Event.tickets_sold + qty
+    try:
+        result = db.session.execute(
+            db.update(Event)
+            .where(
+                Event.id == event_id,
+                Event.status == "Open",
+                db.or_(Event.end_datetime.is_(None), Event.end_datetime >= datetime.now()),
+                sold_after <= Event.total_tickets,
+            )
+            .values(
+                tickets_sold=sold_after,
+                status=db.case((sold_after >= Event.total_tickets, "Sold Out"), else_=Event.status),
+            )
+            .returning(Event.tickets_sold, Event.total_tickets, Event.status, Event.ticket_price)
+            .execution_options(synchronize_session=False)
+        )
+        seats = result.first()
+        if seats is None:
+            db.session.rollback()
+            return None
+
+        price = seats.ticket_price or 0.0
+        booking = Booking(user_id=user_id, event_id=event_id, booking_quantity=qty, unit_price=price)
+        db.session.add(booking)
+        db.session.flush()
+        record_booking(event_id, qty, price)
+        record_bookings([booking.id])
+        enqueue("booking.confirmed", {"booking_id": booking.id})
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    availability_hub.publish(event_id, snapshot(event_id, seats.tickets_sold, seats.total_tickets, seats.status))
+    return booking
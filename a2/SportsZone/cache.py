@@ -0,0 +1,294 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+
+class LRUCache:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class DiskCache:
+    """
+    On-disk store shared by every worker on the host. Values must be JSON
+    serialisable; each lives in its own file, replaced atomically. Expired
+    files are deleted when read and by prune(), which also caps the number
+    of entries that can expire.
+    """
+
+    def __init__(self, directory: str, ttl: float = 60.0):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _read(self, path: str):
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            expires, value = self._read(path)
+        except (OSError, ValueError):
+            return None
+        if expires is not None and expires < time.time():
+            self._remove(path)
+            return None
+        return value
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        expires = None if ttl == 0 else time.time() + (ttl or self.ttl)
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump([expires, value], fh)
+        os.replace(tmp, self._path(key))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def delete(self, key: str) -> None:
+        self._remove(self._path(key))
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            self._remove(os.path.join(self.directory, name))
+
+    def prune(self, max_entries: int) -> int:
+        """
+        Delete expired and unreadable files, then the oldest expiring ones
+        beyond `max_entries`; entries set with ttl=0 are kept. Returns the
+        number deleted.
+        """
+        now, expiring, removed = time.time(), [], 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                expires, _ = self._read(path)
+                modified = os.path.getmtime(path)
+            except (OSError, ValueError):
+                # Unreadable; temp files get a minute to be renamed into place
+                try:
+                    if name.startswith("tmp") and now - os.path.getmtime(path) < 60:
+                        continue
+                except OSError:
+                    continue
+                expires, modified = 0, 0
+            if expires is None:
+                continue
+            if expires < now:
+                self._remove(path)
+                removed += 1
+            else:
+                expiring.append((modified, path))
+        expiring.sort()
+        for _, path in expiring[:max(len(expiring) - max_entries, 0)]:
+            self._remove(path)
+            removed += 1
+        return removed
+
+
+class PageCache:
+    """
+    Two-tier cache for anonymous GET pages: a local LRU in front of an
+    optional shared DiskCache.
+
+    Entries are keyed by path, query args and the current version of each
+    of the page's tags ("events", "event:<id>"). Write paths call
+    invalidate() with the tags they touched, which swaps in a new version
+    so every dependent key misses from then on.
+
+    Tag versions live in the shared store when PAGE_CACHE_DIR is set, so an
+    invalidation reaches every worker on the host. Without it they are per
+    process: threads of one process (waitress, the ASGI pool) see each
+    write at once, but other processes keep serving their copies for up to
+    PAGE_CACHE_TTL seconds. Set PAGE_CACHE_DIR when running more than one
+    worker process.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("PAGE_CACHE_ENABLED", True)
+        app.config.setdefault("PAGE_CACHE_TTL", 60)     # seconds
+        app.config.setdefault("PAGE_CACHE_SIZE", 512)   # entries per worker
+        app.config.setdefault("PAGE_CACHE_DIR", None)   # set when running several worker processes
+        app.config.setdefault("PAGE_CACHE_DIR_SIZE", 10000)  # entries kept in PAGE_CACHE_DIR by prune()
+        ttl = app.config["PAGE_CACHE_TTL"]
+        shared_dir = app.config["PAGE_CACHE_DIR"]
+        app.extensions["page_cache"] = {
+            "local": LRUCache(app.config["PAGE_CACHE_SIZE"], ttl),
+            "shared": DiskCache(shared_dir, ttl) if shared_dir else None,
+            "versions": {},
+        }
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["page_cache"]
+
+    # Tag versions
+    def version(self, tag: str) -> str:
+        """Current version of `tag`; changes on every invalidate()."""
+        state = self._state
+        if state["shared"] is not None:
+            version = state["shared"].get(f"version:{tag}")
+        else:
+            version = state["versions"].get(tag)
+        return version or "0"
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every cached page that depends on any of `tags`."""
+        if "page_cache" not in current_app.extensions:
+            return
+        state = self._state
+        for tag in tags:
+            version = uuid.uuid4().hex
+            if state["shared"] is not None:
+                state["shared"].set(f"version:{tag}", version, ttl=0)
+            else:
+                state["versions"][tag] = version
+
+    def clear(self) -> None:
+        if "page_cache" not in current_app.extensions:
+            return
+        state = self._state
+        state["local"].clear()
+        state["versions"].clear()
+        if state["shared"] is not None:
+            state["shared"].clear()
+
+    def prune(self) -> int:
+        """Trim the shared store (run periodically by the expiry scheduler)."""
+        state = current_app.extensions.get("page_cache")
+        if state is None or state["shared"] is None:
+            return 0
+        return state["shared"].prune(current_app.config["PAGE_CACHE_DIR_SIZE"])
+
+    # Entries
+    def page_key(self, tags, query_args=()) -> str:
+        """Key on the path, the `query_args` the view reads and the tag versions."""
+        args = "&".join(f"{k}={request.args[k]}" for k in sorted(query_args) if request.args.get(k))
+        versions = ",".join(f"{t}@{self.version(t)}" for t in tags)
+        return f"page:{request.path}?{args}|{versions}"
+
+    def get(self, key: str):
+        state = self._state
+        entry = state["local"].get(key)
+        if entry is None and state["shared"] is not None:
+            entry = state["shared"].get(key)
+            if entry is not None:
+                state["local"].set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: dict) -> None:
+        state = self._state
+        state["local"].set(key, entry)
+        if state["shared"] is not None:
+            state["shared"].set(key, entry)
+
+    def cacheable(self) -> bool:
+        """Only anonymous GETs with no pending flash messages are shared."""
+        return (
+            current_app.config["PAGE_CACHE_ENABLED"]
+            and request.method == "GET"
+            and not current_user.is_authenticated
+            and not session.get("_flashes")
+        )
+
+
+page_cache = PageCache()
+
+
+def _respond(entry: dict):
+    response = make_response(entry["body"], entry["status"])
+    response.mimetype = entry["mimetype"]
+    response.set_etag(entry["etag"])
+    response.headers["X-Cache"] = "HIT"
+    return response.make_conditional(request)
+
+
+def cached_page(*tags: str, query_args=()):
+    """
+    Serve a view from the page cache for anonymous visitors. Tags are
+    format strings filled from the view arguments, e.g. "event:{event_id}";
+    `query_args` names the query arguments the view reads. Others are left out of
+    the key, so junk query strings share one entry.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not page_cache.cacheable():
+                return view(*args, **kwargs)
+
+            key = page_cache.page_key([t.format(**kwargs) for t in tags], query_args)
+            entry = page_cache.get(key)
+            if entry is not None:
+                return _respond(entry)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data(as_text=True)
+            entry = {
+                "body": body,
+                "status": response.status_code,
+                "mimetype": response.mimetype,
+                "etag": hashlib.sha1(body.encode()).hexdigest(),
+            }
+            page_cache.set(key, entry)
+            # Cookies set while rendering (e.g. the CSRF session) stay on
+            # this response only; the cached copy carries none.
+            response.set_etag(entry["etag"])
+            response.headers["X-Cache"] = "MISS"
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
@@ -0,0 +1,173 @@
+import json
+from datetime import datetime
+
+import click
+from flask import current_app
+
+from . import db
+from .history import refresh_bookings
+from .jobs import enqueue, handler
+from .models import Booking, CancellationRun, Event, Job, Notification, Refund
+from .stats import record_cancellations
+
+
+def start_cancellation(event: Event) -> CancellationRun:
+    """
+    Mark the event cancelled and queue the fan-out over its bookings. Joins
+    the caller's transaction; the bookings themselves are handled in batches
+    by the job worker, so this stays cheap however big the event is.
+    """
+    event.status = "Cancelled"
+    run = db.session.get(CancellationRun, event.id)
+    if run is None:
+        total = db.session.scalar(
+            db.select(db.func.count()).select_from(Booking)
+            .where(Booking.event_id == event.id, Booking.status == "Confirmed")
+        )
+        run = CancellationRun(event_id=event.id, total=total)
+        db.session.add(run)
+        enqueue("event.cancelled", {"event_id": event.id})
+    return run
+
+
+def cancel_batch(event_id: int, batch_size: int) -> bool:
+    """
+    Cancel the next `batch_size` bookings of a cancelled event: flip their
+    status, write refunds and notifications, take them off the event's
+    stats and advance the run's cursor, all in the caller's transaction.
+    Returns True when bookings remain.
+    """
+    run = db.session.get(CancellationRun, event_id)
+    if run is None or run.status == "done":
+        return False
+    event = db.session.get(Event, event_id)
+
+    rows = db.session.execute(
+        db.select(Booking.id, Booking.user_id, Booking.order_code, Booking.booking_quantity, Booking.unit_price)
+        .where(Booking.event_id == event_id, Booking.id > run.last_booking_id,
+               Booking.status == "Confirmed")
+        .order_by(Booking.id)
+        .limit(batch_size)
+    ).all()
+    ids = [row.id for row in rows]
+
+    if ids:
+        db.session.execute(
+            db.update(Booking)
+            .where(Booking.id.in_(ids))
+            .values(status="Cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        refresh_bookings(ids)
+        # Refund what each customer paid, not the event's current price
+        amounts = {row.id: (row.unit_price or 0.0) * row.booking_quantity for row in rows}
+        db.session.execute(db.insert(Refund), [
+            {"booking_id": row.id, "user_id": row.user_id, "event_id": event_id,
+             "amount": amounts[row.id]}
+            for row in rows
+        ])
+        db.session.execute(db.insert(Notification), [
+            {
+                "user_id": row.user_id,
+                "kind": "event_cancelled",
+                "subject": f"{event.event_title} has been cancelled",
+                "body": (
+                    f"{event.event_title} has been cancelled by the organiser. Booking "
+                    f"{row.order_code or f'BK-{row.id}'} ({row.booking_quantity} tickets) is cancelled "
+                    f"and ${amounts[row.id]:.2f} will be refunded."
+                ),
+            }
+            for row in rows
+        ])
+        tickets, refunded = sum(row.booking_quantity for row in rows), sum(amounts.values())
+        record_cancellations(event_id, len(ids), tickets, refunded)
+        run.processed += len(ids)
+        run.refunded += refunded
+        run.last_booking_id = ids[-1]
+
+    more = len(ids) == batch_size
+    if not more:
+        run.status = "done"
+        run.finished_at = datetime.utcnow()
+    return more
+
+
+@handler("event.cancelled")
+def cancel_bookings(payloads: list[dict]) -> None:
+    """
+    One batch per cancelled event, then a follow-up job for the rest. The
+    follow-up commits together with the batch, so a crash resumes from the
+    last committed cursor without repeating or skipping a booking.
+    """
+    batch_size = current_app.config["CANCEL_BATCH_SIZE"]
+    for event_id in {p["event_id"] for p in payloads}:
+        if cancel_batch(event_id, batch_size):
+            enqueue("event.cancelled", {"event_id": event_id})
+
+
+def progress(event_id: int) -> dict | None:
+    run = db.session.get(CancellationRun, event_id)
+    if run is None:
+        return None
+    return {
+        "event_id": run.event_id,
+        "status": run.status,
+        "processed": run.processed,
+        "total": run.total,
+        "percent": round(100.0 * run.processed / run.total, 1) if run.total else 100.0,
+        "refunded": round(run.refunded, 2),
+        "started_at": run.started_at.isoformat(),
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+
+def resume_stalled() -> list[int]:
+    """Queue a fan-out job for every unfinished run that has none queued or running."""
+    pending = {
+        json.loads(payload)["event_id"] for payload in db.session.scalars(
+            db.select(Job.payload).where(Job.kind == "event.cancelled", Job.status.in_(["queued", "running"]))
+        )
+    }
+    resumed = []
+    for event_id in db.session.scalars(
+        db.select(CancellationRun.event_id).where(CancellationRun.status != "done")
+    ).all():
+        if event_id not in pending:
+            enqueue("event.cancelled", {"event_id": event_id})
+            resumed.append(event_id)
+    db.session.commit()
+    return resumed
+
+
+@click.command("cancellation-status")
+@click.argument("event_id", type=int, required=False)
+def cancellation_status_command(event_id):
+    """Progress of event cancellations (all unfinished ones by default)."""
+    if event_id is not None:
+        ids = [event_id]
+    else:
+        ids = db.session.scalars(
+            db.select(CancellationRun.event_id).where(CancellationRun.status != "done")
+        ).all()
+    if not ids:
+        click.echo("No cancellations in progress.")
+    for i in ids:
+        report = progress(i)
+        if report is None:
+            click.echo(f"event {i}: not cancelled")
+        else:
+            click.echo(f"event {i}: {report['status']} {report['processed']}/{report['total']} "
+                       f"({report['percent']}%), refunded ${report['refunded']:.2f}")
+
+
+@click.command("resume-cancellations")
+def resume_cancellations_command():
+    """Re-queue fan-out jobs for cancellations that stopped (e.g. failed jobs)."""
+    resumed = resume_stalled()
+    click.echo("Resumed events: " + ", ".join(map(str, resumed)) if resumed else "Nothing to resume.")
+
+
+def init_app(app) -> None:
+    app.config.setdefault("CANCEL_BATCH_SIZE", 1000)
+    app.cli.add_command(cancellation_status_command)
+    app.cli.add_command(resume_cancellations_command)
@@ -0,0 +1,119 @@
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+class Config:
+    """
+    Defaults. Override with a file named by SPORTSZONE_CONFIG (.py or .json),
+    SPORTSZONE_* environment variables (e.g. SPORTSZONE_DB_POOL_SIZE=20,
+    values parsed as JSON where possible) or DATABASE_URL.
+    """
+
+    DEBUG = False
+    SECRET_KEY = "somesecretkey"
+    SQLALCHEMY_DATABASE_URI = "sqlite:///sitedata.sqlite"
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool (both backends)
+    DB_POOL_SIZE = 10
+    DB_MAX_OVERFLOW = 20
+    DB_POOL_TIMEOUT = 30       # seconds to wait for a free connection
+    DB_POOL_RECYCLE = 1800     # seconds; PostgreSQL only
+
+    # SQLite tuning
+    SQLITE_JOURNAL_MODE = "WAL"     # readers no longer block the writer
+    SQLITE_SYNCHRONOUS = "NORMAL"   # safe with WAL, far fewer fsyncs
+    SQLITE_BUSY_TIMEOUT = 15        # seconds to wait on a locked database
+    SQLITE_CACHE_SIZE_KB = 20000
+
+    # App settings
+    EXPIRY_SWEEP_INTERVAL = 60  # seconds
+    EVENTS_PER_PAGE = 24
+    COMMENTS_PER_PAGE = 20
+    API_STREAM_BATCH = 500
+
+
+def load_config(app, overrides: dict | None = None) -> None:
+    """Fill app.config from defaults, config file, environment and overrides."""
+    app.config.from_object(Config)
+
+    path = os.environ.get("SPORTSZONE_CONFIG")
+    if path:
+        if path.endswith(".json"):
+            import json
+            app.config.from_file(os.path.abspath(path), load=json.load)
+        else:
+            app.config.from_pyfile(os.path.abspath(path))
+
+    database_url = os.environ.get("DATABASE_URL")
+    if database_url:
+        # Heroku-style URLs use the deprecated "postgres" scheme
+        if database_url.startswith("postgres://"):
+            database_url = "postgresql://" + database_url[len("postgres://"):]
+        app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+
+    app.config.from_prefixed_env("SPORTSZONE")
+    if overrides:
+        app.config.update(overrides)
+
+    # Explicit SQLALCHEMY_ENGINE_OPTIONS win over the derived pool settings
+    options = engine_options(app.config)
+    explicit = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    options["connect_args"] = {**options.get("connect_args", {}), **explicit.get("connect_args", {})}
+    options.update({k: v for k, v in explicit.items() if k != "connect_args"})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def engine_options(config) -> dict:
+    """Pool and driver settings for the configured database backend."""
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite":
+        options = {
+            "connect_args": {
+                "timeout": config["SQLITE_BUSY_TIMEOUT"],
+                # Pooled connections are handed between request threads
+                "check_same_thread": False,
+            },
+        }
+        if url.database and url.database != ":memory:":
+            options.update(
+                pool_size=config["DB_POOL_SIZE"],
+                max_overflow=config["DB_MAX_OVERFLOW"],
+                pool_timeout=config["DB_POOL_TIMEOUT"],
+            )
+        return options
+
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": True,
+    }
+
+
+def configure_engine(app, db) -> None:
+    """Apply per-connection SQLite pragmas; call right after db.init_app."""
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    config = app.config
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'] * 1000)}",
+        f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA cache_size = -{int(config['SQLITE_CACHE_SIZE_KB'])}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if engine.url.database and engine.url.database != ":memory:":
+        pragmas.insert(0, f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}")
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
@@ -0,0 +1,87 @@
+from collections import Counter
+
+from flask import current_app
+
+from . import db
+from .cache import LRUCache, page_cache
+from .models import Event
+from .search import search_index
+
+# Home page filter buttons: (query value, label)
+CATEGORIES = [("football", "Football"), ("basketball", "Basketball"), ("cricket", "Cricket"), ("tennis", "Tennis")]
+STATUSES = [("open", "Open"), ("soldout", "Sold Out"), ("cancelled", "Cancelled"), ("inactive", "Inactive")]
+
+
+def _category_matches(category: str, sports_type: str | None) -> bool:
+    # Same rule as filter_events: sports_type ILIKE %category%
+    return category == "all" or (sports_type is not None and category in sports_type.lower())
+
+
+def _status_matches(status: str, effective_status: str | None) -> bool:
+    if status == "all":
+        return True
+    needle = "sold out" if status == "soldout" else status
+    return effective_status is not None and needle in effective_status.lower()
+
+
+def facet_grid(q: str = "") -> Counter:
+    """
+    Events per (sports_type, effective status) matching the text filter, in
+    one GROUP BY over a covering index. Every button count for every
+    category/status combination is a sum over this grid.
+    """
+    status = Event.effective_status
+    query = db.select(Event.sports_type, status, db.func.count()).select_from(Event)
+    if q:
+        query, _rank = search_index.apply(query, q)
+    rows = db.session.execute(query.group_by(Event.sports_type, status)).all()
+    return Counter({(sport, st): n for sport, st, n in rows})
+
+
+class FacetCounts:
+    """
+    Counts for the home page category and status buttons. The grid for each
+    search text is cached per worker and keyed by the page cache's "events"
+    version, so any write that invalidates the listings (bookings, edits,
+    cancellations, the expiry sweep) also retires the counts. That version
+    is only shared between processes through PAGE_CACHE_DIR; without it,
+    other processes' counts can lag a write by up to FACET_CACHE_TTL.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("FACET_CACHE_SIZE", 256)
+        app.config.setdefault("FACET_CACHE_TTL", 60)  # seconds; bounds staleness of effective status
+        app.extensions["facets"] = LRUCache(app.config["FACET_CACHE_SIZE"], app.config["FACET_CACHE_TTL"])
+
+    def grid(self, q: str = "") -> Counter:
+        cache = current_app.extensions["facets"]
+        key = f"{q}|events@{page_cache.version('events')}"
+        grid = cache.get(key)
+        if grid is None:
+            grid = facet_grid(q)
+            cache.set(key, grid)
+        return grid
+
+    def counts(self, category: str = "all", status: str = "all", q: str = "") -> dict:
+        """
+        {"category": {value: n}, "status": {value: n}}, 'all' included. A
+        category count applies the current status filter and vice versa, so
+        each number is what clicking that button would list.
+        """
+        grid = self.grid(q)
+
+        def total(cat, st):
+            return sum(n for (sport, eff), n in grid.items()
+                       if _category_matches(cat, sport) and _status_matches(st, eff))
+
+        return {
+            "category": {cat: total(cat, status) for cat, _ in [("all", "All"), *CATEGORIES]},
+            "status": {st: total(category, st) for st, _ in [("all", "All Status"), *STATUSES]},
+        }
+
+
+facet_counts = FacetCounts()
@@ -12,6 +12,9 @@ from wtforms.validators import (
 # Accepted image extensions
 ALLOWED_FILE = {"PNG", "JPG", "JPEG", "png", "jpg", "jpeg"}
 
+# bcrypt only reads (and bcrypt >= 5 rejects) passwords longer than this
+MAX_PASSWORD_BYTES = 72
+
 
 # Login Forms 
 class LoginForm(FlaskForm):
@@ -34,6 +37,11 @@ class RegisterForm(FlaskForm):
     confirm = PasswordField("Confirm Password")
     submit = SubmitField("Register")
 
+    def validate_password(self, field):
+        """Keep passwords within what every PASSWORD_HASH_METHOD accepts."""
+        if field.data and len(field.data.encode("utf-8")) > MAX_PASSWORD_BYTES:
+            raise ValidationError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes.")
+
 
 # Event Creation / Editing 
 class EventForm(FlaskForm):
@@ -0,0 +1,122 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from flask_bcrypt import Bcrypt
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .profiling import span
+
+
+class HashingBusy(Exception):
+    """Every hashing slot is taken; the caller should ask the client to retry."""
+
+
+def _werkzeug_prefix(method: str) -> str:
+    """The method string werkzeug stores for `method`, e.g. scrypt -> scrypt:32768:8:1."""
+    return generate_password_hash("", method).split("$", 1)[0]
+
+
+def _hash(password: str, method: str, bcrypt: Bcrypt) -> str:
+    if method == "bcrypt":
+        return bcrypt.generate_password_hash(password).decode("utf-8")
+    return generate_password_hash(password, method)
+
+
+def _verify(stored: str, password: str, method: str, bcrypt: Bcrypt,
+            current_prefix: str, logger) -> tuple[bool, str | None]:
+    """(matches, replacement hash when the stored one uses outdated parameters)."""
+    try:
+        if stored.startswith("$2"):
+            ok = bcrypt.check_password_hash(stored, password)
+        else:
+            ok = check_password_hash(stored, password)
+    except ValueError:  # malformed hash, or a password bcrypt refuses
+        return False, None
+    if ok and not stored.startswith(current_prefix):
+        try:
+            return True, _hash(password, method, bcrypt)
+        except ValueError as exc:  # e.g. over bcrypt's 72 bytes: keep the old hash
+            logger.warning("Password rehash skipped: %s", exc)
+    return ok, None
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a small, bounded thread pool so a burst of
+    logins cannot occupy every request thread. bcrypt and hashlib release
+    the GIL while they work, so cheap pages keep being served meanwhile.
+
+    PASSWORD_HASH_METHOD is "bcrypt" (cost: BCRYPT_LOG_ROUNDS) or any
+    werkzeug method such as "scrypt" or "pbkdf2:sha256:600000". Hashes made
+    with other parameters still verify and are replaced on the next login.
+    Once HASH_QUEUE_LIMIT jobs are running or waiting, new ones raise
+    HashingBusy (a 503) instead of queueing. Each waiting job holds its
+    request thread, so the limit defaults to at most half of SERVER_THREADS
+    and `flask serve` lowers it to half of the threads it starts.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("PASSWORD_HASH_METHOD", "bcrypt")
+        app.config.setdefault("BCRYPT_LOG_ROUNDS", 12)
+        app.config.setdefault("HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+        # Jobs running or waiting; each holds a request thread
+        app.config.setdefault("HASH_QUEUE_LIMIT", max(1, min(app.config["HASH_WORKERS"] * 8,
+                                                             app.config.get("SERVER_THREADS", 16) // 2)))
+        method = app.config["PASSWORD_HASH_METHOD"]
+        bcrypt = Bcrypt(app)
+        app.extensions["hashing"] = {
+            "method": method,
+            "bcrypt": bcrypt,
+            "prefix": (
+                f"${app.config.get('BCRYPT_HASH_PREFIX', '2b')}${app.config['BCRYPT_LOG_ROUNDS']:02d}$"
+                if method == "bcrypt" else _werkzeug_prefix(method) + "$"
+            ),
+            "slots": threading.BoundedSemaphore(app.config["HASH_QUEUE_LIMIT"]),
+            "executor": None,
+            "workers": app.config["HASH_WORKERS"],
+        }
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["hashing"]
+
+    def limit_queue(self, app, limit: int) -> None:
+        """Resize the job slots; call before the server starts taking requests."""
+        app.extensions["hashing"]["slots"] = threading.BoundedSemaphore(max(limit, 1))
+
+    def _run(self, fn, *args):
+        state = self._state
+        if not state["slots"].acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            if state["executor"] is None:
+                state["executor"] = ThreadPoolExecutor(state["workers"], thread_name_prefix="hashing")
+            future = state["executor"].submit(fn, *args)
+        except BaseException:
+            state["slots"].release()
+            raise
+        future.add_done_callback(lambda f: state["slots"].release())
+        with span("hash"):
+            return future.result()
+
+    def hash(self, password: str) -> str:
+        state = self._state
+        return self._run(_hash, password, state["method"], state["bcrypt"])
+
+    def verify(self, stored: str, password: str) -> tuple[bool, str | None]:
+        """
+        Check `password` against `stored`. On success with outdated hash
+        parameters, also returns the rehashed value for the caller to save.
+        """
+        state = self._state
+        return self._run(_verify, stored, password, state["method"], state["bcrypt"], state["prefix"],
+                         current_app.logger)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,107 @@
+import click
+
+from . import db
+from .models import Booking, BookingHistory, Event
+
+DATE_FORMAT = "%d %b %Y, %I:%M %p"
+
+
+def _event_title(title, home, away) -> str:
+    return title or f"{home} vs {away}"
+
+
+def _rows(where=None, batch_size: int = 1000):
+    """Display-ready history rows for the bookings matching `where`, streamed."""
+    query = (
+        db.select(
+            Booking.id, Booking.user_id, Booking.event_id, Booking.booking_date,
+            Booking.booking_quantity, Booking.order_code, Booking.status,
+            Event.event_title, Event.home_team_name, Event.away_team_name,
+            Event.event_image, Event.sports_type,
+        )
+        .join(Event, Booking.event_id == Event.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if where is not None:
+        query = query.where(where)
+    for row in db.session.execute(query):
+        yield {
+            "booking_id": row.id,
+            "user_id": row.user_id,
+            "event_id": row.event_id,
+            "booking_date": row.booking_date,
+            "booked_at": row.booking_date.strftime(DATE_FORMAT),
+            "quantity": row.booking_quantity or 1,
+            "order_code": row.order_code,
+            "status": row.status,
+            "event_title": _event_title(row.event_title, row.home_team_name, row.away_team_name),
+            "event_image": row.event_image,
+            "sports_type": row.sports_type,
+        }
+
+
+def record_bookings(booking_ids: list[int]) -> None:
+    """Add history rows for new bookings; call in the booking's transaction after a flush."""
+    rows = list(_rows(Booking.id.in_(booking_ids)))
+    if rows:
+        db.session.execute(db.insert(BookingHistory), rows)
+
+
+def refresh_bookings(booking_ids: list[int]) -> None:
+    """Copy order codes and statuses of these bookings into their history rows."""
+    if not booking_ids:
+        return
+    source = db.select(Booking).where(Booking.id == BookingHistory.booking_id).correlate(BookingHistory)
+    db.session.execute(
+        db.update(BookingHistory)
+        .where(BookingHistory.booking_id.in_(booking_ids))
+        .values(
+            order_code=source.with_only_columns(Booking.order_code).scalar_subquery(),
+            status=source.with_only_columns(Booking.status).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_event(event: Event) -> None:
+    """Push an edited event's title, image and sport into every history row that shows it."""
+    db.session.execute(
+        db.update(BookingHistory)
+        .where(BookingHistory.event_id == event.id)
+        .values(
+            event_title=_event_title(event.event_title, event.home_team_name, event.away_team_name),
+            event_image=event.event_image,
+            sports_type=event.sports_type,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Recreate every history row from bookings and events."""
+    count, batch = 0, []
+    try:
+        db.session.execute(db.delete(BookingHistory))
+        for row in _rows(batch_size=batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                db.session.execute(db.insert(BookingHistory), batch)
+                count, batch = count + len(batch), []
+        if batch:
+            db.session.execute(db.insert(BookingHistory), batch)
+            count += len(batch)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return count
+
+
+@click.command("rebuild-booking-history")
+def rebuild_booking_history_command():
+    """Rebuild the Booking History read model from bookings and events."""
+    click.echo(f"Rebuilt {rebuild()} booking history rows.")
+
+
+def init_app(app) -> None:
+    app.cli.add_command(rebuild_booking_history_command)
@@ -0,0 +1,87 @@
+from flask import current_app, has_app_context
+from flask_login import UserMixin
+from sqlalchemy import event
+
+from . import db
+from .cache import LRUCache
+from .models import User
+
+
+class UserIdentity(UserMixin):
+    """
+    What Flask-Login hands out as current_user: the id and the fields the
+    navbar shows. Any other attribute loads the full User row on first use.
+    """
+
+    def __init__(self, id: int, first_name: str, email_id: str):
+        self.id = id
+        self.first_name = first_name
+        self.email_id = email_id
+        self._user = None
+
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __repr__(self) -> str:
+        return f"<UserIdentity {self.id} {self.first_name}>"
+
+
+class IdentityCache:
+    """
+    Bounded LRU/TTL cache of user snapshots for the user_loader. A hit costs
+    no query; a miss selects only the snapshot columns. Entries are dropped
+    whenever a User row is updated or deleted through the ORM, and the TTL
+    bounds staleness for changes made by other processes.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("IDENTITY_CACHE_SIZE", 1024)
+        app.config.setdefault("IDENTITY_CACHE_TTL", 300)  # seconds
+        app.extensions["identity"] = LRUCache(
+            app.config["IDENTITY_CACHE_SIZE"], app.config["IDENTITY_CACHE_TTL"]
+        )
+
+    @property
+    def _cache(self) -> LRUCache:
+        return current_app.extensions["identity"]
+
+    def load(self, user_id: str) -> UserIdentity | None:
+        try:
+            key = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        snapshot = self._cache.get(key)
+        if snapshot is None:
+            row = db.session.execute(
+                db.select(User.first_name, User.email_id).where(User.id == key)
+            ).first()
+            if row is None:
+                return None
+            snapshot = tuple(row)
+            self._cache.set(key, snapshot)
+        return UserIdentity(key, *snapshot)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.delete(user_id)
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_snapshot(mapper, connection, target):
+    if has_app_context() and "identity" in current_app.extensions:
+        identity_cache.invalidate(target.id)
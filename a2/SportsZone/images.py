@@ -0,0 +1,159 @@
+import hashlib
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+
+from .templating import cached_url
+
+# Pillow is imported on the first upload, not at startup. Without it,
+# uploads are stored and served as-is.
+HAVE_PILLOW = importlib.util.find_spec("PIL") is not None
+
+# Size variants: card thumbnails are cropped to fill, hero banners fit inside
+VARIANTS = {
+    "card": {"size": (640, 400), "crop": True},
+    "hero": {"size": (1600, 640), "crop": False},
+}
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+
+def variant_name(filename: str, variant: str, ext: str = "webp") -> str:
+    """Relative name of a variant inside the variants folder, e.g. abc.png.card.webp."""
+    return f"{filename}.{variant}.{ext}"
+
+
+def render_variants(source: str, out_dir: str, fmt: str = "WEBP", quality: int = 80,
+                    force: bool = False) -> list[str]:
+    """Write every size variant of `source` into `out_dir`; returns the files written."""
+    if not HAVE_PILLOW:
+        return []
+    from PIL import Image, ImageOps
+
+    ext = fmt.lower()
+    os.makedirs(out_dir, exist_ok=True)
+    filename = os.path.basename(source)
+    written = []
+    with Image.open(source) as original:
+        # Let the JPEG decoder downscale while decoding; much cheaper than resizing after
+        original.draft("RGB", max(spec["size"] for spec in VARIANTS.values()))
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for variant, spec in VARIANTS.items():
+            target = os.path.join(out_dir, variant_name(filename, variant, ext))
+            if os.path.exists(target) and not force:
+                continue
+            if spec["crop"]:
+                resized = ImageOps.fit(image, spec["size"], Image.Resampling.LANCZOS)
+            else:
+                resized = image.copy()
+                resized.thumbnail(spec["size"], Image.Resampling.LANCZOS)
+            tmp = target + ".tmp"
+            resized.save(tmp, fmt, quality=quality, method=4)
+            os.replace(tmp, target)
+            written.append(target)
+    return written
+
+
+class ImagePipeline:
+    """
+    Stores uploads under content-hashed names in static/img and renders
+    WebP card/hero variants into static/img/variants on a background
+    thread pool, so the upload request never waits on Pillow.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("IMAGE_WORKERS", 2)
+        app.config.setdefault("IMAGE_FORMAT", "WEBP")
+        app.config.setdefault("IMAGE_QUALITY", 80)
+        upload_dir = os.path.join(app.static_folder, "img")
+        app.extensions["images"] = {
+            "upload_dir": upload_dir,
+            "variant_dir": os.path.join(upload_dir, "variants"),
+            "executor": None,
+            "known": set(),  # variants already seen on disk
+        }
+        app.add_template_filter(self.image_url, "image_url")
+        app.cli.add_command(backfill_images_command)
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["images"]
+
+    def _executor(self) -> ThreadPoolExecutor:
+        state = self._state
+        if state["executor"] is None:
+            state["executor"] = ThreadPoolExecutor(
+                max_workers=current_app.config["IMAGE_WORKERS"], thread_name_prefix="images"
+            )
+        return state["executor"]
+
+    def save_upload(self, file_storage, original_name: str) -> str | None:
+        """Store an upload as <sha256>.<ext> and queue its variants; returns the filename."""
+        ext = os.path.splitext(original_name)[1].lower()
+        data = file_storage.read()
+        if not data:
+            return None
+        filename = hashlib.sha256(data).hexdigest()[:32] + ext
+
+        state = self._state
+        os.makedirs(state["upload_dir"], exist_ok=True)
+        path = os.path.join(state["upload_dir"], filename)
+        if not os.path.exists(path):  # same content, same name: nothing to do
+            with open(path, "wb") as fh:
+                fh.write(data)
+        self.submit(path)
+        return filename
+
+    def submit(self, path: str, force: bool = False):
+        config = current_app.config
+        logger = current_app.logger
+        future = self._executor().submit(
+            render_variants, path, self._state["variant_dir"],
+            config["IMAGE_FORMAT"], config["IMAGE_QUALITY"], force,
+        )
+        future.add_done_callback(
+            lambda f: f.exception() and logger.warning("Image variants failed for %s: %s", path, f.exception())
+        )
+        return future
+
+    def image_url(self, filename: str | None, variant: str | None = None) -> str:
+        """Template filter: URL of the variant if rendered yet, else of the original."""
+        filename = filename or "placeholder.jpg"
+        if variant and HAVE_PILLOW:
+            state = self._state
+            name = variant_name(filename, variant, current_app.config["IMAGE_FORMAT"].lower())
+            if name in state["known"] or os.path.exists(os.path.join(state["variant_dir"], name)):
+                state["known"].add(name)
+                return cached_url("static", filename=f"img/variants/{name}")
+        return cached_url("static", filename=f"img/{filename}")
+
+
+image_pipeline = ImagePipeline()
+
+
+@click.command("backfill-images")
+@click.option("--force", is_flag=True, help="Re-render variants that already exist.")
+def backfill_images_command(force):
+    """Render card/hero variants for every existing image in static/img."""
+    if not HAVE_PILLOW:
+        raise click.ClickException("Pillow is not installed")
+    upload_dir = current_app.extensions["images"]["upload_dir"]
+    sources = sorted(
+        os.path.join(upload_dir, name) for name in os.listdir(upload_dir)
+        if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS
+    )
+    futures = [image_pipeline.submit(path, force=force) for path in sources]
+    written = 0
+    for path, future in zip(sources, futures):
+        try:
+            written += len(future.result())
+        except Exception as exc:
+            click.echo(f"  failed: {os.path.basename(path)} ({exc})")
+    click.echo(f"Processed {len(sources)} images, wrote {written} variants.")
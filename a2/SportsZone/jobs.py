@@ -0,0 +1,296 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+
+from . import db
+from .models import Job
+
+# kind -> handler(payloads: list[dict]); see @handler
+HANDLERS = {}
+
+
+def handler(kind: str):
+    """
+    Register the function that processes jobs of `kind`. It receives the
+    payloads of a whole batch and runs inside the transaction that marks
+    them done, so it must not commit.
+    """
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(kind: str, payload: dict, delay: float = 0) -> None:
+    """Add a job to the current transaction; it becomes visible on commit."""
+    db.session.add(Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        max_attempts=current_app.config["JOB_MAX_ATTEMPTS"],
+        run_after=datetime.utcnow() + timedelta(seconds=delay),
+    ))
+
+
+class JobMetrics:
+    """Counters for one worker: jobs done / retried / failed per kind, and throughput."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = defaultdict(lambda: {"done": 0, "retried": 0, "failed": 0, "seconds": 0.0})
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, outcome: str, n: int, seconds: float = 0.0) -> None:
+        with self._lock:
+            self.counts[kind][outcome] += n
+            self.counts[kind]["seconds"] += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            done = sum(c["done"] for c in self.counts.values())
+            return {
+                "uptime_s": round(elapsed, 1),
+                "jobs_per_s": round(done / elapsed, 2) if elapsed else 0.0,
+                "kinds": {k: {**c, "seconds": round(c["seconds"], 3)} for k, c in self.counts.items()},
+            }
+
+
+class JobWorker:
+    """
+    Claims queued jobs in batches, runs them grouped by kind and records the
+    outcome. Failed jobs are retried with exponential backoff up to their
+    max_attempts, then left as 'failed'. Jobs still 'running' after
+    JOB_LOCK_TIMEOUT (a worker died mid-batch) are put back in the queue.
+
+    Runs as `flask run-worker`, or as a thread inside the web process:
+    `flask serve` and the ASGI lifespan start one unless JOB_WORKER_ENABLED
+    is False, and JOB_WORKER_ENABLED = True starts one in every process that
+    creates the app (main.py, other WSGI servers). CLI commands and
+    create_db.py leave it off. Without any worker, receipts and
+    notifications wait in the queue; pages show a booking's BK-<id> code
+    until its order_code is stored.
+    """
+
+    def __init__(self, app=None):
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.metrics = JobMetrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("JOB_WORKER_ENABLED", None)  # None: only under `flask serve` / ASGI
+        app.config.setdefault("JOB_BATCH_SIZE", 100)
+        app.config.setdefault("JOB_POLL_INTERVAL", 1.0)    # seconds between empty polls
+        app.config.setdefault("JOB_MAX_ATTEMPTS", 5)
+        app.config.setdefault("JOB_RETRY_DELAY", 5.0)      # seconds, doubled per attempt
+        app.config.setdefault("JOB_LOCK_TIMEOUT", 300)     # seconds
+        app.config.setdefault("JOB_RETENTION", 86400)      # seconds to keep finished jobs
+        self._app = app
+        app.extensions["job_worker"] = self
+        app.cli.add_command(run_worker_command)
+        app.cli.add_command(job_stats_command)
+        if app.config["JOB_WORKER_ENABLED"]:
+            self.start()
+
+    def start_with_server(self, app) -> None:
+        """Called by the servers once they start taking requests."""
+        if app.config["JOB_WORKER_ENABLED"] is not False:
+            self.start()
+
+    # Queue operations (need an app context)
+    def claim(self, limit: int) -> list:
+        """Atomically mark up to `limit` due jobs as running and return them."""
+        now = datetime.utcnow()
+        # SKIP LOCKED lets concurrent workers take different rows (PostgreSQL);
+        # the outer status check stops a row claimed meanwhile from being
+        # claimed again, since the UPDATE re-reads it after the lock wait
+        due = (
+            db.select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= now)
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        rows = db.session.execute(
+            db.update(Job)
+            .where(Job.id.in_(due), Job.status == "queued")
+            .values(status="running", locked_at=now, attempts=Job.attempts + 1)
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+        return sorted(rows, key=lambda r: r.id)
+
+    def requeue_stale(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config["JOB_LOCK_TIMEOUT"])
+        result = db.session.execute(
+            db.update(Job)
+            .where(Job.status == "running", Job.locked_at < cutoff)
+            .values(status="queued", locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def prune(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config["JOB_RETENTION"])
+        result = db.session.execute(
+            db.delete(Job)
+            .where(Job.status == "done", Job.finished_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def _finish(self, jobs) -> None:
+        db.session.execute(
+            db.update(Job)
+            .where(Job.id.in_([job.id for job in jobs]))
+            .values(status="done", finished_at=datetime.utcnow(), locked_at=None, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _fail(self, job, error: str) -> None:
+        retry = job.attempts < job.max_attempts
+        delay = current_app.config["JOB_RETRY_DELAY"] * 2 ** (job.attempts - 1)
+        db.session.execute(
+            db.update(Job)
+            .where(Job.id == job.id)
+            .values(
+                status="queued" if retry else "failed",
+                run_after=datetime.utcnow() + timedelta(seconds=delay),
+                finished_at=None if retry else datetime.utcnow(),
+                locked_at=None,
+                last_error=error[:2000],
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        self.metrics.record(job.kind, "retried" if retry else "failed", 1)
+
+    def _run_group(self, kind: str, jobs) -> None:
+        """Run one kind's jobs together; on failure retry them one by one to isolate the bad one."""
+        fn = HANDLERS.get(kind)
+        started = time.perf_counter()
+        try:
+            if fn is None:
+                raise LookupError(f"no handler for job kind {kind!r}")
+            fn([json.loads(job.payload) for job in jobs])
+            self._finish(jobs)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            if len(jobs) > 1 and fn is not None:
+                for job in jobs:
+                    self._run_group(kind, [job])
+                return
+            for job in jobs:
+                self._app.logger.warning("Job %s (%s) failed: %s", job.id, kind, exc)
+                self._fail(job, f"{type(exc).__name__}: {exc}")
+            return
+        self.metrics.record(kind, "done", len(jobs), time.perf_counter() - started)
+
+    def run_once(self, limit: int | None = None) -> int:
+        """Claim and process one batch; returns the number of jobs claimed."""
+        jobs = self.claim(limit or current_app.config["JOB_BATCH_SIZE"])
+        by_kind = defaultdict(list)
+        for job in jobs:
+            by_kind[job.kind].append(job)
+        for kind, group in by_kind.items():
+            self._run_group(kind, group)
+        return len(jobs)
+
+    def run_forever(self, stop: threading.Event | None = None, on_tick=None) -> None:
+        stop = stop or self._stop
+        config = self._app.config
+        last_maintenance = 0.0
+        while not stop.is_set():
+            claimed = 0
+            try:
+                with self._app.app_context():
+                    if time.monotonic() - last_maintenance > 60:
+                        self.requeue_stale()
+                        self.prune()
+                        last_maintenance = time.monotonic()
+                    claimed = self.run_once()
+            except Exception as exc:
+                # Missing tables, locked database, ...: try again next poll
+                self._app.logger.warning("Job worker poll failed: %s", exc)
+            if on_tick:
+                on_tick(claimed)
+            # A full batch means more work is probably waiting
+            if claimed < config["JOB_BATCH_SIZE"]:
+                stop.wait(config["JOB_POLL_INTERVAL"])
+
+    # In-process thread
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="job-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+job_worker = JobWorker()
+
+
+def queue_stats() -> dict:
+    """Jobs per kind and status, and the age of the oldest due job."""
+    counts = defaultdict(dict)
+    for kind, status, n in db.session.execute(
+        db.select(Job.kind, Job.status, db.func.count()).group_by(Job.kind, Job.status)
+    ):
+        counts[kind][status] = n
+    oldest = db.session.scalar(
+        db.select(db.func.min(Job.run_after)).where(Job.status == "queued", Job.run_after <= datetime.utcnow())
+    )
+    lag = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    return {"kinds": dict(counts), "oldest_due_s": round(lag, 1)}
+
+
+@click.command("run-worker")
+@click.option("--once", is_flag=True, help="Process what is due now, then exit.")
+@click.option("--report-every", default=30.0, show_default=True, help="Seconds between metric lines.")
+def run_worker_command(once, report_every):
+    """Process queued jobs (order codes, receipts, notifications) until interrupted."""
+    worker = current_app.extensions["job_worker"]
+    worker.stop()  # don't compete with the in-process thread
+    if once:
+        total = 0
+        while claimed := worker.run_once():
+            total += claimed
+        click.echo(json.dumps({"claimed": total, **worker.metrics.snapshot()}))
+        return
+
+    last = [time.monotonic()]
+
+    def report(_claimed):
+        if time.monotonic() - last[0] >= report_every:
+            last[0] = time.monotonic()
+            click.echo(json.dumps(worker.metrics.snapshot()))
+
+    click.echo("Job worker running; Ctrl+C to stop.")
+    try:
+        worker.run_forever(threading.Event(), on_tick=report)
+    except KeyboardInterrupt:
+        pass
+    click.echo(json.dumps(worker.metrics.snapshot()))
+
+
+@click.command("job-stats")
+def job_stats_command():
+    """Show queue depth per job kind and status."""
+    click.echo(json.dumps(queue_stats(), indent=2))
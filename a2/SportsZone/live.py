@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+
+from . import db
+from .models import Event
+
+RECONNECT_MS = 3000  # EventSource retry delay sent to clients
+
+
+def availability_query(event_id: int):
+    return (
+        db.select(Event.tickets_sold, Event.total_tickets, Event.effective_status.label("status"))
+        .where(Event.id == event_id)
+    )
+
+
+def availability(event_id: int) -> dict | None:
+    """Current ticket counts and status of one event, read on a short-lived connection."""
+    with db.engine.connect() as conn:
+        row = conn.execute(availability_query(event_id)).first()
+    if row is None:
+        return None
+    return snapshot(event_id, row.tickets_sold, row.total_tickets, row.status)
+
+
+def snapshot(event_id: int, tickets_sold: int, total_tickets: int, status: str) -> dict:
+    sold, total = tickets_sold or 0, total_tickets or 0
+    return {
+        "event_id": event_id,
+        "tickets_sold": sold,
+        "total_tickets": total,
+        "remaining": max(total - sold, 0),
+        "status": status,
+        "etag": f"{sold}-{total}-{status}",
+    }
+
+
+class _Channel:
+    __slots__ = ("cond", "latest", "version", "subscribers", "async_waiters")
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.latest = None
+        self.version = 0
+        self.subscribers = 0
+        self.async_waiters = set()  # (event loop, asyncio.Event) of coroutines in wait_async
+
+
+class AvailabilityHub:
+    """
+    In-process pub/sub for ticket availability. Writers publish a snapshot
+    after they commit; each open stream waits on its event's channel and
+    is woken only by changes to that event. Channels exist only while
+    someone is subscribed, so publishing to an event nobody watches is a
+    dict lookup.
+
+    The hub only sees this process's writes. Streams re-read the event every
+    LIVE_RESYNC_INTERVAL seconds, which also picks up bookings made by other
+    workers and doubles as the keep-alive.
+
+    Under a WSGI server every open stream or long-poll holds a request
+    thread, so LIVE_MAX_STREAMS must stay well below the thread count; it
+    defaults to a quarter of SERVER_THREADS. Past the cap, streams are
+    refused and long-polls answer at once, which live.js turns into
+    periodic polling. The ASGI stack serves these endpoints on the event
+    loop and has its own ASGI_MAX_STREAMS.
+    """
+
+    def __init__(self, app=None):
+        self._channels: dict[int, _Channel] = {}
+        self._lock = threading.Lock()
+        self._streams = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("LIVE_UPDATES_ENABLED", True)
+        # Streams + long-polls per process; each holds a WSGI thread
+        app.config.setdefault("LIVE_MAX_STREAMS", app.config.get("SERVER_THREADS", 16) // 4)
+        app.config.setdefault("LIVE_RESYNC_INTERVAL", 15.0)   # seconds
+        app.config.setdefault("LIVE_STREAM_TTL", 300.0)       # seconds before a stream asks the client to reconnect
+        app.config.setdefault("LIVE_POLL_TIMEOUT", 25.0)      # seconds a long-poll waits for a change
+        self.limit_streams(app.config["LIVE_MAX_STREAMS"])
+        app.extensions["live"] = self
+
+    def limit_streams(self, limit: int) -> None:
+        """Resize the stream slots; call before the server starts taking requests."""
+        self._streams = threading.BoundedSemaphore(max(limit, 0))
+
+    def has_subscribers(self, event_id: int) -> bool:
+        return event_id in self._channels
+
+    def publish(self, event_id: int, data: dict) -> None:
+        channel = self._channels.get(event_id)
+        if channel is None:
+            return
+        with channel.cond:
+            channel.latest = data
+            channel.version += 1
+            channel.cond.notify_all()
+            for loop, woken in channel.async_waiters:
+                loop.call_soon_threadsafe(woken.set)
+
+    def announce(self, event_id: int) -> None:
+        """Publish the event's committed state, reading it only if someone is watching."""
+        if self.has_subscribers(event_id):
+            data = availability(event_id)
+            if data is not None:
+                self.publish(event_id, data)
+
+    @contextmanager
+    def subscribe(self, event_id: int):
+        with self._lock:
+            channel = self._channels.get(event_id)
+            if channel is None:
+                channel = self._channels[event_id] = _Channel()
+            channel.subscribers += 1
+        try:
+            yield channel
+        finally:
+            with self._lock:
+                channel.subscribers -= 1
+                if channel.subscribers == 0:
+                    del self._channels[event_id]
+
+    def wait(self, channel: _Channel, seen: int, timeout: float) -> tuple[int, dict | None]:
+        """Block until something newer than version `seen` is published, or time out."""
+        with channel.cond:
+            channel.cond.wait_for(lambda: channel.version > seen, timeout)
+            return channel.version, channel.latest if channel.version > seen else None
+
+    async def wait_async(self, channel: _Channel, seen: int, timeout: float) -> tuple[int, dict | None]:
+        """wait() for coroutines: parks on the event loop instead of holding a thread."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with channel.cond:
+            if channel.version > seen:
+                return channel.version, channel.latest
+            channel.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with channel.cond:
+                channel.async_waiters.discard(waiter)
+        with channel.cond:
+            return channel.version, channel.latest if channel.version > seen else None
+
+    def next_change(self, event_id: int, etag: str | None, timeout: float) -> dict | None:
+        """Long-poll: the event's state as soon as it differs from `etag` (at most `timeout` s)."""
+        with self.subscribe(event_id) as channel:
+            seen = channel.version
+            current = availability(event_id)
+            if current is None or current["etag"] != etag:
+                return current
+            _, data = self.wait(channel, seen, timeout)
+            return data or availability(event_id)
+
+    def open_stream(self) -> bool:
+        """Take one of the LIVE_MAX_STREAMS slots; False when they are all in use."""
+        return self._streams.acquire(blocking=False)
+
+    def close_stream(self) -> None:
+        self._streams.release()
+
+    def stream(self, event_id: int):
+        """Server-sent events for one event: the current state, then each change."""
+        config = current_app.config
+        resync = config["LIVE_RESYNC_INTERVAL"]
+        deadline = time.monotonic() + config["LIVE_STREAM_TTL"]
+        with self.subscribe(event_id) as channel:
+            seen = channel.version
+            last = availability(event_id)
+            if last is None:
+                return
+            yield f"retry: {RECONNECT_MS}\nevent: availability\ndata: {json.dumps(last)}\n\n"
+            while time.monotonic() < deadline:
+                seen, data = self.wait(channel, seen, resync)
+                data = data or availability(event_id)
+                if data is None:
+                    return
+                if data["etag"] == last["etag"]:
+                    yield ": keep-alive\n\n"
+                    continue
+                last = data
+                yield f"event: availability\ndata: {json.dumps(data)}\n\n"
+
+
+availability_hub = AvailabilityHub()
@@ -1,5 +1,7 @@
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload, selectinload
 from . import db
 
 #Users 
@@ -33,7 +35,7 @@ class Venue(db.Model):
     __tablename__ = "venues"
 
     id = db.Column(db.Integer, primary_key=True)
-    venue_name = db.Column(db.String(128), nullable=False)
+    venue_name = db.Column(db.String(128), index=True, nullable=False)  # upsert-by-name lookup
     venue_address = db.Column(db.String(256))
     capacity = db.Column(db.Integer)
 
@@ -43,9 +45,22 @@ class Venue(db.Model):
         return f"<Venue {self.venue_name}>"
 
 
+def _now_param():
+    """Bind parameter that resolves to the local time when the query runs."""
+    return db.bindparam("now", type_=db.DateTime, callable_=datetime.now, unique=True)
+
+
 # Events
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        # Home page listing / API stream: ORDER BY start_datetime, id (+ keyset seek)
+        db.Index("ix_events_start_datetime_id", "start_datetime", "id"),
+        # My Events: WHERE user_id = ? ORDER BY start_datetime DESC
+        db.Index("ix_events_user_id_start_datetime", "user_id", "start_datetime"),
+        # Home page facet counts: GROUP BY sports_type, effective status (covering)
+        db.Index("ix_events_sports_type_status_end_datetime", "sports_type", "status", "end_datetime"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)  # creator/owner
@@ -77,13 +92,41 @@ class Event(db.Model):
     )
 
     #  Helpers 
+    @hybrid_property
+    def effective_status(self) -> str:
+        """
+        Status as seen by readers: events past their end time count as
+        'Inactive' even before the expiry sweep has written that down.
+        """
+        if (
+            self.end_datetime is not None
+            and self.end_datetime < datetime.now()
+            and self.status not in ("Inactive", "Cancelled")
+        ):
+            return "Inactive"
+        return self.status
+
+    @effective_status.expression
+    def effective_status(cls):
+        return db.case(
+            (
+                db.and_(
+                    cls.end_datetime.isnot(None),
+                    cls.end_datetime < _now_param(),
+                    cls.status.notin_(["Inactive", "Cancelled"]),
+                ),
+                "Inactive",
+            ),
+            else_=cls.status,
+        )
+
     def remaining_tickets(self) -> int:
         """Non-negative remaining tickets based on totals and sold count."""
         return max(0, (self.total_tickets or 0) - (self.tickets_sold or 0))
 
     def can_book(self, qty: int) -> bool:
         """True if event is open and has enough tickets for qty."""
-        if self.status != "Open":
+        if self.effective_status != "Open":
             return False
         if not qty or qty <= 0:
             return False
@@ -120,6 +163,11 @@ class Event(db.Model):
 # Comments 
 class Comment(db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Event page thread, keyset-paged: WHERE event_id = ? AND (created_at, id) < (?, ?)
+        # ORDER BY created_at DESC, id DESC
+        db.Index("ix_comments_event_id_created_at_id", "event_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
@@ -134,13 +182,179 @@ class Comment(db.Model):
 # Bookings
 class Booking(db.Model):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Booking history: WHERE user_id = ? ORDER BY booking_date DESC
+        db.Index("ix_bookings_user_id_booking_date", "user_id", "booking_date"),
+        # Cancellation fan-out: WHERE event_id = ? AND id > ? ORDER BY id
+        db.Index("ix_bookings_event_id_id", "event_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
     booking_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     booking_quantity = db.Column(db.Integer, nullable=False)
+    unit_price = db.Column(db.Float)  # ticket price when booked; refunds and revenue use it
     order_code = db.Column(db.String(32), index=True)  # e.g., "BK-123" after insert
+    status = db.Column(db.String(16), default="Confirmed", server_default="Confirmed", nullable=False)
 
     def __repr__(self) -> str:
         return f"<Booking {self.id} x{self.booking_quantity}>"
+
+
+# Booking history read model
+class BookingHistory(db.Model):
+    """
+    One display-ready row per booking for the Booking History page, kept in
+    step with bookings and events by history.py so the page is a single
+    indexed range read instead of a three-way join.
+    """
+    __tablename__ = "booking_history"
+    __table_args__ = (
+        # WHERE user_id = ? ORDER BY booking_date DESC, booking_id DESC (+ keyset seek)
+        db.Index("ix_booking_history_user_id_booking_date", "user_id", "booking_date", "booking_id"),
+    )
+
+    booking_id = db.Column(db.Integer, db.ForeignKey("bookings.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), index=True, nullable=False)
+    booking_date = db.Column(db.DateTime, nullable=False)
+    booked_at = db.Column(db.String(32), nullable=False)  # booking_date, formatted for display
+    quantity = db.Column(db.Integer, nullable=False)
+    order_code = db.Column(db.String(32))
+    status = db.Column(db.String(16), nullable=False)
+    event_title = db.Column(db.String(256), nullable=False)
+    event_image = db.Column(db.String(256))
+    sports_type = db.Column(db.String(64))
+
+    def __repr__(self) -> str:
+        return f"<BookingHistory {self.booking_id} user={self.user_id}>"
+
+
+# Per-event aggregates
+class EventStats(db.Model):
+    """
+    Running totals per event, maintained in the same transaction as each
+    booking and comment (see stats.py) and rebuilt by `flask reconcile-stats`.
+    """
+    __tablename__ = "event_stats"
+
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), primary_key=True)
+    booking_count = db.Column(db.Integer, default=0, nullable=False)
+    tickets_booked = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+    last_activity = db.Column(db.DateTime)
+
+    event = db.relationship("Event", backref=db.backref("stats", uselist=False, lazy=True))
+
+    def __repr__(self) -> str:
+        return f"<EventStats {self.event_id} bookings={self.booking_count} comments={self.comment_count}>"
+
+
+# Event cancellation
+class CancellationRun(db.Model):
+    """
+    Progress of cancelling one event's bookings (see cancellation.py).
+    `last_booking_id` is the resume point: every booking up to it is done.
+    """
+    __tablename__ = "cancellation_runs"
+
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), primary_key=True)
+    status = db.Column(db.String(16), default="running", nullable=False)  # running / done
+    total = db.Column(db.Integer, default=0, nullable=False)
+    processed = db.Column(db.Integer, default=0, nullable=False)
+    refunded = db.Column(db.Float, default=0.0, nullable=False)
+    last_booking_id = db.Column(db.Integer, default=0, nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self) -> str:
+        return f"<CancellationRun {self.event_id} {self.processed}/{self.total}>"
+
+
+class Refund(db.Model):
+    """Money owed back for a cancelled booking; paid out by whatever handles payments."""
+    __tablename__ = "refunds"
+
+    id = db.Column(db.Integer, primary_key=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey("bookings.id"), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), index=True, nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id"), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(16), default="pending", nullable=False)  # pending / paid
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Refund {self.id} booking={self.booking_id} {self.amount:.2f}>"
+
+
+# Background jobs
+class Job(db.Model):
+    """
+    A unit of deferred work (see jobs.py). Rows are written in the same
+    transaction as the change that caused them, so a job exists if and
+    only if that change committed.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Worker claim: WHERE status = 'queued' AND run_after <= ? ORDER BY id
+        db.Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON object
+    status = db.Column(db.String(16), default="queued", nullable=False)  # queued/running/done/failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.kind} {self.status}>"
+
+
+# Notifications
+class Notification(db.Model):
+    """Outgoing message for a user (booking receipt, cancellation, new comment)."""
+    __tablename__ = "notifications"
+    __table_args__ = (
+        db.Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    kind = db.Column(db.String(32), nullable=False)  # receipt / event_cancelled / comment
+    subject = db.Column(db.String(256), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime)  # set by whatever delivers it (mail, push, ...)
+
+    def __repr__(self) -> str:
+        return f"<Notification {self.id} {self.kind} user={self.user_id}>"
+
+
+# Load profiles
+# Named eager-loading strategies, one per view, so templates that touch
+# relationships (venue_text, comment authors, ...) don't trigger a lazy
+# SELECT per row. Built on demand because backref attributes such as
+# Event.venue only exist once the mappers are configured.
+def load_options(profile: str) -> list:
+    """Loader options for a named profile, e.g. query.options(*load_options("event_card"))."""
+    profiles = {
+        # Event cards on the home page and My Events
+        "event_card": lambda: [joinedload(Event.venue)],
+        # My Events: cards plus the organiser's sales figures
+        "owner_card": lambda: [joinedload(Event.venue), joinedload(Event.stats)],
+        # Single event page
+        "event_detail": lambda: [joinedload(Event.venue), joinedload(Event.stats)],
+        # Comments with just enough of the author for the byline, one IN query per page
+        "comment_thread": lambda: [
+            selectinload(Comment.user).load_only(User.first_name, User.surname)
+        ],
+    }
+    return profiles[profile]()
@@ -0,0 +1,65 @@
+from flask import render_template
+
+from . import db
+from .history import refresh_bookings
+from .jobs import handler
+from .models import Booking, Comment, Event, Notification, User, load_options
+
+
+def order_code_expr():
+    """SQL for a booking's order code, e.g. BK-123."""
+    return db.literal("BK-") + db.cast(Booking.id, db.String)
+
+
+def _notify(rows: list[dict]) -> None:
+    if rows:
+        db.session.execute(db.insert(Notification), rows)
+
+
+@handler("booking.confirmed")
+def confirm_bookings(payloads: list[dict]) -> None:
+    """Assign order codes to a batch of bookings and write their receipts."""
+    ids = [p["booking_id"] for p in payloads]
+    db.session.execute(
+        db.update(Booking)
+        .where(Booking.id.in_(ids), Booking.order_code.is_(None))
+        .values(order_code=order_code_expr())
+        .execution_options(synchronize_session=False)
+    )
+    refresh_bookings(ids)
+    rows = db.session.execute(
+        db.select(Booking, Event, User.first_name)
+        .join(Event, Booking.event_id == Event.id)
+        .join(User, Booking.user_id == User.id)
+        .where(Booking.id.in_(ids))
+        .options(*load_options("event_card"))
+    ).all()
+    _notify([
+        {
+            "user_id": booking.user_id,
+            "kind": "receipt",
+            "subject": f"Your tickets for {event.event_title} ({booking.order_code})",
+            "body": render_template("receipt.txt", booking=booking, event=event, first_name=first_name),
+        }
+        for booking, event, first_name in rows
+    ])
+
+
+@handler("comment.added")
+def notify_comments(payloads: list[dict]) -> None:
+    """Let event organisers know about new comments (not their own)."""
+    rows = db.session.execute(
+        db.select(Event.user_id, Event.event_title, User.first_name, Comment.text)
+        .join(Event, Comment.event_id == Event.id)
+        .join(User, Comment.user_id == User.id, isouter=True)
+        .where(Comment.id.in_([p["comment_id"] for p in payloads]), Comment.user_id != Event.user_id)
+    ).all()
+    _notify([
+        {
+            "user_id": owner_id,
+            "kind": "comment",
+            "subject": f"New comment on {title}",
+            "body": f"{author or 'Someone'} wrote: {text}",
+        }
+        for owner_id, title, author, text in rows
+    ])
@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime
+
+from flask_sqlalchemy.query import Query
+
+from . import db
+
+
+def encode_cursor(values) -> str:
+    """Opaque, URL-safe token for a row's sort-key values."""
+    plain = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> list:
+    """Inverse of encode_cursor; raises ValueError on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        plain = json.loads(raw)
+        if not isinstance(plain, list):
+            raise ValueError("cursor is not a list")
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in plain
+        ]
+    except (TypeError, KeyError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"bad cursor: {exc}") from exc
+
+
+class Page:
+    """One keyset page: the items plus the cursor to fetch what follows."""
+
+    def __init__(self, items: list, key_values: list):
+        self.items = items
+        self._key_values = key_values
+        self.next_cursor = None
+
+    def cursor_after(self, index: int) -> str:
+        return encode_cursor(self._key_values[index])
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def keyset_query(query, keys: list, cursor: str | None = None, per_page: int = 20,
+                 descending: bool = False):
+    """
+    The Query or Select for the page after `cursor`, ordered by `keys` (the
+    last key must be unique, e.g. the primary key). Seeks with a row
+    comparison instead of OFFSET, so deep pages cost the same as the first.
+    Fetches one row extra to tell whether another page follows.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise ValueError("cursor does not match this listing")
+        bound = db.tuple_(*(db.literal(v, k.type) for k, v in zip(keys, values)))
+        after = db.tuple_(*keys) < bound if descending else db.tuple_(*keys) > bound
+        query = query.filter(after)
+
+    ordering = [k.desc() if descending else k.asc() for k in keys]
+    return query.add_columns(*keys).order_by(*ordering).limit(per_page + 1)
+
+
+def page_from_rows(rows, n_keys: int, per_page: int) -> Page:
+    """Build a Page from the rows of a keyset_query (items first, then the n keys)."""
+    items, key_values = [], []
+    if per_page < 1:
+        return Page(items, key_values)
+    for row in rows[:per_page]:
+        head = tuple(row[:-n_keys])
+        items.append(head[0] if len(head) == 1 else head)
+        key_values.append(list(row[-n_keys:]))
+
+    page = Page(items, key_values)
+    if len(rows) > per_page:
+        page.next_cursor = page.cursor_after(per_page - 1)
+    return page
+
+
+def keyset_page(query, keys: list, cursor: str | None = None, per_page: int = 20,
+                descending: bool = False) -> Page:
+    """Fetch the page after `cursor`; see keyset_query."""
+    query = keyset_query(query, keys, cursor, per_page, descending)
+    rows = query.all() if isinstance(query, Query) else db.session.execute(query).all()
+    return page_from_rows(rows, len(keys), per_page)
@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from flask import Blueprint, abort, current_app, g, has_request_context, jsonify, request
+from flask import before_render_template, template_rendered
+from sqlalchemy import event
+
+from . import db
+
+# Blueprint (only registered when profiling is enabled)
+profiling_bp = Blueprint("profiling", __name__, url_prefix="/_profiling")
+
+
+def _profile():
+    """The current request's profile, or None outside profiled requests."""
+    if has_request_context():
+        return g.get("_profile")
+    return None
+
+
+@contextmanager
+def span(name: str):
+    """Time a block (e.g. password hashing) into the request's Server-Timing."""
+    profile = _profile()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile["spans"][name] += time.perf_counter() - started
+
+
+class RequestStats:
+    """Rolling window of recent request timings, grouped by endpoint."""
+
+    def __init__(self, window: int = 500):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, sample: dict) -> None:
+        with self._lock:
+            self._samples[endpoint].append(sample)
+
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+        report = {}
+        for endpoint, samples in sorted(snapshot.items()):
+            totals = sorted(s["total_ms"] for s in samples)
+            n = len(samples)
+            report[endpoint] = {
+                "requests": n,
+                "total_ms_p50": totals[n // 2],
+                "total_ms_p95": totals[min(n - 1, int(n * 0.95))],
+                "db_ms_avg": round(sum(s["db_ms"] for s in samples) / n, 3),
+                "queries_avg": round(sum(s["queries"] for s in samples) / n, 2),
+                "template_ms_avg": round(sum(s["template_ms"] for s in samples) / n, 3),
+            }
+        return report
+
+
+class RequestProfiler:
+    """
+    Opt-in per-request instrumentation (PROFILING_ENABLED). Records SQL
+    statement timings from engine events, Jinja render time from Flask's
+    template signals and any span() blocks, then reports them as a
+    Server-Timing header, rolling stats at /_profiling/stats (local
+    requests only) and a sampled slow-request log.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("PROFILING_ENABLED", False)
+        app.config.setdefault("PROFILING_SLOW_MS", 500)
+        app.config.setdefault("PROFILING_SAMPLE_RATE", 1.0)  # of slow requests to log
+        app.config.setdefault("PROFILING_WINDOW", 500)       # samples kept per endpoint
+        app.config.setdefault("PROFILING_STATS_ADDRS", ("127.0.0.1", "::1"))  # clients allowed /_profiling/stats
+        if not app.config["PROFILING_ENABLED"]:
+            return
+
+        app.extensions["profiler"] = RequestStats(app.config["PROFILING_WINDOW"])
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", _before_execute)
+            event.listen(db.engine, "after_cursor_execute", _after_execute)
+        before_render_template.connect(_before_render, app)
+        template_rendered.connect(_after_render, app)
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+        app.register_blueprint(profiling_bp)
+
+
+# Engine / template hooks
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _profile() is not None:
+        conn.info.setdefault("_profile_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _profile()
+    if profile is None or not conn.info.get("_profile_started"):
+        return
+    elapsed = time.perf_counter() - conn.info["_profile_started"].pop()
+    profile["db"] += elapsed
+    profile["queries"].append((elapsed, statement))
+
+
+def _before_render(sender, template, context, **extra):
+    profile = _profile()
+    if profile is not None:
+        profile["render_started"].append((time.perf_counter(), profile["db"]))
+
+
+def _after_render(sender, template, context, **extra):
+    profile = _profile()
+    if profile is None or not profile["render_started"]:
+        return
+    started, db_before = profile["render_started"].pop()
+    # Lazy loads fired from the template are already counted as DB time
+    profile["template"] += (time.perf_counter() - started) - (profile["db"] - db_before)
+
+
+def _start_request():
+    g._profile = {
+        "started": time.perf_counter(),
+        "db": 0.0,
+        "queries": [],
+        "template": 0.0,
+        "render_started": [],
+        "spans": defaultdict(float),
+    }
+
+
+def _finish_request(response):
+    profile = g.pop("_profile", None)
+    if profile is None:
+        return response
+    total = time.perf_counter() - profile["started"]
+
+    timings = [
+        f'db;dur={profile["db"] * 1000:.2f};desc="{len(profile["queries"])} queries"',
+        f'tpl;dur={profile["template"] * 1000:.2f}',
+    ]
+    timings += [f"{name};dur={secs * 1000:.2f}" for name, secs in profile["spans"].items()]
+    timings.append(f"total;dur={total * 1000:.2f}")
+    response.headers["Server-Timing"] = ", ".join(timings)
+
+    sample = {
+        "total_ms": round(total * 1000, 3),
+        "db_ms": round(profile["db"] * 1000, 3),
+        "queries": len(profile["queries"]),
+        "template_ms": round(profile["template"] * 1000, 3),
+    }
+    current_app.extensions["profiler"].add(request.endpoint or "<unmatched>", sample)
+
+    config = current_app.config
+    if sample["total_ms"] >= config["PROFILING_SLOW_MS"] and random.random() < config["PROFILING_SAMPLE_RATE"]:
+        slowest = sorted(profile["queries"], key=lambda q: q[0], reverse=True)[:3]
+        current_app.logger.warning(
+            "Slow request %s %s: %s; slowest statements:\n%s",
+            request.method, request.full_path, sample,
+            "\n".join(f"  {secs * 1000:.2f} ms  {stmt}" for secs, stmt in slowest),
+        )
+    return response
+
+
+# Rolling stats endpoint
+@profiling_bp.before_request
+def _local_only():
+    # Requests relayed by a local reverse proxy carry X-Forwarded-For
+    if (request.remote_addr not in current_app.config["PROFILING_STATS_ADDRS"]
+            or "X-Forwarded-For" in request.headers):
+        abort(404)
+
+
+@profiling_bp.route("/stats", endpoint="stats")
+def stats():
+    return jsonify(current_app.extensions["profiler"].summary())
@@ -0,0 +1,76 @@
+from . import db
+from .models import Event, Comment, BookingHistory, load_options
+from .search import search_index
+from .templating import when
+
+
+def filter_events(query, category: str = "all", status: str = "all", q: str = ""):
+    """
+    Apply the home page filters to an Event query or select.
+
+    category: sports_type (e.g. football, tennis), 'all' to disable
+    status: Open / Sold Out / Cancelled / Inactive, 'all' to disable
+    q: free text search across title, teams, and venue name
+
+    Returns (query, sort_keys): the keys give relevance order for searches
+    and chronological order otherwise, ending in Event.id for keyset paging.
+    """
+    # Category filter (sports type)
+    if category != "all":
+        query = query.filter(Event.sports_type.ilike(f"%{category}%"))
+
+    # Status filter (case-insensitive; accept 'soldout' shortcut)
+    if status != "all":
+        if status == "soldout":
+            query = query.filter(Event.effective_status.ilike("%sold out%"))
+        else:
+            query = query.filter(Event.effective_status.ilike(f"%{status}%"))
+
+    keys = [Event.start_datetime, Event.id]
+
+    # Full-text search across title, teams, and venue (ranked, prefix match)
+    if q:
+        query, rank = search_index.apply(query, q)
+        if rank is not None:
+            keys.insert(0, rank)
+
+    return query, keys
+
+
+def listing_args(args) -> tuple[str, str, str]:
+    """Normalised (category, status, q) from request args."""
+    return (
+        (args.get("category") or "all").lower(),
+        (args.get("status") or "all").lower(),
+        (args.get("q") or "").strip().lower(),
+    )
+
+
+def event_comments(event_id: int):
+    """
+    An event's comment thread, authors batch-loaded, and the keyset keys
+    (newest first) that page through it on one index.
+    """
+    query = db.select(Comment).options(*load_options("comment_thread")).where(Comment.event_id == event_id)
+    return query, [Comment.created_at, Comment.id]
+
+
+def comment_record(comment: Comment) -> dict:
+    """JSON shape of a comment for the comments API and live appends."""
+    user = comment.user
+    return {
+        "id": comment.id,
+        "author": f"{user.first_name} {user.surname}" if user else "Anon",
+        "text": comment.text,
+        "created_at": comment.created_at.isoformat(),
+        "posted": when(comment.created_at, "numeric"),
+    }
+
+
+def booking_history(user_id: int):
+    """
+    A user's Booking History rows from the read model, and the keyset keys
+    (newest first) that page through them on one index.
+    """
+    query = db.select(BookingHistory).where(BookingHistory.user_id == user_id)
+    return query, [BookingHistory.booking_date, BookingHistory.booking_id]
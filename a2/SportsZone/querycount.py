@@ -0,0 +1,51 @@
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from . import db
+
+
+class QueryCounter:
+    """Records the SQL statements the current thread sends to the engine."""
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.statements: list[str] = []
+        self._thread = threading.get_ident()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        self.engine = self.engine or db.engine
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        return False
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None):
+    """
+    Fail if the block runs more than `limit` SQL statements, e.g.
+
+        with app.app_context(), assert_max_queries(4):
+            client.get("/event/1")
+
+    Catches N+1 regressions where a template lazily loads per row.
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{listing}"
+        )
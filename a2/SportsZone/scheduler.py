@@ -0,0 +1,114 @@
+import threading
+import time
+from datetime import datetime
+
+from . import db
+from .cache import page_cache
+from .live import availability_hub
+from .models import Event
+
+# Statuses the sweep never overwrites
+FINAL_STATUSES = ("Inactive", "Cancelled")
+
+
+def expire_events(now: datetime | None = None) -> list[int]:
+    """Flip every event past its end time to 'Inactive' in one UPDATE; returns their ids."""
+    now = now or datetime.now()
+    expired = db.session.scalars(
+        db.update(Event)
+        .where(
+            Event.end_datetime.isnot(None),
+            Event.end_datetime < now,
+            Event.status.notin_(FINAL_STATUSES),
+        )
+        .values(status="Inactive")
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+    if expired:
+        page_cache.invalidate("events", *(f"event:{event_id}" for event_id in expired))
+        for event_id in expired:
+            availability_hub.announce(event_id)
+    return expired
+
+
+def next_expiry(now: datetime | None = None) -> datetime | None:
+    """End time of the next event that is still due to expire, if any."""
+    now = now or datetime.now()
+    return db.session.scalar(
+        db.select(db.func.min(Event.end_datetime)).where(
+            Event.end_datetime >= now,
+            Event.status.notin_(FINAL_STATUSES),
+        )
+    )
+
+
+class ExpiryScheduler:
+    """
+    Background thread that runs the expiry sweep every `interval` seconds,
+    or sooner when a known event ends before the next tick. It also prunes
+    the shared page cache once per interval.
+
+    `flask serve` and the ASGI lifespan start it unless
+    EXPIRY_SCHEDULER_ENABLED is False; True starts it in every process that
+    creates the app (main.py, other WSGI servers). CLI commands and
+    create_db.py leave it off.
+    """
+
+    def __init__(self, app=None, interval: float = 60.0):
+        self.interval = interval
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        self._app = app
+        self.interval = app.config.get("EXPIRY_SWEEP_INTERVAL", self.interval)
+        app.extensions["expiry_scheduler"] = self
+        if app.config.get("EXPIRY_SCHEDULER_ENABLED"):  # None: only under `flask serve` / ASGI
+            self.start()
+
+    def start_with_server(self, app) -> None:
+        """Called by the servers once they start taking requests."""
+        if app.config.get("EXPIRY_SCHEDULER_ENABLED") is not False:
+            self.start()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="expiry-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _seconds_until_next_run(self) -> float:
+        wait = self.interval
+        upcoming = next_expiry()
+        if upcoming is not None:
+            wait = min(wait, (upcoming - datetime.now()).total_seconds() + 1)
+        return max(wait, 1.0)
+
+    def _run(self) -> None:
+        last_prune = time.monotonic()
+        while not self._stop.is_set():
+            wait = self.interval
+            try:
+                with self._app.app_context():
+                    expire_events()
+                    if time.monotonic() - last_prune >= self.interval:
+                        page_cache.prune()
+                        last_prune = time.monotonic()
+                    wait = self._seconds_until_next_run()
+            except Exception as exc:
+                # Missing tables, locked database, ...: try again next tick
+                self._app.logger.warning("Expiry sweep failed: %s", exc)
+            self._stop.wait(wait)
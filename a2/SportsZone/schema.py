@@ -0,0 +1,269 @@
+import re
+import threading
+from datetime import datetime
+
+import click
+from sqlalchemy import event
+from sqlalchemy.schema import CreateColumn
+
+from . import db
+from .models import Event, Venue, User, EventStats, BookingHistory, load_options
+from .pagination import encode_cursor, keyset_page
+from .facets import facet_grid
+from .queries import filter_events, event_comments, booking_history
+from . import history, stats
+from .search import search_index
+
+
+# Index migration
+# Indexes replaced by a wider one on the models: table -> names to drop
+RETIRED_INDEXES = {
+    "comments": ["ix_comments_event_id_created_at"],  # now (event_id, created_at, id)
+}
+
+
+def create_missing_indexes() -> list[str]:
+    """
+    Create any index declared on the models that the database lacks, and
+    drop the RETIRED_INDEXES they replace. db.create_all() skips tables that
+    already exist, indexes included, so existing deployments pick up new
+    indexes through this instead.
+    """
+    created = []
+    with db.engine.begin() as conn:
+        existing = _inspect(conn)
+        for table in db.metadata.sorted_tables:
+            if not existing.has_table(table.name):
+                continue
+            present = {ix["name"] for ix in existing.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in present:
+                    index.create(conn)
+                    created.append(index.name)
+            for name in RETIRED_INDEXES.get(table.name, []):
+                if name in present:
+                    conn.execute(db.text(f"DROP INDEX {name}"))
+    return created
+
+
+# Columns filled on existing rows when an upgrade adds them
+COLUMN_BACKFILLS = {
+    "bookings.unit_price": stats.price_bookings,
+}
+
+# Derived tables filled from existing rows when an upgrade creates them
+BACKFILLS = {
+    EventStats.__tablename__: stats.reconcile,
+    BookingHistory.__tablename__: history.rebuild,
+}
+
+
+def upgrade_schema() -> dict[str, list[str]]:
+    """
+    Bring the database up to the models: create missing tables (filling the
+    BACKFILLS), columns (filling the COLUMN_BACKFILLS) and indexes, and the
+    FTS5 search table where it is used. create_db.py and `flask upgrade-db` run
+    this once per deploy; app startup never touches the schema.
+    """
+    with db.engine.connect() as conn:
+        existing = _inspect(conn)
+        missing = [t.name for t in db.metadata.sorted_tables if not existing.has_table(t.name)]
+    db.create_all()
+    report = {
+        "tables": missing,
+        "columns": add_missing_columns(),
+        "indexes": create_missing_indexes(),
+    }
+    for name in report["columns"]:
+        if name in COLUMN_BACKFILLS:
+            COLUMN_BACKFILLS[name]()
+    for name in missing:
+        if name in BACKFILLS:
+            BACKFILLS[name]()
+    if search_index.create():
+        report["tables"].append("event_search")
+    return report
+
+
+def _inspect(conn):
+    """Inspector on `conn`, with SQLite's schema cache current."""
+    if conn.dialect.name == "sqlite":
+        # PRAGMA index_list / table_info don't reload a pooled connection's
+        # schema after another connection changed it; a query does
+        conn.exec_driver_sql("SELECT count(*) FROM sqlite_master")
+    return db.inspect(conn)
+
+
+def add_missing_columns(*tables) -> list[str]:
+    """
+    ALTER TABLE ... ADD COLUMN for model columns the database lacks (all of
+    `tables`, default every table). New columns must be nullable or carry a
+    server_default so existing rows stay valid.
+    """
+    added = []
+    with db.engine.begin() as conn:
+        existing = _inspect(conn)
+        for table in tables or db.metadata.sorted_tables:
+            if not existing.has_table(table.name):
+                continue
+            present = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(db.text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+# Query-plan checks
+class _Captured(Exception):
+    pass
+
+
+def capture_sql(run) -> tuple[str, object]:
+    """
+    The first statement `run()` sends to the database, with its parameters
+    already processed for the driver. Execution is aborted before it runs.
+    """
+    captured = []
+    thread = threading.get_ident()
+
+    def grab(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != thread:
+            return  # e.g. the expiry scheduler
+        captured.append((statement, parameters))
+        raise _Captured()
+
+    event.listen(db.engine, "before_cursor_execute", grab)
+    try:
+        run()
+    except _Captured:
+        pass
+    finally:
+        event.remove(db.engine, "before_cursor_execute", grab)
+        db.session.rollback()
+    if not captured:
+        raise RuntimeError("query ran no SQL")
+    return captured[0]
+
+
+def explain(statement: str, parameters) -> list[str]:
+    """SQLite EXPLAIN QUERY PLAN detail lines for a statement."""
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in rows]
+
+
+# "SCAN events" with no index reads the whole table. "SCAN events USING
+# [COVERING] INDEX ..." walks an index in order, which is only bounded when
+# the statement has a LIMIT and no temp B-tree re-sorts the rows first.
+_SCAN = re.compile(r"^SCAN (?!.*VIRTUAL TABLE)(\w+)(.*)")
+_SUBQUERY = re.compile(r"^(?:MATERIALIZE|CO-ROUTINE) (\w+)")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+# Hot queries allowed to read a whole index, and why
+ALLOWED_SCANS = {
+    "index facet counts": "one GROUP BY over the covering index; cached per events version (facets.py)",
+}
+
+
+def full_scans(plan: list[str], statement: str = "") -> list[str]:
+    """
+    Plan lines that read a whole table or a whole index. Scans of bounded
+    subqueries are fine, and so is an index walk that stops at a LIMIT.
+    """
+    subqueries = {m.group(1) for m in map(_SUBQUERY.match, plan) if m}
+    bounded = bool(_LIMIT.search(statement)) and not any("TEMP B-TREE" in line for line in plan)
+    return [
+        line for line in plan
+        if (m := _SCAN.match(line)) and m.group(1) not in subqueries
+        and not ("USING" in m.group(2) and bounded)
+    ]
+
+
+def hot_queries() -> dict:
+    """The queries behind views.py, keyed by name, as zero-argument callables."""
+    now = datetime.now()
+    cursor = encode_cursor([now, 1])
+
+    def listing(cat="all", st="all", q=""):
+        def run():
+            query, keys = filter_events(
+                Event.query.options(*load_options("event_card")), cat, st, q
+            )
+            # Seek from a mid-listing cursor (a leading rank key gets 0)
+            values = [0] * (len(keys) - 2) + [now, 1]
+            return keyset_page(query, keys, encode_cursor(values), per_page=24)
+        return run
+
+    return {
+        "index": listing(),
+        "index (category + status)": listing("football", "open"),
+        "index (search)": listing(q="lions"),
+        "index facet counts": lambda: facet_grid(),
+        "view_event": lambda: Event.query.options(*load_options("event_detail")).get(1),
+        "view_event comments": lambda: keyset_page(
+            *event_comments(1), cursor, per_page=20, descending=True,
+        ),
+        "my_events": lambda: keyset_page(
+            Event.query.options(*load_options("owner_card")).filter(Event.user_id == 1),
+            [Event.start_datetime, Event.id], cursor, per_page=24, descending=True,
+        ),
+        "booking history": lambda: keyset_page(
+            *booking_history(1), cursor, per_page=24, descending=True,
+        ),
+        "create_event venue lookup": lambda: Venue.query.filter_by(venue_name="Gabba").first(),
+        "login / register email lookup": lambda: db.session.scalar(
+            db.select(User).where(User.email_id == "a@b.com")
+        ),
+        "register mobile lookup": lambda: db.session.scalar(
+            db.select(User).where(User.mobile_number == "0400000000")
+        ),
+    }
+
+
+def check_query_plans() -> dict[str, tuple[list[str], list[str]]]:
+    """name -> (plan, full scans) for every hot query; ALLOWED_SCANS report none."""
+    report = {}
+    for name, run in hot_queries().items():
+        statement, parameters = capture_sql(run)
+        plan = explain(statement, parameters)
+        report[name] = (plan, [] if name in ALLOWED_SCANS else full_scans(plan, statement))
+    return report
+
+
+@click.command("create-indexes")
+def create_indexes_command():
+    """Create indexes declared on the models but missing from the database."""
+    created = create_missing_indexes()
+    click.echo("Created: " + ", ".join(created) if created else "All indexes present.")
+
+
+@click.command("upgrade-db")
+def upgrade_db_command():
+    """Create missing tables, columns and indexes, and fill new derived tables."""
+    for kind, names in upgrade_schema().items():
+        click.echo(f"{kind.capitalize()} added: " + ", ".join(names) if names else f"No {kind} missing.")
+
+
+@click.command("check-query-plans")
+def check_query_plans_command():
+    """Fail if any hot query in views.py reads a whole table or index (SQLite)."""
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException("query-plan checks use SQLite's EXPLAIN QUERY PLAN")
+    failures = 0
+    for name, (plan, scans) in check_query_plans().items():
+        status = "FULL SCAN" if scans else "allowed scan" if name in ALLOWED_SCANS else "ok"
+        failures += bool(scans)
+        click.echo(f"[{status}] {name}")
+        for line in plan:
+            click.echo(f"    {line}")
+    if failures:
+        raise click.ClickException(f"{failures} queries fall back to a full table or index scan")
+
+
+def init_app(app) -> None:
+    app.cli.add_command(create_indexes_command)
+    app.cli.add_command(upgrade_db_command)
+    app.cli.add_command(check_query_plans_command)
@@ -0,0 +1,357 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+
+import click
+from flask import current_app
+
+from . import db
+from .models import Event, Venue
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Relevance weights per indexed field (title, home, away, venue)
+FIELD_WEIGHTS = (4.0, 1.0, 1.0, 2.0)
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def _document(event: Event, venue_name: str | None = None) -> tuple[str, str, str, str]:
+    if venue_name is None and event.venue_id:
+        venue = event.venue or db.session.get(Venue, event.venue_id)
+        venue_name = venue.venue_name if venue else ""
+    return (
+        event.event_title or "",
+        event.home_team_name or "",
+        event.away_team_name or "",
+        venue_name or "",
+    )
+
+
+class Fts5Backend:
+    """
+    SQLite FTS5 table `event_search` whose rowid is the event id, created
+    and filled by schema.upgrade_schema.
+    """
+
+    name = "fts5"
+
+    @staticmethod
+    def exists(conn) -> bool:
+        return bool(conn.scalar(db.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_search'"
+        )))
+
+    def ensure(self) -> None:
+        with db.engine.connect() as conn:
+            if not self.exists(conn):
+                raise LookupError("event_search table is missing (run flask upgrade-db)")
+
+    def create(self) -> bool:
+        """Create and fill the table if it is missing; True if it was created."""
+        # Own connection so creating the table never commits a caller's work
+        with db.engine.begin() as conn:
+            if self.exists(conn):
+                return False
+            conn.execute(db.text(
+                "CREATE VIRTUAL TABLE event_search USING fts5("
+                "event_title, home_team_name, away_team_name, venue_name, "
+                "tokenize = 'unicode61', prefix = '1 2 3')"
+            ))
+            # Weighted bm25 as the default rank so ORDER BY rank LIMIT stays fast
+            weights = ", ".join(str(w) for w in FIELD_WEIGHTS)
+            conn.execute(db.text(
+                f"INSERT INTO event_search(event_search, rank) VALUES ('rank', 'bm25({weights})')"
+            ))
+            if db.inspect(conn).has_table(Event.__tablename__):
+                self.rebuild(conn)
+        return True
+
+    _FILL = (
+        "INSERT INTO event_search(rowid, event_title, home_team_name, away_team_name, venue_name) "
+        "SELECT e.id, e.event_title, coalesce(e.home_team_name, ''), "
+        "coalesce(e.away_team_name, ''), coalesce(v.venue_name, '') "
+        "FROM events e LEFT JOIN venues v ON v.id = e.venue_id"
+    )
+
+    def rebuild(self, conn=None) -> int:
+        conn = conn or db.session
+        conn.execute(db.text("DELETE FROM event_search"))
+        result = conn.execute(db.text(self._FILL))
+        return result.rowcount or 0
+
+    def index_many(self, event_ids: list[int]) -> None:
+        ids = db.bindparam("ids", expanding=True)
+        db.session.execute(db.text("DELETE FROM event_search WHERE rowid IN :ids").bindparams(ids),
+                           {"ids": event_ids})
+        db.session.execute(db.text(self._FILL + " WHERE e.id IN :ids").bindparams(ids),
+                           {"ids": event_ids})
+
+    def index(self, event_id: int, doc: tuple) -> None:
+        self.remove(event_id)
+        db.session.execute(
+            db.text(
+                "INSERT INTO event_search(rowid, event_title, home_team_name, away_team_name, venue_name) "
+                "VALUES (:id, :title, :home, :away, :venue)"
+            ),
+            dict(zip(("id", "title", "home", "away", "venue"), (event_id, *doc))),
+        )
+
+    def remove(self, event_id: int) -> None:
+        db.session.execute(db.text("DELETE FROM event_search WHERE rowid = :id"), {"id": event_id})
+
+    def apply(self, query, terms: list[str]):
+        # Every term must match, each as a prefix: "lio"* "tig"*
+        match = " ".join(f'"{t}"*' for t in terms)
+        hits = (
+            db.text("SELECT rowid AS event_id, rank AS score FROM event_search WHERE event_search MATCH :match")
+            .bindparams(match=match)
+            .columns(event_id=db.Integer, score=db.Float)
+            .subquery("search_hits")
+        )
+        return query.join(hits, hits.c.event_id == Event.id), hits.c.score
+
+
+class MemoryBackend:
+    """
+    Pure-Python inverted index used when FTS5 is unavailable (every
+    non-SQLite DATABASE_URL). It is built from the database on first use, in
+    each process, and kept current by this process's writes only. Writes
+    made by other workers or the CLI show up once a search finds the index
+    older than SEARCH_REFRESH_INTERVAL and rebuilds it in the background;
+    until then those events are missing or stale in this process's results.
+
+    Hits reach SQL as an inline VALUES list joined to events, so only the
+    SEARCH_MAX_HITS best-ranked are kept; a very broad prefix (one letter
+    on a large table) can therefore miss lower-ranked events that a filter
+    would have kept.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._postings = defaultdict(dict)  # token -> {event_id: weight}
+        self._vocab = []                    # sorted tokens, for prefix lookups
+        self._docs = {}                     # event_id -> tokens it was indexed under
+        self._built_at = 0.0                # time.monotonic() of the last rebuild
+        self._refreshing = False
+
+    def ensure(self) -> None:
+        if not self._loaded:
+            self.rebuild()
+
+    def refresh_if_stale(self, app, interval: float) -> None:
+        """Rebuild in a background thread once the index is `interval` seconds old."""
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._built_at < interval:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as exc:
+                app.logger.warning("Search index refresh failed: %s", exc)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=refresh, name="search-refresh", daemon=True).start()
+
+    @staticmethod
+    def _documents():
+        return (
+            db.select(Event.id, Event.event_title, Event.home_team_name,
+                      Event.away_team_name, Venue.venue_name)
+            .join(Venue, Event.venue_id == Venue.id, isouter=True)
+        )
+
+    def rebuild(self) -> int:
+        # Build aside and swap, so searches keep using the old index meanwhile
+        postings, docs = defaultdict(dict), {}
+        for event_id, *doc in db.session.execute(self._documents()):
+            self._add(event_id, doc, postings, docs)
+        with self._lock:
+            self._postings, self._docs = postings, docs
+            self._vocab = sorted(postings)
+            self._loaded = True
+            self._built_at = time.monotonic()
+        return len(docs)
+
+    def _add(self, event_id: int, doc, postings=None, docs=None) -> None:
+        postings = self._postings if postings is None else postings
+        tokens = set()
+        for weight, field in zip(FIELD_WEIGHTS, doc):
+            for token in tokenize(field):
+                entry = postings[token]
+                entry[event_id] = entry.get(event_id, 0.0) + weight
+                tokens.add(token)
+        (self._docs if docs is None else docs)[event_id] = tokens
+
+    def _drop(self, event_id: int) -> None:
+        for token in self._docs.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self._postings[token]
+                    i = bisect.bisect_left(self._vocab, token)
+                    if i < len(self._vocab) and self._vocab[i] == token:
+                        del self._vocab[i]
+
+    def index(self, event_id: int, doc: tuple) -> None:
+        with self._lock:
+            self._drop(event_id)
+            self._add(event_id, doc)
+            for token in self._docs[event_id]:
+                i = bisect.bisect_left(self._vocab, token)
+                if i == len(self._vocab) or self._vocab[i] != token:
+                    self._vocab.insert(i, token)
+
+    def remove(self, event_id: int) -> None:
+        with self._lock:
+            self._drop(event_id)
+
+    def index_many(self, event_ids: list[int]) -> None:
+        for event_id, *doc in db.session.execute(self._documents().where(Event.id.in_(event_ids))):
+            self.index(event_id, tuple(field or "" for field in doc))
+
+    def scores(self, terms: list[str]) -> dict[int, float]:
+        """Ranked hits: every term must prefix-match some token of the event."""
+        result = None
+        with self._lock:
+            for term in terms:
+                term_scores = defaultdict(float)
+                i = bisect.bisect_left(self._vocab, term)
+                while i < len(self._vocab) and self._vocab[i].startswith(term):
+                    for event_id, weight in self._postings[self._vocab[i]].items():
+                        term_scores[event_id] += weight
+                    i += 1
+                if result is None:
+                    result = dict(term_scores)
+                else:
+                    result = {k: v + term_scores[k] for k, v in result.items() if k in term_scores}
+                if not result:
+                    return {}
+        return result or {}
+
+    def apply(self, query, terms: list[str]):
+        config = current_app.config
+        self.refresh_if_stale(current_app._get_current_object(), config["SEARCH_REFRESH_INTERVAL"])
+        hits = self.scores(terms)
+        if not hits:
+            return query.filter(db.false()), None
+        ranked = heapq.nlargest(config["SEARCH_MAX_HITS"], hits, key=hits.get)
+        # Ids and positions are ints, so inlining them is safe and binds no
+        # parameters; SQLite and PostgreSQL both name the columns columnN
+        rows = ", ".join(f"({int(event_id)}, {pos})" for pos, event_id in enumerate(ranked))
+        ranks = (
+            db.text(f"SELECT column1 AS event_id, column2 AS score FROM (VALUES {rows}) AS ranked")
+            .columns(event_id=db.Integer, score=db.Integer)
+            .subquery("search_hits")
+        )
+        return query.join(ranks, ranks.c.event_id == Event.id), ranks.c.score
+
+
+class SearchIndex:
+    """Full-text index over event title, team names and venue name."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("SEARCH_MAX_HITS", 5000)         # MemoryBackend: best-ranked hits passed to SQL
+        app.config.setdefault("SEARCH_REFRESH_INTERVAL", 60.0)  # MemoryBackend: seconds before a rebuild
+        app.extensions["search_index"] = {
+            "choice": app.config.get("SEARCH_BACKEND", "auto"),
+            "backend": None,
+        }
+        app.cli.add_command(rebuild_search_command)
+
+    @property
+    def backend(self):
+        return current_app.extensions["search_index"]["backend"]
+
+    def _uses_fts(self) -> bool:
+        choice = current_app.extensions["search_index"]["choice"]
+        return choice == "fts5" or (
+            choice == "auto" and db.engine.dialect.name == "sqlite" and _has_fts5()
+        )
+
+    def create(self) -> bool:
+        """Create and fill the FTS5 table where it is used; run by schema.upgrade_schema."""
+        return self._uses_fts() and Fts5Backend().create()
+
+    def _backend(self):
+        """The backend, picked on first use; never creates tables."""
+        state = current_app.extensions["search_index"]
+        if state["backend"] is None:
+            backend = Fts5Backend() if self._uses_fts() else MemoryBackend()
+            try:
+                backend.ensure()
+            except LookupError as exc:
+                current_app.logger.warning("Falling back to in-memory search: %s", exc)
+                backend = MemoryBackend()
+                backend.ensure()
+            state["backend"] = backend
+        return state["backend"]
+
+    def index_event(self, event: Event, venue_name: str | None = None) -> None:
+        """(Re)index an event; call before the surrounding commit."""
+        self._backend().index(event.id, _document(event, venue_name))
+
+    def index_events(self, event_ids: list[int]) -> None:
+        """Index many events by id in one pass (bulk loads); call before the commit."""
+        if event_ids:
+            self._backend().index_many(event_ids)
+
+    def remove_event(self, event_id: int) -> None:
+        self._backend().remove(event_id)
+
+    def rebuild(self) -> int:
+        return self._backend().rebuild()
+
+    def apply(self, query, text: str):
+        """
+        Restrict an Event query to matches for `text`. Returns the query and
+        a rank expression to order by (ascending = best first), or None.
+        Every match is kept, so the query's other filters see all of them;
+        the caller's LIMIT (keyset paging) bounds the rows returned.
+        """
+        terms = tokenize(text)
+        if not terms:
+            return query.filter(db.false()), None
+        return self._backend().apply(query, terms)
+
+    def search(self, text: str, limit: int = 20) -> list[int]:
+        """Ranked event ids matching `text`."""
+        query, rank = self.apply(db.select(Event.id), text)
+        if rank is not None:
+            query = query.order_by(rank)
+        return list(db.session.scalars(query.limit(limit)))
+
+
+def _has_fts5() -> bool:
+    try:
+        return bool(db.session.scalar(db.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")))
+    except Exception:
+        return False
+
+
+search_index = SearchIndex()
+
+
+@click.command("rebuild-search")
+def rebuild_search_command():
+    """Rebuild the event search index from the events table."""
+    count = search_index.rebuild()
+    db.session.commit()
+    click.echo(f"Indexed {count} events ({search_index.backend.name}).")
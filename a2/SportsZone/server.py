@@ -0,0 +1,69 @@
+import click
+from flask import current_app
+
+from .hashing import password_hasher
+from .jobs import job_worker
+from .live import availability_hub
+from .startup import prewarm
+
+
+def init_app(app) -> None:
+    app.config.setdefault("SERVER_HOST", "127.0.0.1")
+    app.config.setdefault("SERVER_PORT", 8000)
+    app.config.setdefault("SERVER_THREADS", 16)              # request threads (waitress / WSGI pool under ASGI)
+    app.config.setdefault("SERVER_CONNECTION_LIMIT", 1000)   # open connections, waitress
+    app.cli.add_command(serve_command)
+
+
+def waitress_server(app, host: str, port: int, threads: int):
+    """
+    Threaded WSGI server, not yet running. Live streams and long-polls each
+    hold one of the `threads`, so at most a quarter of them (and no more
+    than LIVE_MAX_STREAMS) may; past that, clients fall back to polling.
+    Logins waiting on password hashing may hold at most half.
+    """
+    try:
+        from waitress import create_server
+    except ImportError:
+        raise click.ClickException("waitress is not installed (pip install waitress)")
+    availability_hub.limit_streams(min(app.config["LIVE_MAX_STREAMS"], threads // 4))
+    password_hasher.limit_queue(app, min(app.config["HASH_QUEUE_LIMIT"], threads // 2))
+    if app.config["PREWARM_ON_START"]:
+        prewarm(app)
+    job_worker.start_with_server(app)
+    app.extensions["expiry_scheduler"].start_with_server(app)
+    return create_server(app, host=host, port=port, threads=threads,
+                         connection_limit=app.config["SERVER_CONNECTION_LIMIT"])
+
+
+def serve_waitress(app, host: str, port: int, threads: int) -> None:
+    waitress_server(app, host, port, threads).run()
+
+
+def serve_uvicorn(app, host: str, port: int, threads: int) -> None:
+    """ASGI server: async JSON and live endpoints on the event loop, the rest on a thread pool (prewarms in lifespan)."""
+    try:
+        import uvicorn
+        from .asgi import create_asgi_app
+    except ImportError as exc:
+        raise click.ClickException(f"{exc.name} is not installed (pip install uvicorn a2wsgi aiosqlite)")
+    app.config["ASGI_WSGI_THREADS"] = threads
+    password_hasher.limit_queue(app, min(app.config["HASH_QUEUE_LIMIT"], threads // 2))
+    uvicorn.run(create_asgi_app(app), host=host, port=port, log_level="info")
+
+
+SERVERS = {"waitress": serve_waitress, "uvicorn": serve_uvicorn}
+
+
+@click.command("serve")
+@click.option("--server", type=click.Choice(sorted(SERVERS)), default="waitress", show_default=True)
+@click.option("--host", default=None, help="Defaults to SERVER_HOST.")
+@click.option("--port", type=int, default=None, help="Defaults to SERVER_PORT.")
+@click.option("--threads", type=int, default=None, help="Defaults to SERVER_THREADS.")
+def serve_command(server, host, port, threads):
+    """Run the app under a production server (use `flask run` / main.py for development)."""
+    app = current_app._get_current_object()
+    config = app.config
+    host, port, threads = host or config["SERVER_HOST"], port or config["SERVER_PORT"], threads or config["SERVER_THREADS"]
+    click.echo(f"Serving SportsZone with {server} on http://{host}:{port} ({threads} threads)")
+    SERVERS[server](app, host, port, threads)
@@ -0,0 +1,119 @@
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+import click
+from flask import current_app
+from sqlalchemy.orm import configure_mappers
+
+from . import db
+
+# Modules the first page views need but create_app no longer imports
+PREWARM_IMPORTS = ["SportsZone.forms"]
+
+
+class StartupProfile:
+    """
+    Wall time and newly imported modules for each phase of create_app (and
+    of prewarm), kept in app.extensions["startup"] and logged once at INFO.
+    `flask startup-report` prints it.
+    """
+
+    def __init__(self):
+        self.phases: list[dict] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        modules = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                "ms": round((time.perf_counter() - started) * 1000, 2),
+                "modules": len(sys.modules) - modules,
+            })
+
+    def add(self, name: str, ms: float, modules: int = 0) -> None:
+        """Record a phase that was timed by hand (e.g. the package imports)."""
+        self.phases.append({"phase": name, "ms": round(ms, 2), "modules": modules})
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(p["ms"] for p in self.phases), 2)
+
+    def report(self) -> dict:
+        return {"total_ms": self.total_ms, "phases": list(self.phases)}
+
+    def log(self, app, title: str = "Startup") -> None:
+        slowest = sorted(self.phases, key=lambda p: p["ms"], reverse=True)[:5]
+        app.logger.info("%s in %.0f ms; slowest: %s", title, self.total_ms,
+                        ", ".join(f"{p['phase']} {p['ms']:.0f} ms" for p in slowest))
+
+
+def prewarm(app) -> dict:
+    """
+    Get a worker ready before it accepts traffic: import the modules pages
+    load lazily, configure the ORM mappers, open PREWARM_CONNECTIONS pooled
+    connections, fingerprint the text assets and load every template.
+    `flask serve` and the ASGI lifespan call this when PREWARM_ON_START is
+    set; under another server, call it from the worker start hook (e.g.
+    gunicorn's post_worker_init). Returns the phases.
+    """
+    profile = StartupProfile()
+    with app.app_context():
+        with profile.phase("prewarm: imports"):
+            for name in PREWARM_IMPORTS:
+                importlib.import_module(name)
+        with profile.phase("prewarm: mappers"):
+            configure_mappers()
+        with profile.phase("prewarm: connection pool"):
+            connections = []
+            try:
+                for _ in range(max(app.config["PREWARM_CONNECTIONS"], 1)):
+                    conn = db.engine.connect()
+                    connections.append(conn)
+                    conn.exec_driver_sql("SELECT 1")
+            except Exception as exc:
+                app.logger.warning("Connection pool not prewarmed: %s", exc)
+            finally:
+                for conn in connections:
+                    conn.close()
+        if "assets" in app.extensions:
+            with profile.phase("prewarm: assets"):
+                from .assets import asset_manifest
+                asset_manifest.build(text_only=True)
+        if app.config["TEMPLATE_PRELOAD"]:
+            with profile.phase("prewarm: templates"):
+                from .templating import template_cache
+                try:
+                    template_cache.compile(app)
+                except Exception as exc:
+                    app.logger.warning("Template preload failed: %s", exc)
+
+    app.extensions["startup"].phases.extend(profile.phases)
+    profile.log(app, "Prewarm")
+    return profile.report()
+
+
+def init_app(app, profile: StartupProfile) -> None:
+    app.config.setdefault("PREWARM_ON_START", True)  # `flask serve` / ASGI lifespan run prewarm
+    app.config.setdefault("PREWARM_CONNECTIONS", 4)  # pooled connections opened by prewarm
+    app.extensions["startup"] = profile
+    app.cli.add_command(startup_report_command)
+
+
+@click.command("startup-report")
+@click.option("--prewarm", "run_prewarm", is_flag=True, help="Also run and time the prewarm hook.")
+def startup_report_command(run_prewarm):
+    """Per-phase timings of this process's create_app (and prewarm)."""
+    app = current_app._get_current_object()
+    if run_prewarm:
+        prewarm(app)
+    profile = app.extensions["startup"]
+    width = max(len(p["phase"]) for p in profile.phases)
+    for p in profile.phases:
+        click.echo(f"{p['phase']:<{width}}  {p['ms']:>8.2f} ms  {p['modules']:>4} modules")
+    click.echo(f"{'total':<{width}}  {profile.total_ms:>8.2f} ms")
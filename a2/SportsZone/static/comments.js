@@ -0,0 +1,83 @@
+// Comment thread on event pages: fetches older pages from the comments API
+// and posts new comments in place. Without JavaScript the "Older comments"
+// link and the form still work as plain page loads.
+(function () {
+  "use strict";
+
+  var list = document.getElementById("comment-list");
+  if (!list) return;
+  var older = document.getElementById("older-comments");
+  var form = document.getElementById("comment-form");
+
+  function item(c) {
+    var li = document.createElement("li");
+    li.className = "list-group-item d-flex flex-column";
+    var meta = document.createElement("div");
+    meta.className = "small text-muted";
+    var author = document.createElement("strong");
+    author.textContent = c.author;
+    meta.appendChild(author);
+    meta.appendChild(document.createTextNode(" · " + c.posted));
+    var text = document.createElement("div");
+    text.textContent = c.text;
+    li.appendChild(meta);
+    li.appendChild(text);
+    return li;
+  }
+
+  function showList() {
+    list.hidden = false;
+    var empty = document.querySelector(".comments-empty");
+    if (empty) empty.hidden = true;
+  }
+
+  if (older) {
+    older.addEventListener("click", function (e) {
+      e.preventDefault();
+      older.classList.add("disabled");
+      fetch(older.dataset.url + "?cursor=" + encodeURIComponent(older.dataset.cursor),
+            { headers: { Accept: "application/json" } })
+        .then(function (r) { return r.ok ? r.json() : Promise.reject(r.status); })
+        .then(function (page) {
+          page.comments.forEach(function (c) { list.appendChild(item(c)); });
+          if (page.next_cursor) {
+            older.dataset.cursor = page.next_cursor;
+            older.href = older.href.replace(/comments=[^&]*/, "comments=" + page.next_cursor);
+            older.classList.remove("disabled");
+          } else {
+            older.remove();
+          }
+        })
+        .catch(function () { window.location = older.href; });
+    });
+  }
+
+  if (form && window.fetch) {
+    form.addEventListener("submit", function (e) {
+      e.preventDefault();
+      var button = form.querySelector("[type=submit]");
+      button.disabled = true;
+      fetch(form.action, {
+        method: "POST",
+        body: new FormData(form),
+        headers: { Accept: "application/json" },
+        credentials: "same-origin",
+      })
+        .then(function (r) {
+          // Not logged in (redirect to login) or a server error: fall back to a normal post
+          if (r.status !== 201) return Promise.reject(r.status);
+          return r.json();
+        })
+        .then(function (c) {
+          showList();
+          list.insertBefore(item(c), list.firstChild);
+          var count = Number(list.dataset.count || 0) + 1;
+          list.dataset.count = count;
+          document.querySelector(".comment-count").textContent = " (" + count + ")";
+          form.querySelector("textarea").value = "";
+          button.disabled = false;
+        })
+        .catch(function () { form.submit(); });
+    });
+  }
+})();
@@ -0,0 +1,50 @@
+// Live ticket availability for the booking card on event pages.
+// Listens to the event's server-sent stream; if that is refused or
+// unsupported, long-polls the availability endpoint instead.
+(function () {
+  "use strict";
+
+  var card = document.getElementById("booking-card");
+  if (!card) return;
+
+  var q = function (sel) { return card.querySelector(sel); };
+  var controls = card.querySelectorAll("form select, form input:not([type=hidden]), form button, form [type=submit]");
+
+  function render(data) {
+    var open = data.status === "Open" && data.remaining > 0;
+    q(".live-remaining").textContent = data.remaining;
+    q(".live-few").hidden = data.remaining > 30;
+    q(".live-status").textContent = data.status;
+    q(".live-open").hidden = !open;
+    q(".live-closed").hidden = open;
+    controls.forEach(function (el) { el.disabled = !open; });
+  }
+
+  function longPoll(etag) {
+    var url = card.dataset.availabilityUrl + (etag ? "?etag=" + encodeURIComponent(etag) : "");
+    fetch(url, { headers: { Accept: "application/json" } })
+      .then(function (r) { return r.ok ? r.json() : Promise.reject(r.status); })
+      .then(function (data) {
+        render(data);
+        // An unchanged answer came back early (server busy): back off a little
+        setTimeout(function () { longPoll(data.etag); }, data.etag === etag ? 5000 : 0);
+      })
+      .catch(function () { setTimeout(function () { longPoll(etag); }, 10000); });
+  }
+
+  if (!window.EventSource) {
+    longPoll(null);
+    return;
+  }
+  var etag = null;
+  var source = new EventSource(card.dataset.streamUrl);
+  source.addEventListener("availability", function (e) {
+    var data = JSON.parse(e.data);
+    etag = data.etag;
+    render(data);
+  });
+  source.onerror = function () {
+    // CLOSED means the server refused the stream (e.g. 503); a plain drop reconnects by itself
+    if (source.readyState === EventSource.CLOSED) longPoll(etag);
+  };
+})();
@@ -0,0 +1,134 @@
+import importlib
+from datetime import datetime
+
+import click
+
+from . import db
+from .models import Event, EventStats, Booking, Comment
+
+# Dialects with INSERT ... ON CONFLICT; imported on first use, so SQLite
+# deployments never load the PostgreSQL dialect (and its async drivers)
+_UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+
+def _bump(event_id: int, **increments) -> None:
+    """
+    Add `increments` to an event's stats row inside the caller's
+    transaction, creating the row on first use.
+    """
+    now = datetime.utcnow()
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in _UPSERT_DIALECTS:  # no upsert: try the update, insert if nothing matched
+        result = db.session.execute(
+            db.update(EventStats)
+            .where(EventStats.event_id == event_id)
+            .values(last_activity=now, **{k: getattr(EventStats, k) + v for k, v in increments.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.execute(db.insert(EventStats).values(event_id=event_id, last_activity=now, **increments))
+        return
+
+    insert = importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert
+    stmt = insert(EventStats).values(event_id=event_id, last_activity=now, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventStats.event_id],
+        set_={
+            "last_activity": stmt.excluded.last_activity,
+            **{k: getattr(EventStats, k) + getattr(stmt.excluded, k) for k in increments},
+        },
+    )
+    db.session.execute(stmt)
+
+
+def record_booking(event_id: int, qty: int, unit_price: float) -> None:
+    """Count a booking of `qty` seats at the price it was made at."""
+    _bump(event_id, booking_count=1, tickets_booked=qty, revenue=unit_price * qty)
+
+
+def record_cancellations(event_id: int, bookings: int, tickets: int, refunded: float) -> None:
+    """Take cancelled bookings (and the revenue refunded for them) back off the totals."""
+    _bump(event_id, booking_count=-bookings, tickets_booked=-tickets, revenue=-refunded)
+
+
+def record_comment(event_id: int) -> None:
+    _bump(event_id, comment_count=1)
+
+
+def reconcile() -> int:
+    """
+    Rebuild every stats row from confirmed bookings and comments in one
+    set-based pass, with revenue at each booking's unit_price.
+    """
+    bookings = (
+        db.select(
+            Booking.event_id,
+            db.func.count().label("n"),
+            db.func.sum(Booking.booking_quantity).label("tickets"),
+            db.func.sum(Booking.booking_quantity * db.func.coalesce(Booking.unit_price, 0.0)).label("revenue"),
+            db.func.max(Booking.booking_date).label("last"),
+        )
+        .where(Booking.status == "Confirmed")
+        .group_by(Booking.event_id)
+        .subquery()
+    )
+    comments = (
+        db.select(
+            Comment.event_id,
+            db.func.count().label("n"),
+            db.func.max(Comment.created_at).label("last"),
+        )
+        .group_by(Comment.event_id)
+        .subquery()
+    )
+    tickets = db.func.coalesce(bookings.c.tickets, 0)
+    rows = (
+        db.select(
+            Event.id,
+            db.func.coalesce(bookings.c.n, 0),
+            tickets,
+            db.func.coalesce(bookings.c.revenue, 0.0),
+            db.func.coalesce(comments.c.n, 0),
+            db.case(
+                (bookings.c.last.is_(None), comments.c.last),
+                (comments.c.last.is_(None), bookings.c.last),
+                (bookings.c.last > comments.c.last, bookings.c.last),
+                else_=comments.c.last,
+            ),
+        )
+        .outerjoin(bookings, bookings.c.event_id == Event.id)
+        .outerjoin(comments, comments.c.event_id == Event.id)
+    )
+    columns = ["event_id", "booking_count", "tickets_booked", "revenue", "comment_count", "last_activity"]
+    try:
+        db.session.execute(db.delete(EventStats))
+        db.session.execute(db.insert(EventStats).from_select(columns, rows))
+        count = db.session.scalar(db.select(db.func.count()).select_from(EventStats))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return count
+
+
+def price_bookings() -> int:
+    """Set unit_price on bookings made before it was stored, at their event's current price."""
+    price = db.select(Event.ticket_price).where(Event.id == Booking.event_id).scalar_subquery()
+    result = db.session.execute(
+        db.update(Booking)
+        .where(Booking.unit_price.is_(None))
+        .values(unit_price=db.func.coalesce(price, 0.0))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+@click.command("reconcile-stats")
+def reconcile_stats_command():
+    """Rebuild per-event booking, revenue and comment totals from scratch."""
+    click.echo(f"Rebuilt stats for {reconcile()} events.")
+
+
+def init_app(app) -> None:
+    app.cli.add_command(reconcile_stats_command)
@@ -0,0 +1,114 @@
+import os
+import time
+from functools import lru_cache
+
+import click
+from flask import current_app, has_request_context, request, url_for
+from jinja2 import FileSystemBytecodeCache
+
+from .cache import LRUCache
+
+DATE_FORMATS = {
+    "long": "%a %d %b %Y · %I:%M %p",   # event cards and pages
+    "short": "%d %b %Y, %I:%M %p",      # organiser / booking lists
+    "numeric": "%d-%m-%Y %H:%M",        # comments
+}
+STATUS_BADGES = {"Open": "primary", "Sold Out": "danger", "Cancelled": "secondary", "Inactive": "warning"}
+SPORT_BADGES = {"football": "primary", "basketball": "warning", "cricket": "success", "tennis": "secondary"}
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+
+@lru_cache(maxsize=4096)
+def when(value, style: str = "long") -> str:
+    """Template filter: a datetime in one of DATE_FORMATS, '' for None."""
+    return value.strftime(DATE_FORMATS[style]) if value else ""
+
+
+def status_badge(status: str | None) -> str:
+    """Template filter: Bootstrap colour for an event status."""
+    return STATUS_BADGES.get(status, "secondary")
+
+
+def sport_badge(sport: str | None) -> str:
+    """Template filter: Bootstrap colour for a sport."""
+    return SPORT_BADGES.get((sport or "").lower(), "secondary")
+
+
+def cached_url(endpoint: str, **values) -> str:
+    """
+    url_for for links that render on every card. Relative URLs only depend
+    on the endpoint, its arguments and the script root, so each one is built
+    once per worker instead of once per card per request.
+    """
+    state = current_app.extensions.get("templating")
+    if state is None or not has_request_context():
+        return url_for(endpoint, **values)
+    key = (request.script_root, endpoint, *sorted(values.items()))
+    url = state["urls"].get(key)
+    if url is None:
+        url = url_for(endpoint, **values)
+        state["urls"].set(key, url)
+    return url
+
+
+class TemplateCache:
+    """
+    Keeps compiled templates in a Jinja bytecode cache under
+    instance/jinja, so a new worker loads them instead of recompiling every
+    template on its first request, and loads them all before taking traffic
+    (TEMPLATE_PRELOAD, run by startup.prewarm). `flask compile-templates`
+    fills the cache ahead of a deploy. Also registers the filters and
+    cached macros the card templates share.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.config.setdefault("TEMPLATE_BYTECODE_CACHE", True)
+        app.config.setdefault("TEMPLATE_CACHE_DIR", os.path.join(app.instance_path, "jinja"))
+        app.config.setdefault("TEMPLATE_PRELOAD", True)   # in startup.prewarm
+        app.config.setdefault("TEMPLATE_URL_CACHE_SIZE", 4096)
+        app.extensions["templating"] = {
+            "urls": LRUCache(maxsize=app.config["TEMPLATE_URL_CACHE_SIZE"], ttl=3600),
+        }
+
+        env = app.jinja_env
+        if app.config["TEMPLATE_BYTECODE_CACHE"]:
+            os.makedirs(app.config["TEMPLATE_CACHE_DIR"], exist_ok=True)
+            env.bytecode_cache = FileSystemBytecodeCache(app.config["TEMPLATE_CACHE_DIR"])
+        env.filters.update(when=when, status_badge=status_badge, sport_badge=sport_badge)
+        env.globals["cached_url"] = cached_url
+        app.cli.add_command(compile_templates_command)
+
+    @staticmethod
+    def names(app) -> list[str]:
+        return [name for name in app.jinja_env.list_templates() if name.endswith(TEMPLATE_SUFFIXES)]
+
+    def compile(self, app) -> dict:
+        """Load every template into the environment (and the bytecode cache); returns ms per template."""
+        timings = {}
+        for name in self.names(app):
+            started = time.perf_counter()
+            app.jinja_env.get_template(name)
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        return timings
+
+
+template_cache = TemplateCache()
+
+
+@click.command("compile-templates")
+@click.option("--clear", is_flag=True, help="Drop existing bytecode first.")
+def compile_templates_command(clear):
+    """Precompile every template into the bytecode cache."""
+    env = current_app.jinja_env
+    if env.bytecode_cache is None:
+        raise click.ClickException("TEMPLATE_BYTECODE_CACHE is disabled")
+    if clear:
+        env.bytecode_cache.clear()
+        env.cache.clear()
+    timings = template_cache.compile(current_app)
+    click.echo(f"Compiled {len(timings)} templates in {sum(timings.values()):.0f} ms "
+               f"into {current_app.config['TEMPLATE_CACHE_DIR']}.")
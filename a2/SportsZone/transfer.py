@@ -0,0 +1,253 @@
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+
+import click
+
+from . import db
+from .cache import page_cache
+from .models import Event, Venue, User
+from .search import search_index
+
+# One row per event; the same fields are read on import and written on export
+FIELDS = [
+    "event_title", "sports_type", "home_team_name", "away_team_name",
+    "venue_name", "venue_address", "start_datetime", "end_datetime",
+    "status", "total_tickets", "tickets_sold", "ticket_price",
+    "event_image", "description",
+]
+STATUSES = {"Open", "Sold Out", "Cancelled", "Inactive"}
+
+
+def _format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+# Reading
+def read_records(fh, fmt: str):
+    """
+    Yield (line number, record) from a CSV or JSONL stream, one at a time.
+    A JSONL line that doesn't parse is yielded as its ValueError, so the
+    importer can report and skip it like any other bad record.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(fh)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_num, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                record = ValueError(f"invalid JSON: {exc}")
+            yield line_num, record
+
+
+def _text(record, field, limit=None):
+    value = record.get(field)
+    value = str(value).strip() if value not in (None, "") else None
+    return value[:limit] if value and limit else value
+
+
+def _datetime(record, field):
+    value = _text(record, field)
+    return datetime.fromisoformat(value) if value else None
+
+
+def to_event_row(record: dict) -> tuple[dict, str | None, str | None]:
+    """
+    Validate one input record. Returns (events row without user_id/venue_id,
+    venue name, venue address); raises ValueError on bad input, including
+    the parse errors read_records passes through.
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError(f"expected an object, got {type(record).__name__}")
+    title = _text(record, "event_title", 256)
+    start = _datetime(record, "start_datetime")
+    if not title or not start:
+        raise ValueError("event_title and start_datetime are required")
+    end = _datetime(record, "end_datetime")
+    if end and end < start:
+        raise ValueError("end_datetime is before start_datetime")
+
+    total = int(record.get("total_tickets") or 120)
+    sold = int(record.get("tickets_sold") or 0)
+    if total < 0 or not 0 <= sold <= total:
+        raise ValueError("tickets_sold must be between 0 and total_tickets")
+    status = _text(record, "status") or "Open"
+    if status not in STATUSES:
+        raise ValueError(f"unknown status {status!r}")
+    if status == "Open" and sold >= total:
+        status = "Sold Out"
+
+    row = {
+        "event_title": title,
+        "sports_type": _text(record, "sports_type", 64),
+        "home_team_name": _text(record, "home_team_name", 64),
+        "away_team_name": _text(record, "away_team_name", 64),
+        "start_datetime": start,
+        "end_datetime": end,
+        "status": status,
+        "total_tickets": total,
+        "tickets_sold": sold,
+        "ticket_price": float(record.get("ticket_price") or 0.0),
+        "event_image": _text(record, "event_image", 256),
+        "description": _text(record, "description"),
+    }
+    return row, _text(record, "venue_name", 128), _text(record, "venue_address", 256)
+
+
+# Import
+def venue_ids() -> dict[str, int]:
+    """Every venue name -> id; the first id wins for duplicate names."""
+    ids = {}
+    for venue_id, name in db.session.execute(db.select(Venue.id, Venue.venue_name).order_by(Venue.id)):
+        ids.setdefault(name, venue_id)
+    return ids
+
+
+def import_events(records, owner_id: int, batch_size: int = 1000, skip_errors: bool = False,
+                  on_error=None) -> dict:
+    """
+    Insert events from (line, record) pairs in batches of `batch_size`, one
+    transaction per batch that also indexes the batch for search. Venues are
+    matched by name through an in-memory map; unknown names are created once
+    per batch in a single INSERT.
+    """
+    venues = venue_ids()
+    totals = {"events": 0, "venues": 0, "errors": 0}
+    records = iter(records)
+
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            break
+        rows, new_venues = [], {}
+        for line_num, record in chunk:
+            try:
+                row, venue_name, venue_address = to_event_row(record)
+            except (ValueError, TypeError) as exc:
+                totals["errors"] += 1
+                if on_error:
+                    on_error(line_num, exc)
+                if not skip_errors:
+                    raise ValueError(f"line {line_num}: {exc}") from exc
+                continue
+            if venue_name and venue_name not in venues:
+                new_venues.setdefault(venue_name, venue_address)
+            rows.append((row, venue_name))
+
+        try:
+            if new_venues:
+                created = db.session.execute(
+                    db.insert(Venue).returning(Venue.id, Venue.venue_name, sort_by_parameter_order=True),
+                    [{"venue_name": n, "venue_address": a} for n, a in new_venues.items()],
+                )
+                for venue_id, name in created:
+                    venues[name] = venue_id
+                totals["venues"] += len(new_venues)
+            if rows:
+                event_ids = db.session.scalars(db.insert(Event).returning(Event.id), [
+                    {**row, "user_id": owner_id, "venue_id": venues.get(venue_name)}
+                    for row, venue_name in rows
+                ]).all()
+                search_index.index_events(event_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        totals["events"] += len(rows)
+    return totals
+
+
+# Export
+def export_rows(batch_size: int = 1000):
+    """Yield one dict per event, streamed from the database `batch_size` rows at a time."""
+    columns = [getattr(Event, f) for f in FIELDS if hasattr(Event, f)]
+    query = (
+        db.select(*columns, Venue.venue_name, Venue.venue_address)
+        .select_from(Event)
+        .join(Venue, Event.venue_id == Venue.id, isouter=True)
+        .order_by(Event.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in db.session.execute(query):
+        record = row._asdict()
+        for field in ("start_datetime", "end_datetime"):
+            if record[field] is not None:
+                record[field] = record[field].isoformat()
+        yield {f: record[f] for f in FIELDS}
+
+
+def write_records(records, fh, fmt: str) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        for count, record in enumerate(records, 1):
+            writer.writerow(record)
+    else:
+        for count, record in enumerate(records, 1):
+            fh.write(json.dumps(record) + "\n")
+    return count
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return open((sys.stdin if "r" in mode else sys.stdout).fileno(), mode,
+                    encoding="utf-8", newline="", closefd=False)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+@click.command("import-events")
+@click.argument("path", type=click.Path(allow_dash=True))
+@click.option("--owner", required=True, help="Email of the user who will own the events.")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: from the file extension.")
+@click.option("--batch", default=1000, show_default=True, help="Rows per INSERT / transaction.")
+@click.option("--skip-errors", is_flag=True, help="Report bad rows and carry on.")
+def import_events_command(path, owner, fmt, batch, skip_errors):
+    """Bulk-load events (and their venues) from a CSV or JSONL file; '-' reads stdin."""
+    owner_id = db.session.scalar(db.select(User.id).where(User.email_id == owner))
+    if owner_id is None:
+        raise click.ClickException(f"no user with email {owner}")
+
+    def report(line_num, exc):
+        click.echo(f"  line {line_num}: {exc}", err=True)
+
+    with _open(path, "r") as fh:
+        try:
+            totals = import_events(read_records(fh, _format(path, fmt)), owner_id, batch,
+                                   skip_errors, on_error=report if skip_errors else None)
+        except (ValueError, csv.Error) as exc:
+            raise click.ClickException(f"{exc} (earlier batches were committed)")
+
+    page_cache.invalidate("events")
+    click.echo(f"Imported {totals['events']} events, created {totals['venues']} venues, "
+               f"skipped {totals['errors']} rows.")
+
+
+@click.command("export-events")
+@click.argument("path", default="-", type=click.Path(allow_dash=True))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: from the file extension.")
+@click.option("--batch", default=1000, show_default=True, help="Rows fetched per round trip.")
+def export_events_command(path, fmt, batch):
+    """Stream every event as CSV or JSONL, in the format import-events reads."""
+    fmt = _format(path, fmt) if path != "-" else (fmt or "jsonl")
+    with _open(path, "w") as fh:
+        count = write_records(export_rows(batch), fh, fmt)
+    if path != "-":
+        click.echo(f"Exported {count} events to {os.path.abspath(path)}.")
+
+
+def init_app(app) -> None:
+    app.cli.add_command(import_events_command)
+    app.cli.add_command(export_events_command)
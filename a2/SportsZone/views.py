@@ -1,13 +1,21 @@
-import os
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, current_app, jsonify
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 
 from . import db
-from .models import Event, Venue, Comment, Booking
-from .forms import EventForm, CommentForm, BookingForm
-
-from datetime import datetime, timezone
+from .models import Event, Venue, Comment, Booking, load_options
+from .booking import reserve_seats
+from .stats import record_comment
+from .jobs import enqueue
+from .cancellation import start_cancellation
+from .history import refresh_event
+from .search import search_index
+from .queries import filter_events, listing_args, event_comments, comment_record, booking_history
+from .pagination import keyset_page
+from .cache import cached_page, page_cache
+from .images import image_pipeline
+from .live import availability_hub
+from .facets import CATEGORIES, STATUSES, facet_counts
 
 # Blueprint
 main_bp = Blueprint("main", __name__)
@@ -15,6 +23,7 @@ main_bp = Blueprint("main", __name__)
 # Home – list + filter + search events
 
 @main_bp.route("/", endpoint="index")
+@cached_page("events", query_args=("category", "status", "q", "cursor"))
 def index():
     
     #Home page with optional filters:
@@ -22,59 +31,32 @@ def index():
     #status:Open / Sold Out / Cancelled / Inactive, 'all' to disable
     #q:free text search across title, teams, and venue name
 
-    # Auto-mark past events as Inactive
-    now = datetime.now()
-    expired_events = Event.query.filter(
-        Event.end_datetime.isnot(None),      # Ignore NULL endtime
-        Event.end_datetime < now,
-        Event.status.notin_(["Inactive", "Cancelled"])  # Only update Open Events
-    ).all()
-
-    for e in expired_events:
-        e.status = "Inactive"
-
-    if expired_events:
-        db.session.commit()
-    
-    cat = (request.args.get("category") or "all").lower()
-    st  = (request.args.get("status") or "all").lower()
-    q   = (request.args.get("q") or "").strip().lower()
-
-    query = Event.query
-
-    # Category filter (sports type)
-    if cat != "all":
-        query = query.filter(Event.sports_type.ilike(f"%{cat}%"))
+    # Expired events are flipped to Inactive by the background scheduler;
+    # Event.effective_status covers any that ended since the last sweep.
+    cat, st, q = listing_args(request.args)
+    query, keys = filter_events(Event.query.options(*load_options("event_card")), cat, st, q)
 
-    # Status filter (case-insensitive; accept 'soldout' shortcut)
-    if st != "all":
-        if st == "soldout":
-            query = query.filter(Event.status.ilike("%sold out%"))
-        else:
-            query = query.filter(Event.status.ilike(f"%{st}%"))
-
-    # Text search across title, teams, and venue
-    if q:
-        query = (
-            query.join(Venue, isouter=True)
-                 .filter(
-                     db.or_(
-                         Event.event_title.ilike(f"%{q}%"),
-                         Event.home_team_name.ilike(f"%{q}%"),
-                         Event.away_team_name.ilike(f"%{q}%"),
-                         Venue.venue_name.ilike(f"%{q}%"),
-                     )
-                 )
+    try:
+        page = keyset_page(
+            query, keys, request.args.get("cursor"),
+            per_page=current_app.config["EVENTS_PER_PAGE"],
         )
+    except ValueError:
+        abort(400)
 
-    events = query.order_by(Event.start_datetime.asc()).all()
-    return render_template("index.html", title="SportsZone | Home", events=events)
+    return render_template(
+        "index.html", title="SportsZone | Home", events=page.items, next_cursor=page.next_cursor,
+        facets=facet_counts.counts(cat, st, q), categories=CATEGORIES, statuses=STATUSES,
+    )
 
 # View a single event (public)
 @main_bp.route("/event/<int:event_id>", endpoint="view_event")
+@cached_page("event:{event_id}", query_args=("comments",))
 def view_event(event_id: int):
     """Event details page with booking + comments."""
-    e = Event.query.get_or_404(event_id)
+    e = Event.query.options(*load_options("event_detail")).get_or_404(event_id)
+    # Form classes (WTForms) load on first use; startup.prewarm imports them for servers
+    from .forms import BookingForm, CommentForm
 
     # Booking form (prefill sensible defaults)
     booking_form = BookingForm()
@@ -85,12 +67,14 @@ def view_event(event_id: int):
     # Comment form
     comment_form = CommentForm()
 
-    # Comments newest-first
-    comments = (
-        Comment.query.filter_by(event_id=e.id)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
+    # First page of comments, newest first; later pages come from the comments API
+    try:
+        comments = keyset_page(
+            *event_comments(e.id), request.args.get("comments"),
+            per_page=current_app.config["COMMENTS_PER_PAGE"], descending=True,
+        )
+    except ValueError:
+        abort(400)
 
     return render_template(
         "event.html",
@@ -98,7 +82,8 @@ def view_event(event_id: int):
         event=e,
         booking_form=booking_form,
         comment_form=comment_form,
-        comments=comments,
+        comments=comments.items,
+        comments_cursor=comments.next_cursor,
     )
 
 
@@ -115,6 +100,7 @@ def create_event(event_id: int | None = None):
             return redirect(url_for("main.my_events"))
 
     # Prefill form in edit mode; blank in create mode
+    from .forms import EventForm
     form = EventForm(obj=event) if event else EventForm()
 
     # Manual prefill for fields not covered by WTForms obj= (e.g., venue text input)
@@ -168,7 +154,16 @@ def create_event(event_id: int | None = None):
                 db.session.flush()  
             event.venue_id = v.id
 
+        # Keep the search index in step with the event, in the same transaction
+        db.session.flush()
+        search_index.index_event(event, venue_name)
+        if event_id:
+            refresh_event(event)  # titles / images shown in Booking History
+
         db.session.commit()
+        page_cache.invalidate("events", f"event:{event.id}")
+        if event_id:
+            availability_hub.announce(event.id)
         flash(
             "Event updated successfully!" if event_id else "Event created successfully!",
             "success",
@@ -185,12 +180,19 @@ def create_event(event_id: int | None = None):
 @main_bp.route("/my-events", methods=["GET"], endpoint="my_events")
 @login_required
 def my_events():
-    events = (
-        Event.query.filter(Event.user_id == current_user.id)
-        .order_by(Event.start_datetime.desc())
-        .all()
+    query = Event.query.options(*load_options("owner_card")).filter(
+        Event.user_id == current_user.id
+    )
+    try:
+        page = keyset_page(
+            query, [Event.start_datetime, Event.id], request.args.get("cursor"),
+            per_page=current_app.config["EVENTS_PER_PAGE"], descending=True,
+        )
+    except ValueError:
+        abort(400)
+    return render_template(
+        "my_events.html", title="My Events", events=page.items, next_cursor=page.next_cursor
     )
-    return render_template("my_events.html", title="My Events", events=events)
 
 
 # Booking history (login required)
@@ -199,34 +201,19 @@ def my_events():
 @login_required
 def booking():
    
-    rows = (
-        db.session.query(Booking, Event, Venue)
-        .filter(Booking.user_id == current_user.id)
-        .join(Event, Booking.event_id == Event.id, isouter=True)
-        .join(Venue, Event.venue_id == Venue.id, isouter=True)
-        .order_by(Booking.booking_date.desc())
-        .all()
-    )
-
-    orders = []
-    for b, e, v in rows:
-        orders.append(
-            {
-                "order_code": f"BK-{b.id}",
-                "booked_at": b.booking_date.strftime("%d %b %Y, %I:%M %p")
-                if b.booking_date
-                else "",
-                "quantity": b.booking_quantity or 1,
-                "event_id": e.id if e else None,
-                "event_title": (e.event_title or f"{e.home_team_name} vs {e.away_team_name}")
-                if e
-                else "Unknown Event",
-                "image": e.event_image if e else None,
-                "sport": e.sports_type if e else "",
-            }
+    # Display-ready rows from the booking_history read model, newest first
+    query, keys = booking_history(current_user.id)
+    try:
+        page = keyset_page(
+            query, keys, request.args.get("cursor"),
+            per_page=current_app.config["EVENTS_PER_PAGE"], descending=True,
         )
+    except ValueError:
+        abort(400)
 
-    return render_template("booking.html", title="Booking History", orders=orders)
+    return render_template(
+        "booking.html", title="Booking History", orders=page.items, next_cursor=page.next_cursor
+    )
 
 # Create a booking (login required)
 @main_bp.route("/book", methods=["POST"], endpoint="create_booking")
@@ -240,23 +227,17 @@ def create_booking():
         flash("Missing event.", "danger")
         return redirect(url_for("main.index"))
 
-    event = Event.query.get(event_id)
-    if not event:
-        flash("Event not found.", "warning")
-        return redirect(url_for("main.index"))
-
     qty = max(1, min(qty, 10))
 
-    if not event.can_book(qty):
+    # Seat check + increment + insert happen atomically in the engine
+    if reserve_seats(event_id, current_user.id, qty) is None:
+        if db.session.get(Event, event_id) is None:
+            flash("Event not found.", "warning")
+            return redirect(url_for("main.index"))
         flash("Not enough tickets or event closed.", "warning")
-        return redirect(url_for("main.view_event", event_id=event.id))
-
-    booking = Booking(user_id=current_user.id, event_id=event.id, booking_quantity=qty)
-    event.apply_booking(qty)
-
-    db.session.add(booking)
-    db.session.commit()
+        return redirect(url_for("main.view_event", event_id=event_id))
 
+    page_cache.invalidate("events", f"event:{event_id}")
     flash("Your booking was created!", "success")
     return redirect(url_for("main.booking"))
 
@@ -273,37 +254,44 @@ def _save_upload(form) -> str | None:
     if not filename:
         return None
 
-    from flask import current_app
-
-    upload_dir = os.path.join(current_app.root_path, "static", "img")
-    os.makedirs(upload_dir, exist_ok=True)
-
+    # Stored under a content hash; resized variants render in the background
     try:
-        fp.save(os.path.join(upload_dir, filename))
+        return image_pipeline.save_upload(fp, filename)
     except Exception:
     
         return None
 
-    return filename
-
 # Add a comment (login required)
 
 @main_bp.route("/event/<int:event_id>/comment", methods=["POST"])
 @login_required
 def add_comment(event_id: int):
     Event.query.get_or_404(event_id)  # ensure event exists
+    from .forms import CommentForm
     form = CommentForm()
     if form.validate_on_submit():
-        db.session.add(
-            Comment(text=form.text.data, user_id=current_user.id, event_id=event_id)
-        )
+        comment = Comment(text=form.text.data, user_id=current_user.id, event_id=event_id)
+        db.session.add(comment)
+        db.session.flush()
+        record_comment(event_id)
+        enqueue("comment.added", {"comment_id": comment.id})
         db.session.commit()
+        page_cache.invalidate(f"event:{event_id}")
+        if _wants_json():
+            return jsonify(comment_record(comment)), 201
         flash("Comment added!", "success")
+    elif _wants_json():
+        return jsonify(errors=form.errors), 400
     else:
         flash("Error submitting comment.", "danger")
     return redirect(url_for("main.view_event", event_id=event_id))
 
 
+def _wants_json() -> bool:
+    """Script submissions (the event page's comment form) ask for JSON back."""
+    return request.accept_mimetypes.best == "application/json"
+
+
 # Cancel an event (login required)
 
 @main_bp.route("/event/<int:event_id>/cancel", methods=["POST"], endpoint="cancel_event")
@@ -315,7 +303,15 @@ def cancel_event(event_id: int):
         flash("You can only cancel events you created.", "danger")
         return redirect(url_for("main.my_events"))
 
-    event.status = "Cancelled"
+    # Bookings are cancelled, refunded and notified in batches by the job worker
+    run = start_cancellation(event)
+    search_index.index_event(event)
     db.session.commit()
-    flash("Event cancelled.", "info")
+    page_cache.invalidate("events", f"event:{event.id}")
+    availability_hub.announce(event.id)
+    flash(
+        f"Event cancelled. Refunding {run.total} booking{'' if run.total == 1 else 's'} in the background."
+        if run.total else "Event cancelled.",
+        "info",
+    )
     return redirect(url_for("main.create_event", event_id=event.id))
@@ -0,0 +1,727 @@
+"""
+SportsZone benchmarks. Each benchmark runs against a throwaway SQLite file
+and prints a JSON report to stdout, so results can be diffed between releases.
+
+    python benchmark.py booking --bookings 5000 --workers 32
+    python benchmark.py -o routes.json routes --events 5000 --concurrency 16
+    python benchmark.py logins --duration 10 --hash-workers 4
+    python benchmark.py templates --runs 5 --renders 200
+    python benchmark.py connections --held 200 500 --servers waitress uvicorn
+    python benchmark.py startup --runs 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from SportsZone import db, create_app
+from SportsZone.models import User, Event, Booking
+from SportsZone.schema import upgrade_schema
+
+
+def make_app(workdir: str, **config):
+    """App bound to a fresh database file inside `workdir`."""
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(workdir, "bench.sqlite"),
+        "SQLALCHEMY_ENGINE_OPTIONS": {"connect_args": {"timeout": 30}},
+        "EXPIRY_SCHEDULER_ENABLED": False,
+        "JOB_WORKER_ENABLED": False,
+        "WTF_CSRF_ENABLED": False,
+        "TESTING": True,
+    }
+    settings.update(config)
+    app = create_app(settings)
+    app.debug = False
+    with app.app_context():
+        upgrade_schema()
+    return app
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99/max of latency samples, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+# Booking stress test
+def bench_booking(args) -> dict:
+    """Fire concurrent bookings at one event and check nothing is oversold."""
+    from SportsZone.booking import reserve_seats
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir)
+        with app.app_context():
+            users = [
+                User(first_name="Bench", surname=str(i), email_id=f"bench{i}@example.com",
+                     password_hash="x", mobile_number=f"04{i:08d}", street_address="1 Bench St")
+                for i in range(args.workers)
+            ]
+            event = Event(user_id=1, event_title="Stress Test", total_tickets=args.seats,
+                          start_datetime=datetime.now() + timedelta(days=1))
+            db.session.add_all(users)
+            db.session.flush()
+            event.user_id = users[0].id
+            db.session.add(event)
+            db.session.commit()
+            event_id, user_ids = event.id, [u.id for u in users]
+
+        def attempt(i):
+            qty = random.randint(1, 4)
+            started = time.perf_counter()
+            with app.app_context():
+                booking = reserve_seats(event_id, user_ids[i % len(user_ids)], qty)
+            return booking is not None, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(attempt, range(args.bookings)))
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            event = db.session.get(Event, event_id)
+            booked = db.session.scalar(
+                db.select(db.func.coalesce(db.func.sum(Booking.booking_quantity), 0))
+                .where(Booking.event_id == event_id)
+            )
+            report = {
+                "benchmark": "booking",
+                "attempts": args.bookings,
+                "workers": args.workers,
+                "seats": args.seats,
+                "accepted": sum(1 for ok, _ in results if ok),
+                "rejected": sum(1 for ok, _ in results if not ok),
+                "tickets_sold": event.tickets_sold,
+                "tickets_booked": booked,
+                "status": event.status,
+                "oversold": event.tickets_sold > event.total_tickets or booked != event.tickets_sold,
+                "elapsed_s": round(elapsed, 3),
+                "attempts_per_s": round(args.bookings / elapsed, 1),
+                "latency": percentiles([t for _, t in results]),
+            }
+            db.engine.dispose()
+    return report
+
+
+# Synthetic dataset
+SPORTS = ["football", "basketball", "rugby", "cricket", "tennis", "hockey"]
+TEAMS = ["Lions", "Tigers", "Broncos", "Storm", "Sharks", "Eagles", "Roosters", "Titans",
+         "Dragons", "Panthers", "Raiders", "Knights", "Bulldogs", "Cowboys", "Rabbitohs"]
+BENCH_PASSWORD = "benchpass1"
+
+
+def seed(app, users=50, venues=20, events=500, bookings=2000, comments=2000, batch=5000) -> dict:
+    """
+    Fill the app's database with a synthetic dataset through the real models.
+    Returns the ids later benchmarks need.
+    """
+    from SportsZone.models import Venue, Comment
+    from SportsZone.search import search_index
+    from SportsZone.hashing import password_hasher
+    from SportsZone.stats import price_bookings, reconcile
+    from SportsZone.history import rebuild as rebuild_history
+
+    rng = random.Random(207)
+    now = datetime.now()
+
+    def insert(model, rows):
+        for i in range(0, len(rows), batch):
+            db.session.execute(db.insert(model), rows[i:i + batch])
+
+    with app.app_context():
+        # Hashed with the app's own settings so logins never trigger a rehash
+        password_hash = password_hasher.hash(BENCH_PASSWORD)
+        insert(User, [
+            dict(first_name=f"User{i}", surname="Bench", email_id=f"user{i}@bench.sportszone.com",
+                 password_hash=password_hash, mobile_number=f"04{i:08d}",
+                 street_address=f"{i} Bench St")
+            for i in range(1, users + 1)
+        ])
+        insert(Venue, [
+            dict(venue_name=f"{rng.choice(TEAMS)} Stadium {i}", venue_address=f"{i} Arena Rd",
+                 capacity=rng.randint(5000, 50000))
+            for i in range(1, venues + 1)
+        ])
+        sold = [0] * (events + 1)
+        booking_rows = []
+        for _ in range(bookings):
+            event_id, qty = rng.randint(1, events), rng.randint(1, 4)
+            sold[event_id] += qty
+            booking_rows.append(dict(user_id=rng.randint(1, users), event_id=event_id,
+                                     booking_date=now - timedelta(minutes=rng.randint(0, 100000)),
+                                     booking_quantity=qty))
+
+        event_rows = []
+        for i in range(1, events + 1):
+            home, away = rng.sample(TEAMS, 2)
+            start = now + timedelta(days=rng.randint(1, 365), minutes=rng.randint(0, 1440))
+            event_rows.append(dict(
+                user_id=rng.randint(1, users), venue_id=rng.randint(1, venues),
+                sports_type=rng.choice(SPORTS), event_title=f"{home} vs {away}",
+                home_team_name=home, away_team_name=away, event_image="football1.jpg",
+                description="Synthetic benchmark fixture.", start_datetime=start,
+                end_datetime=start + timedelta(hours=3), status="Open", total_tickets=100000,
+                tickets_sold=sold[i], ticket_price=rng.choice([0.0, 25.0, 49.5, 120.0]),
+            ))
+        insert(Event, event_rows)
+        insert(Booking, booking_rows)
+        insert(Comment, [
+            dict(user_id=rng.randint(1, users), event_id=rng.randint(1, events),
+                 text="Synthetic comment " * rng.randint(1, 5),
+                 created_at=now - timedelta(minutes=rng.randint(0, 100000)))
+            for _ in range(comments)
+        ])
+        search_index.rebuild()
+        db.session.commit()
+        price_bookings()
+        reconcile()
+        rebuild_history()
+
+        owners = {}
+        for event_id, user_id in db.session.execute(db.select(Event.id, Event.user_id)):
+            owners.setdefault(user_id, []).append(event_id)
+    return {"users": users, "venues": venues, "events": events, "bookings": bookings,
+            "comments": comments, "events_by_owner": owners}
+
+
+# Route scenarios: endpoint -> (needs login, request factory)
+# A factory gets (dataset, user_id, n) and returns (method, url, form data).
+def _future(days):
+    return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M")
+
+
+def _event_form(title):
+    return dict(event_title=title, sport_type="football", home_team="Lions", away_team="Tigers",
+                start_datetime=_future(30), end_datetime=_future(31), venue="Bench Park",
+                total_tickets=500, ticket_price=20)
+
+
+def _owned_event(data, user_id, n):
+    owned = data["events_by_owner"].get(user_id) or [1]
+    return owned[n % len(owned)]
+
+
+ROUTE_SCENARIOS = {
+    "main.index": (False, lambda d, u, n: ("GET", ["/", "/?category=football&status=open",
+                                                   "/?q=lions", "/?q=stad tig"][n % 4], None)),
+    "main.view_event": (False, lambda d, u, n: ("GET", f"/event/{n % d['events'] + 1}", None)),
+    "main.create_event": (True, lambda d, u, n: ("GET", "/create-event/", None) if n % 2
+                          else ("POST", "/create-event/", _event_form(f"Bench Cup {u}-{n}"))),
+    "main.my_events": (True, lambda d, u, n: ("GET", "/my-events", None)),
+    "main.booking": (True, lambda d, u, n: ("GET", "/booking", None)),
+    "main.create_booking": (True, lambda d, u, n: ("POST", "/book",
+                                                   {"event_id": n % d["events"] + 1, "quantity": 1})),
+    "main.add_comment": (True, lambda d, u, n: ("POST", f"/event/{n % d['events'] + 1}/comment",
+                                                {"text": f"bench comment {n}"})),
+    "main.cancel_event": (True, lambda d, u, n: ("POST", f"/event/{_owned_event(d, u, n)}/cancel", None)),
+    "api.events": (False, lambda d, u, n: ("GET", "/api/events?limit=100", None)),
+    "auth.login": (False, lambda d, u, n: ("GET", "/login", None) if n % 2
+                   else ("POST", "/login", {"email_id": f"user{u}@bench.sportszone.com", "password": BENCH_PASSWORD})),
+    "auth.register": (False, lambda d, u, n: ("GET", "/register", None) if n % 2
+                      else ("POST", "/register", dict(first_name="New", surname="User",
+                                                      email_id=f"new{u}-{n}@bench.sportszone.com",
+                                                      mobile_number=f"05{u:04d}{n:05d}",
+                                                      street_address="1 New St",
+                                                      password="secret12", confirm="secret12"))),
+    "auth.logout": (True, lambda d, u, n: ("GET", "/logout", None)),
+}
+
+
+def _login(client, user_id):
+    client.post("/login", data={"email_id": f"user{user_id}@bench.sportszone.com", "password": BENCH_PASSWORD})
+
+
+def bench_routes(args) -> dict:
+    """Drive every blueprint route with concurrent clients; report latency, rps and queries."""
+    from SportsZone.querycount import QueryCounter
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir, PAGE_CACHE_ENABLED=not args.no_cache)
+        data = seed(app, users=args.users, venues=args.venues, events=args.events,
+                    bookings=args.bookings, comments=args.comments)
+        endpoints = sorted(
+            rule.endpoint for rule in app.url_map.iter_rules()
+            if rule.endpoint.split(".")[0] in args.blueprints
+        )
+        only = set(args.routes or endpoints)
+
+        def run_client(endpoint, worker):
+            needs_login, factory = ROUTE_SCENARIOS[endpoint]
+            user_id = worker % data["users"] + 1
+            client = app.test_client()
+            if needs_login:
+                _login(client, user_id)
+            samples, queries, errors = [], [], 0
+            for n in range(args.requests // args.concurrency):
+                n = n * args.concurrency + worker
+                if endpoint == "auth.logout":
+                    _login(client, user_id)
+                method, url, form = factory(data, user_id, n)
+                with app.app_context(), QueryCounter() as counter:
+                    started = time.perf_counter()
+                    response = client.open(url, method=method, data=form)
+                    response.get_data()
+                    samples.append(time.perf_counter() - started)
+                queries.append(counter.count)
+                errors += response.status_code >= 500
+            return samples, queries, errors
+
+        results, skipped = {}, []
+        for endpoint in endpoints:
+            if endpoint not in ROUTE_SCENARIOS or endpoint not in only:
+                skipped.append(endpoint)
+                continue
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                runs = list(pool.map(lambda w: run_client(endpoint, w), range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            samples = [t for s, _, _ in runs for t in s]
+            queries = [q for _, qs, _ in runs for q in qs]
+            results[endpoint] = {
+                "requests": len(samples),
+                "errors": sum(e for _, _, e in runs),
+                "rps": round(len(samples) / elapsed, 1) if elapsed else None,
+                "latency": percentiles(samples),
+                "queries_avg": round(sum(queries) / len(queries), 2) if queries else 0,
+                "queries_max": max(queries, default=0),
+            }
+        with app.app_context():
+            db.engine.dispose()
+
+    dataset = {k: v for k, v in data.items() if k != "events_by_owner"}
+    return {"benchmark": "routes", "concurrency": args.concurrency, "page_cache": not args.no_cache,
+            "dataset": dataset, "routes": results, "skipped": skipped}
+
+
+# Login throughput
+def bench_logins(args) -> dict:
+    """
+    Sustained logins/second through the hashing pool, and the latency of a
+    cheap page measured alone and again while the logins are running.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir, PAGE_CACHE_ENABLED=False, HASH_WORKERS=args.hash_workers,
+                       BCRYPT_LOG_ROUNDS=args.rounds)
+        data = seed(app, users=args.users, venues=5, events=50, bookings=0, comments=0)
+
+        def browse(stop, worker):
+            client, samples, n = app.test_client(), [], worker
+            while not stop.is_set():
+                started = time.perf_counter()
+                client.get(f"/event/{n % data['events'] + 1}").get_data()
+                samples.append(time.perf_counter() - started)
+                n += args.browse_concurrency
+            return samples
+
+        def login(stop, worker):
+            client, samples, outcomes, n = app.test_client(), [], {}, worker
+            while not stop.is_set():
+                form = {"email_id": f"user{n % data['users'] + 1}@bench.sportszone.com",
+                        "password": BENCH_PASSWORD}
+                started = time.perf_counter()
+                response = client.post("/login", data=form)
+                samples.append(time.perf_counter() - started)
+                outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+                client.get("/logout")
+                n += args.login_concurrency
+            return samples, outcomes
+
+        def phase(with_logins):
+            stop = threading.Event()
+            workers = args.browse_concurrency + (args.login_concurrency if with_logins else 0)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                browsers = [pool.submit(browse, stop, w) for w in range(args.browse_concurrency)]
+                logins = [pool.submit(login, stop, w) for w in range(args.login_concurrency)] if with_logins else []
+                time.sleep(args.duration)
+                stop.set()
+                return [t for f in browsers for t in f.result()], [f.result() for f in logins]
+
+        baseline, _ = phase(False)
+        loaded, login_runs = phase(True)
+        with app.app_context():
+            db.engine.dispose()
+
+    outcomes = {}
+    for _, counts in login_runs:
+        for status, count in counts.items():
+            outcomes[str(status)] = outcomes.get(str(status), 0) + count
+    accepted = outcomes.get("302", 0)
+    return {
+        "benchmark": "logins",
+        "hash_workers": args.hash_workers,
+        "bcrypt_rounds": args.rounds,
+        "login_concurrency": args.login_concurrency,
+        "duration_s": args.duration,
+        "logins_per_s": round(accepted / args.duration, 1),
+        "login_status": outcomes,  # 302 = logged in, 503 = shed by backpressure
+        "login_latency": percentiles([t for samples, _ in login_runs for t in samples]),
+        "page_latency_alone": percentiles(baseline),
+        "page_latency_during_logins": percentiles(loaded),
+    }
+
+
+# Template compile / render times
+TEMPLATE_PAGES = ["/", "/event/1", "/my-events", "/booking"]
+TEMPLATE_MODES = {
+    # mode -> (bytecode cache, clear it first)
+    "no_cache": (False, False),   # every worker compiles on first hit
+    "cold_cache": (True, True),   # first worker after a deploy fills the cache
+    "warm_cache": (True, False),  # later workers load bytecode at startup
+}
+
+
+def _timed_renders(app):
+    """Collect (template name, seconds) for every render_template call."""
+    from flask import before_render_template, template_rendered
+
+    samples, started = [], {}
+
+    def before(sender, template, context, **extra):
+        started[threading.get_ident()] = time.perf_counter()
+
+    def after(sender, template, context, **extra):
+        samples.append((template.name, time.perf_counter() - started.pop(threading.get_ident())))
+
+    before_render_template.connect(before, app, weak=False)
+    template_rendered.connect(after, app, weak=False)
+    return samples
+
+
+def _cold_start(db_path: str, cache_dir: str, mode: str) -> None:
+    """Child process: start the app and fetch each page once; prints a JSON report."""
+    bytecode, clear = TEMPLATE_MODES[mode]
+    if clear and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
+    started = time.perf_counter()
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + db_path,
+        "EXPIRY_SCHEDULER_ENABLED": False, "JOB_WORKER_ENABLED": False,
+        "PAGE_CACHE_ENABLED": False, "WTF_CSRF_ENABLED": False, "BCRYPT_LOG_ROUNDS": 4,
+        "TEMPLATE_BYTECODE_CACHE": bytecode, "TEMPLATE_PRELOAD": bytecode,
+        "TEMPLATE_CACHE_DIR": cache_dir,
+    })
+    if bytecode:  # TEMPLATE_PRELOAD runs in the prewarm hook
+        from SportsZone.startup import prewarm
+        prewarm(app)
+    startup = time.perf_counter() - started
+    client = app.test_client()
+    _login(client, 1)
+    first = {}
+    for url in TEMPLATE_PAGES:
+        started = time.perf_counter()
+        client.get(url).get_data()
+        first[url] = round((time.perf_counter() - started) * 1000, 2)
+    json.dump({"startup_ms": round(startup * 1000, 2), "first_request_ms": first}, sys.stdout)
+
+
+def bench_templates(args) -> dict:
+    """
+    Worker cold start (app start + first hit of each page) without a bytecode
+    cache, with an empty one and with a warm one, each in a fresh process;
+    then steady-state render time per page.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir, PAGE_CACHE_ENABLED=False, BCRYPT_LOG_ROUNDS=4,
+                       TEMPLATE_CACHE_DIR=os.path.join(workdir, "jinja"))
+        seed(app, users=args.users, events=args.events, bookings=args.events * 4,
+             comments=args.events * 4)
+        with app.app_context():
+            db.engine.dispose()
+
+        cold = {}
+        for mode in TEMPLATE_MODES:
+            runs = []
+            for _ in range(args.runs):
+                out = subprocess.run(
+                    [sys.executable, "-c", "import sys, benchmark; benchmark._cold_start(*sys.argv[1:])",
+                     os.path.join(workdir, "bench.sqlite"), os.path.join(workdir, "jinja"), mode],
+                    cwd=here, check=True, capture_output=True, text=True,
+                )
+                runs.append(json.loads(out.stdout))
+            cold[mode] = {
+                "startup_ms": statistics.median(r["startup_ms"] for r in runs),
+                "first_request_ms": {
+                    url: statistics.median(r["first_request_ms"][url] for r in runs) for url in TEMPLATE_PAGES
+                },
+            }
+            cold[mode]["total_ms"] = round(cold[mode]["startup_ms"] + sum(cold[mode]["first_request_ms"].values()), 2)
+
+        samples = _timed_renders(app)
+        client = app.test_client()
+        _login(client, 1)
+        for url in TEMPLATE_PAGES:  # warm up
+            client.get(url)
+        samples.clear()
+        for n in range(args.renders):
+            client.get(TEMPLATE_PAGES[n % len(TEMPLATE_PAGES)]).get_data()
+        by_template = {}
+        for name, seconds in samples:
+            by_template.setdefault(name, []).append(seconds)
+        with app.app_context():
+            db.engine.dispose()
+
+    return {
+        "benchmark": "templates",
+        "runs": args.runs,
+        "cold_start": cold,
+        "render": {name: percentiles(times) for name, times in sorted(by_template.items())},
+    }
+
+
+# Worker startup phases
+STARTUP_PAGES = ["/", "/event/1", "/login"]
+
+
+def _startup(launched: str, db_path: str, prewarmed: str) -> None:
+    """Child process: create the app (and prewarm it), then fetch each page once; prints a JSON report."""
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + db_path,
+        "EXPIRY_SCHEDULER_ENABLED": False, "JOB_WORKER_ENABLED": False, "PAGE_CACHE_ENABLED": False,
+    })
+    created = time.perf_counter()
+    if prewarmed == "1":
+        from SportsZone.startup import prewarm
+        prewarm(app)
+    ready = time.perf_counter()
+    client = app.test_client()
+    first = {}
+    for url in STARTUP_PAGES:
+        started = time.perf_counter()
+        client.get(url).get_data()
+        first[url] = round((time.perf_counter() - started) * 1000, 2)
+    profile = app.extensions["startup"]
+    json.dump({
+        "create_app_ms": round((created - float(launched)) * 1000, 2),
+        "ready_ms": round((ready - float(launched)) * 1000, 2),
+        "first_request_ms": first,
+        "phases": {p["phase"]: p["ms"] for p in profile.phases},
+    }, sys.stdout)
+
+
+def bench_startup(args) -> dict:
+    """
+    Fresh-process worker start: time from interpreter start to a ready app,
+    with and without the prewarm hook, the first hit of each page after it,
+    and the median of every create_app / prewarm phase.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    report = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir)
+        seed(app, users=20, venues=5, events=200, bookings=500, comments=500)
+        with app.app_context():
+            db.engine.dispose()
+
+        for prewarmed in ("0", "1"):
+            runs = []
+            for _ in range(args.runs):
+                out = subprocess.run(
+                    [sys.executable, "-c",
+                     "import time; t = time.perf_counter(); import sys, benchmark; "
+                     "benchmark._startup(repr(t), *sys.argv[1:])",
+                     os.path.join(workdir, "bench.sqlite"), prewarmed],
+                    cwd=here, check=True, capture_output=True, text=True,
+                )
+                runs.append(json.loads(out.stdout))
+            phases = {name: round(statistics.median(r["phases"].get(name, 0) for r in runs), 2)
+                      for name in runs[0]["phases"]}
+            report["prewarm" if prewarmed == "1" else "lazy"] = {
+                "create_app_ms": statistics.median(r["create_app_ms"] for r in runs),
+                "ready_ms": statistics.median(r["ready_ms"] for r in runs),
+                "first_request_ms": {
+                    url: statistics.median(r["first_request_ms"][url] for r in runs) for url in STARTUP_PAGES
+                },
+                "phases": {name: ms for name, ms in phases.items() if ms >= args.min_ms},
+            }
+
+    return {"benchmark": "startup", "runs": args.runs, **report}
+
+
+# Many idle connections vs. server stack
+CONNECTION_SERVERS = ["werkzeug", "waitress", "uvicorn"]
+
+
+def _serve(server: str, db_path: str, port: str, threads: str) -> None:
+    """Child process: serve the benchmark database until killed."""
+    from SportsZone.server import SERVERS
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + db_path,
+        "EXPIRY_SCHEDULER_ENABLED": False, "JOB_WORKER_ENABLED": False,
+        "LIVE_POLL_TIMEOUT": 600, "LIVE_MAX_STREAMS": 100000, "SERVER_CONNECTION_LIMIT": 100000,
+    })
+    if server == "werkzeug":  # what `python main.py` / `flask run` give you
+        from werkzeug.serving import run_simple
+        run_simple("127.0.0.1", int(port), app, threaded=True)
+    else:
+        SERVERS[server](app, "127.0.0.1", int(port), int(threads))
+
+
+async def _get(port: int, path: str, timeout: float) -> int:
+    """Status code of one GET over a fresh connection (0 on error or timeout)."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return 0
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n".encode())
+        status = (await asyncio.wait_for(reader.readline(), timeout)).split()
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status[1]) if len(status) > 1 else 0
+    except (OSError, ValueError, asyncio.TimeoutError):
+        return 0
+    finally:
+        writer.close()
+
+
+async def _hold_and_probe(port: int, held: int, etag: str, probes: int, timeout: float) -> dict:
+    """Park `held` availability long-polls, then time `probes` page loads beside them."""
+    parked = []
+    for _ in range(held):
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            break
+        writer.write(f"GET /api/events/1/availability?etag={etag} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        parked.append((asyncio.ensure_future(reader.readline()), writer))
+    await asyncio.sleep(1)
+    # A long-poll that already answered was refused (503) or dropped
+    answered = sum(1 for response, _ in parked if response.done())
+
+    samples, outcomes = [], {}
+    for n in range(probes):
+        started = time.perf_counter()
+        status = await _get(port, f"/api/events/{n % 10 + 1}/comments", timeout)
+        samples.append(time.perf_counter() - started)
+        outcomes[str(status)] = outcomes.get(str(status), 0) + 1
+    for response, writer in parked:
+        response.cancel()
+        writer.close()
+    return {"held": len(parked) - answered, "refused": held - len(parked) + answered,
+            "probe_status": outcomes, "probe_latency": percentiles(samples)}
+
+
+def bench_connections(args) -> dict:
+    """
+    Probe latency of a JSON endpoint while N availability long-polls sit open,
+    under the threaded dev server, waitress and uvicorn (async endpoints).
+    Each server runs in its own process; status 0 = timed out or refused.
+    """
+    from SportsZone.live import availability
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(workdir)
+        seed(app, users=20, venues=5, events=50, bookings=200, comments=500)
+        with app.app_context():
+            etag = availability(1)["etag"]
+            db.engine.dispose()
+
+        for server in args.servers:
+            results[server] = {}
+            for held in args.held:
+                port = args.port
+                child = subprocess.Popen(
+                    [sys.executable, "-c", "import sys, benchmark; benchmark._serve(*sys.argv[1:])",
+                     server, os.path.join(workdir, "bench.sqlite"), str(port), str(args.threads)],
+                    cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                try:
+                    deadline = time.time() + 30
+                    while asyncio.run(_get(port, "/api/events/1/availability", 1)) != 200:
+                        if time.time() > deadline or child.poll() is not None:
+                            raise RuntimeError(f"{server} did not start")
+                        time.sleep(0.2)
+                    results[server][str(held)] = asyncio.run(
+                        _hold_and_probe(port, held, etag, args.probes, args.timeout))
+                finally:
+                    child.terminate()
+                    child.wait()
+
+    return {"benchmark": "connections", "threads": args.threads, "probes": args.probes,
+            "probe_timeout_s": args.timeout, "servers": results}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("booking", help="concurrent booking stress test")
+    p.add_argument("--bookings", type=int, default=5000)
+    p.add_argument("--workers", type=int, default=32)
+    p.add_argument("--seats", type=int, default=2000)
+    p.set_defaults(func=bench_booking)
+
+    p = sub.add_parser("routes", help="latency / throughput / query counts for every route")
+    p.add_argument("--users", type=int, default=50)
+    p.add_argument("--venues", type=int, default=20)
+    p.add_argument("--events", type=int, default=500)
+    p.add_argument("--bookings", type=int, default=2000)
+    p.add_argument("--comments", type=int, default=2000)
+    p.add_argument("--requests", type=int, default=200, help="requests per route")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--blueprints", nargs="+", default=["main", "auth"])
+    p.add_argument("--routes", nargs="*", help="only these endpoints, e.g. main.index")
+    p.add_argument("--no-cache", action="store_true", help="disable the page cache")
+    p.set_defaults(func=bench_routes)
+
+    p = sub.add_parser("logins", help="login throughput vs. latency of other routes")
+    p.add_argument("--users", type=int, default=50)
+    p.add_argument("--duration", type=float, default=5.0, help="seconds per phase")
+    p.add_argument("--login-concurrency", type=int, default=16)
+    p.add_argument("--browse-concurrency", type=int, default=4)
+    p.add_argument("--hash-workers", type=int, default=2)
+    p.add_argument("--rounds", type=int, default=12, help="BCRYPT_LOG_ROUNDS")
+    p.set_defaults(func=bench_logins)
+
+    p = sub.add_parser("templates", help="worker cold start and per-page render times")
+    p.add_argument("--users", type=int, default=20)
+    p.add_argument("--events", type=int, default=200)
+    p.add_argument("--runs", type=int, default=5, help="fresh processes per cache mode")
+    p.add_argument("--renders", type=int, default=200, help="page loads for render timing")
+    p.set_defaults(func=bench_templates)
+
+    p = sub.add_parser("startup", help="worker start phases, with and without prewarm")
+    p.add_argument("--runs", type=int, default=10, help="fresh processes per mode")
+    p.add_argument("--min-ms", type=float, default=1.0, help="hide phases faster than this")
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("connections", help="latency beside many open long-polls, per server stack")
+    p.add_argument("--servers", nargs="+", choices=CONNECTION_SERVERS, default=CONNECTION_SERVERS)
+    p.add_argument("--held", type=int, nargs="+", default=[0, 100, 500], help="idle long-polls to hold open")
+    p.add_argument("--probes", type=int, default=100)
+    p.add_argument("--threads", type=int, default=16, help="SERVER_THREADS for waitress / uvicorn")
+    p.add_argument("--timeout", type=float, default=5.0, help="seconds before a probe counts as failed")
+    p.add_argument("--port", type=int, default=8765)
+    p.set_defaults(func=bench_connections)
+
+    args = parser.parse_args(argv)
+    report = args.func(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if report.get("oversold") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
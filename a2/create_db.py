@@ -1,8 +1,13 @@
 from SportsZone import db, create_app
 import SportsZone.models  # ensure models are registered
+from SportsZone.schema import upgrade_schema
 
 app = create_app()
 with app.app_context():
     print("DB URI:", db.engine.url)
-    db.create_all()
+    report = upgrade_schema()  # create_all, plus columns/indexes/backfills for existing databases
     print("Tables created.")
+    if report["columns"]:
+        print("Columns added:", ", ".join(report["columns"]))
+    if report["indexes"]:
+        print("Indexes created:", ", ".join(report["indexes"]))
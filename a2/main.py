@@ -1,5 +1,6 @@
 from SportsZone import create_app
 
 if __name__ == '__main__':
-    app = create_app()
+    # Background threads that `flask serve` would start: job queue and expiry sweep
+    app = create_app({"JOB_WORKER_ENABLED": True, "EXPIRY_SCHEDULER_ENABLED": True})
     app.run(debug=True)
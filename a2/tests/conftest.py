@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SportsZone import create_app, db  # noqa: E402
+from SportsZone.models import User  # noqa: E402
+from SportsZone.schema import upgrade_schema  # noqa: E402
+
+
+def make_app(tmp_path, **config):
+    """App on a fresh SQLite file (made by upgrade_schema), background threads off, CSRF off, fast bcrypt."""
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.sqlite"),
+        "EXPIRY_SCHEDULER_ENABLED": False,
+        "JOB_WORKER_ENABLED": False,
+        "PAGE_CACHE_ENABLED": False,
+        "WTF_CSRF_ENABLED": False,
+        "BCRYPT_LOG_ROUNDS": 4,
+        "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja"),
+        "TESTING": True,
+    }
+    settings.update(config)
+    app = create_app(settings)
+    with app.app_context():
+        upgrade_schema()
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(tmp_path)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def add_user(password_hash: str, n: int = 1) -> User:
+    user = User(first_name=f"Test{n}", surname="User", email_id=f"user{n}@test.sportszone.com",
+                password_hash=password_hash, mobile_number=f"04{n:08d}", street_address=f"{n} Test St")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def add_event(user_id: int, n: int = 1, **fields):
+    from datetime import datetime, timedelta
+    from SportsZone.models import Event, Venue
+
+    venue = Venue(venue_name=f"Test Arena {n}", venue_address=f"{n} Arena Rd", capacity=10000)
+    db.session.add(venue)
+    db.session.flush()
+    start = datetime.now() + timedelta(days=n)
+    values = dict(user_id=user_id, venue_id=venue.id, sports_type="football", event_title=f"Home{n} vs Away{n}",
+                  home_team_name=f"Home{n}", away_team_name=f"Away{n}", event_image="football1.jpg",
+                  description="Test fixture.", start_datetime=start, end_datetime=start + timedelta(hours=3),
+                  status="Open", total_tickets=1000, tickets_sold=0, ticket_price=25.0)
+    values.update(fields)
+    event = Event(**values)
+    db.session.add(event)
+    db.session.commit()
+    return event
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("a2wsgi")
+pytest.importorskip("aiosqlite")
+
+from conftest import add_event, add_user  # noqa: E402
+from SportsZone.asgi import create_asgi_app  # noqa: E402
+
+
+def call(asgi, path, query=b""):
+    """Run one GET through the ASGI app; returns (status, body)."""
+    messages = []
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": []}
+        try:
+            await asgi(scope, receive, send)
+        finally:
+            await asgi.db.engine.dispose()
+
+    asyncio.run(run())
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return messages[0]["status"], body
+
+
+@pytest.mark.parametrize("query, lines", [(b"limit=0", 0), (b"limit=2", 2), (b"", 3)])
+def test_events_stream_limit(app, query, lines):
+    with app.app_context():
+        user = add_user("x")
+        for n in range(1, 4):
+            add_event(user.id, n)
+    app.config["ASGI_WSGI_THREADS"] = 2
+    status, body = call(create_asgi_app(app), "/api/events", query)
+    assert status == 200
+    assert len(body.splitlines()) == lines
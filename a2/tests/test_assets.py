@@ -0,0 +1,23 @@
+from SportsZone import assets
+
+from conftest import make_app
+
+
+def test_stale_digests_404_without_rehashing(tmp_path, monkeypatch):
+    app = make_app(tmp_path)
+    client = app.test_client()
+    calls = []
+    real = assets.fingerprint
+    monkeypatch.setattr(assets, "fingerprint", lambda path: calls.append(path) or real(path))
+
+    style = lambda: [path for path in calls if path.endswith("style.css")]
+    for digest in ("000000000000", "111111111111", "222222222222"):
+        assert client.get(f"/static/style.{digest}.css").status_code == 404
+    assert len(style()) <= 1  # hashed once for its current digest, not once per request
+
+    with app.test_request_context():
+        url = app.url_for("static", filename="style.css")
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.cache_control.immutable
+    assert len(style()) <= 1
@@ -0,0 +1,74 @@
+import threading
+
+from werkzeug.security import generate_password_hash
+
+from SportsZone import db
+from SportsZone.hashing import password_hasher
+from SportsZone.models import User
+
+from conftest import add_user, make_app
+
+LONG_PASSWORD = "p" * 80  # over bcrypt's 72 bytes
+
+
+def test_register_rejects_password_bcrypt_cannot_hash(client, app):
+    form = {"first_name": "Long", "surname": "Password", "email_id": "long@test.sportszone.com",
+            "mobile_number": "0400000099", "street_address": "1 Test St",
+            "password": LONG_PASSWORD, "confirm": LONG_PASSWORD}
+    response = client.post("/register", data=form)
+    assert response.status_code == 200
+    assert b"at most 72 bytes" in response.data
+    with app.app_context():
+        assert db.session.scalar(db.select(User).where(User.email_id == form["email_id"])) is None
+
+
+def test_login_keeps_old_hash_when_rehash_fails(client, app):
+    with app.app_context():
+        old_hash = generate_password_hash(LONG_PASSWORD, "scrypt")
+        user_id = add_user(old_hash).id
+
+    response = client.post("/login", data={"email_id": "user1@test.sportszone.com", "password": LONG_PASSWORD})
+    assert response.status_code == 302
+    with app.app_context():
+        assert db.session.get(User, user_id).password_hash == old_hash
+
+
+def test_login_rehashes_outdated_hash(client, app):
+    with app.app_context():
+        user_id = add_user(generate_password_hash("secret123", "scrypt")).id
+
+    client.post("/login", data={"email_id": "user1@test.sportszone.com", "password": "secret123"})
+    with app.app_context():
+        assert db.session.get(User, user_id).password_hash.startswith("$2b$04$")
+
+
+def test_hash_queue_limit_leaves_server_threads_free(tmp_path):
+    app = make_app(tmp_path, SERVER_THREADS=16, HASH_WORKERS=8)
+    assert app.config["HASH_QUEUE_LIMIT"] == 8
+
+
+def test_saturated_hash_pool_answers_503_and_pages_still_load(tmp_path):
+    app = make_app(tmp_path, HASH_WORKERS=1, HASH_QUEUE_LIMIT=1)
+    with app.app_context():
+        add_user(generate_password_hash("secret123"))
+    release, started = threading.Event(), threading.Event()
+
+    def hold_slot():
+        with app.app_context():
+            password_hasher._run(lambda: (started.set(), release.wait(10)))
+
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    try:
+        assert started.wait(5)
+        client = app.test_client()
+        response = client.post("/login", data={"email_id": "user1@test.sportszone.com", "password": "secret123"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+        assert client.get("/").status_code == 200
+    finally:
+        release.set()
+        holder.join()
+    response = app.test_client().post("/login", data={"email_id": "user1@test.sportszone.com",
+                                                      "password": "secret123"})
+    assert response.status_code == 302
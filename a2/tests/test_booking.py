@@ -0,0 +1,39 @@
+import threading
+
+from conftest import add_event, add_user
+from SportsZone import db
+from SportsZone.booking import reserve_seats
+from SportsZone.models import Booking, Event
+
+
+def test_concurrent_bookings_never_oversell(app):
+    with app.app_context():
+        user_id = add_user("x").id
+        event_id = add_event(user_id, total_tickets=49).id
+
+    start = threading.Barrier(8)
+    errors = []
+
+    def book():
+        with app.app_context():
+            start.wait()
+            try:
+                for _ in range(5):
+                    reserve_seats(event_id, user_id, 3)
+            except Exception as exc:  # surfaced below, not swallowed by the thread
+                errors.append(exc)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=book) for _ in range(8)]  # 120 seats asked for, 49 on sale
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        booked = db.session.scalar(db.select(db.func.sum(Booking.booking_quantity)))
+        assert event.tickets_sold <= event.total_tickets
+        assert event.tickets_sold == booked == 48  # the 17th booking of 3 would not fit
@@ -0,0 +1,69 @@
+import os
+import time
+
+import pytest
+
+from conftest import add_event, add_user, make_app
+from SportsZone import db
+from SportsZone.cache import DiskCache, page_cache
+from SportsZone.models import Event
+
+
+def test_disk_cache_drops_expired_files(tmp_path):
+    cache = DiskCache(str(tmp_path / "pages"), ttl=60)
+    cache.set("old", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("old") is None
+    assert os.listdir(cache.directory) == []
+
+
+def test_disk_cache_prune_caps_expiring_entries(tmp_path):
+    cache = DiskCache(str(tmp_path / "pages"), ttl=60)
+    cache.set("version:events", "v1", ttl=0)
+    cache.set("expired", 1, ttl=0.01)
+    for i in range(5):
+        cache.set(f"page{i}", i)
+        os.utime(cache._path(f"page{i}"), (i, i))  # page0 is the oldest
+    time.sleep(0.02)
+
+    assert cache.prune(max_entries=3) == 3
+    assert len(os.listdir(cache.directory)) == 4
+    assert cache.get("version:events") == "v1"
+    assert [cache.get(f"page{i}") for i in range(5)] == [None, None, 2, 3, 4]
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = make_app(tmp_path, PAGE_CACHE_ENABLED=True, PAGE_CACHE_DIR=str(tmp_path / "pages"))
+    return app.test_client()
+
+
+def test_unread_query_args_share_a_cache_entry(client, tmp_path):
+    assert client.get("/?x=1").headers["X-Cache"] == "MISS"
+    assert client.get("/?x=2").headers["X-Cache"] == "HIT"
+    assert client.get("/?q=derby").headers["X-Cache"] == "MISS"
+    assert len(os.listdir(tmp_path / "pages")) == 2
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_invalidate_drops_cached_pages(tmp_path, shared):
+    app = make_app(tmp_path, PAGE_CACHE_ENABLED=True,
+                   PAGE_CACHE_DIR=str(tmp_path / "pages") if shared else None)
+    client = app.test_client()
+    with app.app_context():
+        event_id = add_event(add_user("x").id, event_title="Grand Final").id
+    assert client.get("/").headers["X-Cache"] == "MISS"
+    assert client.get("/").headers["X-Cache"] == "HIT"
+
+    with app.app_context():
+        db.session.get(Event, event_id).event_title = "Semi Final"
+        db.session.commit()
+    assert b"Grand Final" in client.get("/").data  # still the cached copy
+
+    with app.app_context():
+        page_cache.invalidate("events")
+
+    response = client.get("/")
+    assert response.headers["X-Cache"] == "MISS"
+    assert b"Semi Final" in response.data
+    assert client.get("/").headers["X-Cache"] == "HIT"
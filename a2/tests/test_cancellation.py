@@ -0,0 +1,76 @@
+from conftest import add_event, add_user
+from SportsZone import db
+from SportsZone.booking import reserve_seats
+from SportsZone.cancellation import cancel_batch, start_cancellation
+from SportsZone.history import refresh_bookings
+from SportsZone.models import Booking, BookingHistory, EventStats, Refund
+from SportsZone.stats import reconcile
+
+
+def totals(event_id):
+    stats = db.session.get(EventStats, event_id)
+    db.session.refresh(stats)
+    return stats.booking_count, stats.tickets_booked, stats.revenue
+
+
+def test_cancelled_bookings_leave_the_stats(app):
+    with app.app_context():
+        user = add_user("x")
+        cancelled, kept = add_event(user.id, 1), add_event(user.id, 2)
+        for qty in (1, 2, 3):
+            reserve_seats(cancelled.id, user.id, qty)
+            reserve_seats(kept.id, user.id, qty)
+        assert totals(cancelled.id) == (3, 6, 150.0)
+
+        start_cancellation(cancelled)
+        assert cancel_batch(cancelled.id, 2)
+        db.session.commit()
+        assert totals(cancelled.id) == (1, 3, 75.0)
+        assert not cancel_batch(cancelled.id, 2)
+        db.session.commit()
+        assert totals(cancelled.id) == (0, 0, 0.0)
+
+        reconcile()
+        assert totals(cancelled.id) == (0, 0, 0.0)
+        assert totals(kept.id) == (3, 6, 150.0)
+
+
+def test_refunds_use_the_price_paid(app):
+    with app.app_context():
+        user = add_user("x")
+        event = add_event(user.id, ticket_price=100.0)
+        reserve_seats(event.id, user.id, 2)
+        event.ticket_price = 10.0
+        db.session.commit()
+        reconcile()
+        assert totals(event.id) == (1, 2, 200.0)
+
+        start_cancellation(event)
+        cancel_batch(event.id, 10)
+        db.session.commit()
+        assert db.session.scalars(db.select(Refund.amount)).all() == [200.0]
+        assert totals(event.id) == (0, 0, 0.0)
+        reconcile()
+        assert totals(event.id) == (0, 0, 0.0)
+
+
+def test_booking_history_shows_cancellations(app):
+    with app.app_context():
+        user = add_user("x")
+        event = add_event(user.id)
+        ids = [reserve_seats(event.id, user.id, 1).id for _ in range(3)]
+
+        start_cancellation(event)
+        assert cancel_batch(event.id, 2)
+        db.session.commit()
+        statuses = db.session.execute(
+            db.select(BookingHistory.booking_id, BookingHistory.status).order_by(BookingHistory.booking_id)
+        ).all()
+        assert statuses == [(ids[0], "Cancelled"), (ids[1], "Cancelled"), (ids[2], "Confirmed")]
+
+        # A booking changed outside a cancellation run catches up on refresh
+        db.session.execute(db.update(Booking).where(Booking.id == ids[2]).values(status="Cancelled"))
+        refresh_bookings([ids[2]])
+        db.session.commit()
+        assert db.session.scalar(
+            db.select(BookingHistory.status).where(BookingHistory.booking_id == ids[2])) == "Cancelled"
@@ -0,0 +1,33 @@
+from werkzeug.security import generate_password_hash
+
+from conftest import add_event, add_user
+from SportsZone import db
+from SportsZone.booking import reserve_seats
+from SportsZone.jobs import job_worker
+from SportsZone.models import Booking, BookingHistory
+
+
+def test_booking_page_shows_order_id_before_the_worker_runs(client, app):
+    with app.app_context():
+        user = add_user(generate_password_hash("secret123"))
+        booking_id = reserve_seats(add_event(user.id).id, user.id, 2).id
+
+    client.post("/login", data={"email_id": "user1@test.sportszone.com", "password": "secret123"})
+    response = client.get("/booking")
+    assert f"Order ID: <b>BK-{booking_id}</b>".encode() in response.data
+
+
+def test_run_once_assigns_order_codes(app):
+    with app.app_context():
+        user = add_user("x")
+        event_id = add_event(user.id).id
+        ids = [reserve_seats(event_id, user.id, 1).id for _ in range(3)]
+        assert db.session.scalars(db.select(Booking.order_code)).all() == [None] * 3
+
+        assert job_worker.run_once() == 3
+        db.session.expire_all()
+        codes = db.session.execute(db.select(Booking.id, Booking.order_code)).all()
+        assert codes == [(i, f"BK-{i}") for i in ids]
+        history = db.session.scalars(db.select(BookingHistory.order_code).order_by(BookingHistory.booking_id))
+        assert history.all() == [f"BK-{i}" for i in ids]
+        assert job_worker.run_once() == 0
@@ -0,0 +1,34 @@
+import socket
+import threading
+import urllib.request
+
+from SportsZone.server import waitress_server
+
+from conftest import add_event, add_user
+
+
+def _open_stream(port: int, event_id: int) -> tuple[socket.socket, bytes]:
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(f"GET /api/events/{event_id}/availability/stream HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+    return sock, int(sock.recv(64).split()[1])
+
+
+def test_streams_leave_waitress_threads_for_pages(app):
+    with app.app_context():
+        event_id = add_event(add_user("x").id).id
+    app.config.update(PREWARM_ON_START=False, LIVE_STREAM_TTL=3, LIVE_RESYNC_INTERVAL=1)
+    server = waitress_server(app, "127.0.0.1", 0, threads=16)
+    threading.Thread(target=server.run, daemon=True).start()
+    port = server.effective_port
+
+    streams = [_open_stream(port, event_id) for _ in range(16)]
+    try:
+        statuses = [status for _sock, status in streams]
+        assert statuses.count(200) == 4  # a quarter of the threads
+        assert statuses.count(503) == 12
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/event/{event_id}", timeout=5) as response:
+            assert response.status == 200
+    finally:
+        for sock, _status in streams:
+            sock.close()
+        server.task_dispatcher.shutdown(timeout=1)
@@ -0,0 +1,24 @@
+import pytest
+
+from conftest import make_app
+
+
+@pytest.fixture
+def client(tmp_path):
+    return make_app(tmp_path, PROFILING_ENABLED=True).test_client()
+
+
+def test_stats_are_served_to_local_requests(client):
+    client.get("/")
+    response = client.get("/_profiling/stats")
+    assert response.status_code == 200
+    assert "main.index" in response.get_json()
+
+
+@pytest.mark.parametrize("environ, headers", [
+    ({"REMOTE_ADDR": "203.0.113.7"}, {}),
+    ({}, {"X-Forwarded-For": "203.0.113.7"}),
+])
+def test_stats_are_hidden_from_remote_requests(client, environ, headers):
+    response = client.get("/_profiling/stats", environ_base=environ, headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,30 @@
+import pytest
+
+import benchmark
+from SportsZone.querycount import assert_max_queries
+
+# Statements per page, whatever the number of rows shown (no per-row lazy
+# loads). Includes loading the logged-in user's snapshot on a cold worker.
+BUDGETS = {
+    "/": 3,                            # listing page + facet grid
+    "/?category=football&q=derby": 3,
+    "/event/{event_id}": 4,            # event + venue/stats, first comment page + authors
+    "/booking": 2,                     # My Bookings read model
+    "/my-events": 2,
+}
+
+
+@pytest.fixture(params=[10, 60], ids=["10-events", "60-events"])
+def seeded(request, app):
+    events = request.param
+    benchmark.seed(app, users=5, venues=3, events=events, bookings=events * 5, comments=events * 5)
+    client = app.test_client()
+    benchmark._login(client, 1)
+    return client
+
+
+@pytest.mark.parametrize("url", list(BUDGETS))
+def test_page_query_budget(app, seeded, url):
+    with app.app_context(), assert_max_queries(BUDGETS[url]):
+        response = seeded.get(url.format(event_id=1))
+    assert response.status_code == 200
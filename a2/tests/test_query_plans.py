@@ -0,0 +1,26 @@
+import pytest
+
+import benchmark
+from SportsZone.schema import check_query_plans, create_missing_indexes, full_scans
+
+
+def test_full_scans_flags_unbounded_index_walks():
+    table = ["SCAN events"]
+    index = ["SCAN events USING COVERING INDEX ix_events_sports_type_status_end_datetime"]
+    assert full_scans(table, "SELECT * FROM events LIMIT 10") == table
+    assert full_scans(index, "SELECT count(*) FROM events") == index
+    assert full_scans(index + ["USE TEMP B-TREE FOR ORDER BY"], "SELECT * FROM events ORDER BY x LIMIT 10") == index
+    assert full_scans(index, "SELECT * FROM events ORDER BY sports_type LIMIT 10") == []
+
+
+@pytest.fixture
+def seeded(app):
+    benchmark.seed(app, users=5, venues=3, events=30, bookings=100, comments=100)
+    with app.app_context():
+        create_missing_indexes()
+
+
+def test_hot_queries_avoid_full_scans(app, seeded):
+    with app.app_context():
+        report = check_query_plans()
+    assert {name: scans for name, (_, scans) in report.items() if scans} == {}
@@ -0,0 +1,23 @@
+import threading
+
+from conftest import make_app
+from SportsZone.jobs import job_worker
+from SportsZone.server import waitress_server
+
+
+def background_threads():
+    return {t.name for t in threading.enumerate()} & {"expiry-scheduler", "job-worker"}
+
+
+def test_background_threads_start_only_with_a_server(tmp_path):
+    app = make_app(tmp_path, EXPIRY_SCHEDULER_ENABLED=None, JOB_WORKER_ENABLED=None, PREWARM_ON_START=False)
+    assert background_threads() == set()
+
+    server = waitress_server(app, "127.0.0.1", 0, 4)
+    try:
+        assert background_threads() == {"expiry-scheduler", "job-worker"}
+    finally:
+        app.extensions["expiry_scheduler"].stop(timeout=5)
+        job_worker.stop(timeout=5)
+        server.close()
+    assert background_threads() == set()
@@ -0,0 +1,80 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from SportsZone import db
+from SportsZone.facets import facet_counts
+from SportsZone.models import Event
+from SportsZone.queries import filter_events
+from SportsZone.search import search_index
+
+from conftest import add_user, make_app
+
+
+@pytest.fixture(params=["fts5", "memory"])
+def derby_app(request, tmp_path):
+    """1,100 events matching "derby": the football ones rank last."""
+    app = make_app(tmp_path, SEARCH_BACKEND=request.param)
+    with app.app_context():
+        user_id = add_user("x").id
+        start = datetime.now() + timedelta(days=1)
+        db.session.execute(db.insert(Event), [
+            dict(user_id=user_id, sports_type="football" if i >= 1050 else "basketball",
+                 event_title="Derby Derby Derby" if i < 1050 else f"Derby {i}",
+                 home_team_name=f"Home {i}", away_team_name=f"Away {i}", start_datetime=start,
+                 end_datetime=start + timedelta(hours=2), status="Open", total_tickets=100,
+                 tickets_sold=0, ticket_price=10.0)
+            for i in range(1100)
+        ])
+        search_index.rebuild()
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_filters_see_every_search_match(derby_app):
+    with derby_app.app_context():
+        query, _keys = filter_events(db.select(Event.id), category="football", q="derby")
+        assert len(db.session.scalars(query).all()) == 50
+        query, _keys = filter_events(db.select(Event.id), q="derby")
+        assert len(db.session.scalars(query).all()) == 1100
+
+
+def test_facet_counts_are_not_capped(derby_app):
+    with derby_app.test_request_context():
+        counts = facet_counts.counts(q="derby")
+        assert counts["category"] == {"all": 1100, "football": 50, "basketball": 1050, "cricket": 0, "tennis": 0}
+
+
+def test_memory_hits_reach_sql_without_bound_parameters(derby_app):
+    if derby_app.extensions["search_index"]["choice"] != "memory":
+        pytest.skip("memory backend only")
+    derby_app.config["SEARCH_MAX_HITS"] = 1000
+    with derby_app.app_context():
+        query, keys = filter_events(db.select(Event.id), q="derby")
+        assert query.compile().params == {}
+        rows = db.session.scalars(query.order_by(*keys)).all()
+        assert len(rows) == 1000
+        assert max(rows) <= 1050  # only the best-ranked "Derby Derby Derby" events
+
+
+def test_memory_index_picks_up_other_writers(tmp_path):
+    app = make_app(tmp_path, SEARCH_BACKEND="memory", SEARCH_REFRESH_INTERVAL=0)
+    with app.app_context():
+        user_id = add_user("x").id
+        assert search_index.search("derby") == []
+        # As if another worker inserted it: this process's index never saw it
+        start = datetime.now() + timedelta(days=1)
+        db.session.execute(db.insert(Event).values(
+            user_id=user_id, sports_type="football", event_title="Derby Day", start_datetime=start,
+            status="Open", total_tickets=100, tickets_sold=0, ticket_price=10.0))
+        db.session.commit()
+        search_index.search("derby")  # finds the index stale and rebuilds it in the background
+        for _ in range(100):
+            if search_index.search("derby"):
+                break
+            time.sleep(0.01)
+        assert search_index.search("derby") == [1]
+        db.engine.dispose()
@@ -0,0 +1,31 @@
+import io
+
+import pytest
+
+from conftest import add_user
+from SportsZone import db
+from SportsZone.models import Event
+from SportsZone.transfer import import_events, read_records
+
+GOOD = '{"event_title": "Home vs Away", "start_datetime": "2030-01-01T19:00:00"}\n'
+LINES = GOOD + '{"event_title": \n' + '[1, 2]\n' + '"text"\n' + GOOD
+
+
+def test_bad_jsonl_lines_are_reported_and_skipped(app):
+    errors = []
+    with app.app_context():
+        user = add_user("x")
+        totals = import_events(read_records(io.StringIO(LINES), "jsonl"), user.id, skip_errors=True,
+                               on_error=lambda line, exc: errors.append((line, str(exc))))
+        assert totals == {"events": 2, "venues": 0, "errors": 3}
+        assert db.session.scalar(db.select(db.func.count()).select_from(Event)) == 2
+    assert [line for line, _ in errors] == [2, 3, 4]
+    assert errors[0][1].startswith("invalid JSON")
+    assert errors[1][1] == "expected an object, got list"
+
+
+def test_bad_jsonl_line_stops_the_import_without_skip_errors(app):
+    with app.app_context():
+        user = add_user("x")
+        with pytest.raises(ValueError, match="line 2: invalid JSON"):
+            import_events(read_records(io.StringIO(LINES), "jsonl"), user.id)
@@ -0,0 +1,32 @@
+import benchmark
+from SportsZone import db
+from SportsZone.schema import upgrade_schema
+
+
+def test_upgrade_creates_and_fills_missing_tables(app):
+    benchmark.seed(app, users=5, venues=3, events=10, bookings=40, comments=20)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            for table in ("event_stats", "booking_history"):
+                conn.exec_driver_sql(f"DROP TABLE {table}")
+            conn.exec_driver_sql("DROP INDEX ix_bookings_event_id_id")
+            conn.exec_driver_sql("ALTER TABLE bookings DROP COLUMN unit_price")
+
+        report = upgrade_schema()
+        assert report == {"tables": ["event_stats", "booking_history"], "columns": ["bookings.unit_price"],
+                          "indexes": ["ix_bookings_event_id_id"]}
+        count = lambda table, where="1": db.session.scalar(db.text(f"SELECT count(*) FROM {table} WHERE {where}"))
+        assert (count("event_stats"), count("booking_history")) == (10, 40)
+        assert count("bookings", "unit_price IS NULL") == 0
+        assert upgrade_schema() == {"tables": [], "columns": [], "indexes": []}
+
+
+def test_create_app_leaves_the_schema_alone(tmp_path):
+    from SportsZone import create_app
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'bare.sqlite'}",
+                      "EXPIRY_SCHEDULER_ENABLED": False, "JOB_WORKER_ENABLED": False,
+                      "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja")})
+    with app.app_context():
+        assert db.session.scalars(db.text("SELECT name FROM sqlite_master")).all() == []
+        db.engine.dispose()